@@ -1,26 +1,34 @@
 import argparse
+import asyncio
 import datetime
+import functools
+import hashlib
+import itertools
 import json
+import math
 import os
 import platform
 import re
+import shutil
+import signal
 import subprocess
+import sys
 import tempfile
 import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
-from distutils.dir_util import copy_tree
-from distutils.dir_util import mkpath
-from distutils.dir_util import remove_tree
-from distutils.file_util import copy_file
 from pathlib import Path
-from statistics import mean
-from time import sleep
 from typing import Any
+from typing import AsyncIterator
+from typing import Callable
+from typing import Deque
 from typing import Dict
-from typing import Iterable
 from typing import Iterator
 from typing import List
 from typing import Optional
+from typing import Set
 from typing import Tuple
 from typing import Union
 
@@ -29,9 +37,30 @@ from django import setup as django_setup
 from django.conf import settings as django_settings
 from django.template.loader import get_template
 
+from aedttest import file_transfer
 from aedttest.clusters.job_hosts import get_job_machines
+from aedttest.clusters.launchers import DryRunLauncher
+from aedttest.clusters.launchers import LocalLauncher
+from aedttest.clusters.launchers import MpiexecLauncher
+from aedttest.clusters.launchers import SrunLauncher
+from aedttest.clusters.launchers import SubmitLauncher
+from aedttest.curve_comparison import compare_curve
 from aedttest.logger import logger
 from aedttest.logger import set_logger
+from aedttest.reference_index import ReferenceIndex
+from aedttest.reference_index import has_references
+from aedttest.result_cache import ResultCache
+from aedttest.results_format import BINARY_SUFFIX
+from aedttest.results_format import write_results
+from aedttest.scratch import DEFAULT_COPY_COMMAND
+from aedttest.scratch import NodeScratch
+from aedttest.scratch import relocate_results
+from aedttest.session_pool import SessionError
+from aedttest.session_pool import SessionPool
+from aedttest.session_pool import SessionWorker
+from aedttest.staging import StagingCache
+from aedttest.telemetry import MB
+from aedttest.telemetry import ProcessTreeSampler
 
 from pyaedt import __file__ as _py_aedt_path  # isort: skip
 
@@ -39,6 +68,17 @@ MODULE_DIR = Path(__file__).resolve().parent
 CWD_DIR = Path.cwd()
 LOGFOLDER_PATH = CWD_DIR / "logs"
 LOGFILE_PATH = LOGFOLDER_PATH / "aedt_test_framework.log"
+# static web parts shared by all results folders of the output directory
+ASSETS_FOLDER = ".aedttest_assets"
+# designs extracted before Electronics Desktop exited, see aedttest/simulation_data.py
+CHECKPOINT_SUFFIX = ".checkpoint.jsonl"
+# task name of a batch is the name of its lead project with this prefix
+BATCH_PREFIX = "batch_"
+GB = 1024**3
+OUTPUT_CHUNK_SIZE = 64 * 1024
+OUTPUT_TAIL_LINES = 50
+PLACEMENT_STRATEGIES = ("first-fit", "best-fit", "worst-fit", "min-fragmentation")
+LAUNCHERS = ("auto", "local", "mpiexec", "srun", "submit", "dry-run")
 
 # configure Django templates
 django_settings.configure(
@@ -73,6 +113,30 @@ def main() -> None:
             only_reference=cli_args.only_reference,
             reference_folder=cli_args.reference_folder,
             debug=cli_args.debug,
+            placement=cli_args.placement,
+            runtime_history=cli_args.runtime_history,
+            backfill=cli_args.backfill,
+            max_cores_per_host=cli_args.max_cores_per_host,
+            timeout=cli_args.timeout,
+            retries=cli_args.retries,
+            retry_backoff=cli_args.retry_backoff,
+            telemetry_interval=cli_args.telemetry_interval,
+            session_pool=cli_args.session_pool,
+            session_cores=cli_args.session_cores,
+            batch_size=cli_args.batch_size,
+            launcher=cli_args.launcher,
+            submit_command=cli_args.submit_command,
+            cancel_command=cli_args.cancel_command,
+            dry_run_speedup=cli_args.dry_run_speedup,
+            custom_hosts=cli_args.custom_hosts,
+            staging_cache=cli_args.staging_cache,
+            prefetch=cli_args.prefetch,
+            local_scratch=cli_args.local_scratch,
+            scratch_copy_command=cli_args.scratch_copy_command,
+            extract_only=cli_args.extract_only,
+            result_cache=cli_args.result_cache,
+            result_cache_size=cli_args.result_cache_size * GB,
+            results_format=cli_args.results_format,
         )
         if not cli_args.suppress_validation:
             aedt_tester.validate_config()
@@ -98,25 +162,75 @@ class ElectronicsDesktopTester:
         only_reference: Optional[bool],
         reference_folder: Optional[Path],
         debug: Optional[bool] = False,
+        placement: str = "first-fit",
+        runtime_history: Optional[Path] = None,
+        backfill: bool = False,
+        max_cores_per_host: Optional[int] = None,
+        timeout: Optional[float] = None,
+        retries: int = 0,
+        retry_backoff: float = 60,
+        telemetry_interval: Optional[float] = None,
+        session_pool: int = 0,
+        session_cores: int = 1,
+        batch_size: int = 10,
+        launcher: str = "auto",
+        submit_command: Optional[str] = None,
+        cancel_command: Optional[str] = None,
+        dry_run_speedup: float = 1,
+        custom_hosts: Optional[str] = None,
+        staging_cache: Optional[Path] = None,
+        prefetch: int = 2,
+        local_scratch: Optional[str] = None,
+        scratch_copy_command: str = DEFAULT_COPY_COMMAND,
+        extract_only: bool = False,
+        result_cache: Optional[Path] = None,
+        result_cache_size: float = 10 * GB,
+        results_format: str = "json",
     ) -> None:
         logger.info(f"Initialize new Electronics Desktop Test run. Configuration folder is {config_folder}")
         self.version = version
+        self.placement = placement
+        self.backfill = backfill
+        self.timeout = timeout
+        self.retries = retries
+        self.retry_backoff = retry_backoff
+        self.telemetry_interval = telemetry_interval
+        self.telemetry: Dict[str, Dict[str, Any]] = {}
+        self.session_pool = session_pool
+        self.session_cores = session_cores
+        self.session_allocations: Dict[str, Dict[str, Dict[str, int]]] = {}
+        self.session_samplers: Dict[str, ProcessTreeSampler] = {}
+        self.pooled: List[str] = []
+        # pooled projects that are not finished yet may still be passed to the allocator
+        self.pending_pooled = 0
+        self.batch_size = batch_size
+        self.staging = StagingCache(staging_cache) if staging_cache else None
+        self.prefetch = prefetch
+        self.staging_executor: Optional[ThreadPoolExecutor] = None
+        self.staged: Dict[str, "asyncio.Future[str]"] = {}
+        self.staging_times: Dict[str, float] = {}
+        self.batches: Dict[str, List[str]] = {}
         self.max_cores = max_cores
         self.max_parallel_projects = max_parallel_projects
-        self.active_tasks = 0
         self.out_dir = Path(out_dir) if out_dir else CWD_DIR
         self.results_path = self.out_dir / f"results_{time_now(posix=True)}"
         self.reference_folder = self.results_path / "reference_folder"
         self.proj_dir = self.out_dir if save_projects else self.results_path
         self.keep_sim_data = bool(save_projects)
+        self.scratch = (
+            NodeScratch(local_scratch, self.results_path.name, scratch_copy_command) if local_scratch else None
+        )
+        # hosts that hold the project on scratch, host and path of the project solved on scratch now
+        self.scratch_hosts: Dict[str, Set[str]] = {}
+        self.scratch_paths: Dict[str, Tuple[str, str]] = {}
+        self.result_cache = ResultCache(result_cache, int(result_cache_size)) if result_cache else None
+        self.cache_keys: Dict[str, str] = {}
+        self.results_format = results_format
         self.only_reference = only_reference
-        self.reference_data = {}
+        # reference data of a project is loaded only when the project is compared
+        self.reference_data = ReferenceIndex()
         if not only_reference and reference_folder is not None:
-            for ref in reference_folder.rglob("*.json"):
-                with open(ref) as file:
-                    data = json.load(file)
-                self.reference_data[data["name"]] = data
-                self.reference_data[data["name"]]["filepath"] = reference_folder
+            self.reference_data = ReferenceIndex(reference_folder)
 
         self.script = str(MODULE_DIR / "simulation_data.py")
 
@@ -126,11 +240,70 @@ class ElectronicsDesktopTester:
         if debug:
             self.script_args += " --debug"
 
+        self.extract_only = extract_only
+        if extract_only:
+            self.script_args += " --extract-only"
+
         self.report_data: Dict[str, Any] = {}
 
-        self.machines_dict = {machine.hostname: machine.cores for machine in get_job_machines()}
+        self.ledger = ResourceLedger(
+            {
+                machine.hostname: min(machine.cores, max_cores_per_host or machine.cores)
+                for machine in get_job_machines(custom_hosts)
+            },
+            max_cores,
+        )
 
         self.project_tests_config = read_configs(config_folder)
+        if extract_only:
+            # saved solutions are only post-processed, unsolved setups are solved on a single core
+            for project_config in self.project_tests_config.values():
+                distribution = session_distribution(1)
+                if "timeout" in project_config["distribution"]:
+                    distribution["timeout"] = project_config["distribution"]["timeout"]
+                project_config["distribution"] = distribution
+
+        self.runtime_history = runtime_history
+        self.measured_runtimes: Dict[str, float] = {}
+        self.runtime_estimates = estimate_runtimes(
+            self.project_tests_config, self.reference_data.summaries(), read_runtime_history(runtime_history)
+        )
+
+        self.priority = prioritize_projects(self.project_tests_config, self.runtime_estimates)
+        # expected durations by task name, estimate of a lead project is replaced by the estimate of its batch
+        self.task_durations = dict(self.runtime_estimates)
+        # default launcher is resolved on every start, Intel MPI is looked up only when a project is started
+        self.launcher: Optional[LocalLauncher] = None
+        if launcher != "auto":
+            self.launcher = create_launcher(
+                launcher,
+                version,
+                submit_command=submit_command,
+                cancel_command=cancel_command,
+                durations=self.task_durations,
+                dry_run_speedup=dry_run_speedup,
+            )
+        self.queue: List[str] = []
+        self.pending_retries = 0
+        self.attempts: Dict[str, List[Dict[str, Any]]] = {}
+
+    @property
+    def machines_dict(self) -> Dict[str, int]:
+        """Free cores per machine, stored in ``self.ledger``."""
+        return self.ledger.machines_dict
+
+    @machines_dict.setter
+    def machines_dict(self, value: Dict[str, int]) -> None:
+        self.ledger.machines_dict = value
+
+    @property
+    def active_tasks(self) -> int:
+        """Number of running projects, stored in ``self.ledger``."""
+        return self.ledger.active_tasks
+
+    @active_tasks.setter
+    def active_tasks(self, value: int) -> None:
+        self.ledger.active_tasks = value
 
     def validate_config(self) -> None:
         """Make quick validation of --config-folder [and --reference-file if present].
@@ -157,6 +330,14 @@ class ElectronicsDesktopTester:
                 if cores % tasks != 0:
                     raise KeyError("'cores' divided by 'parametric_tasks' must be integer")
 
+            if not isinstance(config["batchable"], bool):
+                raise KeyError("'batchable' key must be true or false")
+
+            if "timeout" in distribution_config:
+                timeout = distribution_config["timeout"]
+                if isinstance(timeout, bool) or not isinstance(timeout, (int, float)) or timeout <= 0:
+                    raise KeyError("'timeout' key must be a positive number of seconds")
+
         if not self.only_reference:
             not_found_in_conf = set(self.reference_data) - set(self.project_tests_config)
             if not_found_in_conf:
@@ -181,30 +362,18 @@ class ElectronicsDesktopTester:
         self.validate_hardware()
         self.initialize_results()
 
-        threads_list = []
-        with mkdtemp_persistent(persistent=self.keep_sim_data, dir=self.proj_dir, prefix=f"{self.version}_") as tmp_dir:
-            for project_name, allocated_machines in self.allocator():
-                project_config = self.project_tests_config[project_name]
+        if platform.system() == "Windows" and sys.version_info < (3, 8):
+            # subprocesses are supported only by proactor event loop, default since Python 3.8
+            asyncio.set_event_loop_policy(asyncio.WindowsProactorEventLoopPolicy())  # type: ignore[attr-defined]
 
-                logger.info(f"Start project {project_name}")
-                copy_dependencies(project_config, tmp_dir)
-                project_path = copy_proj(project_config, tmp_dir)
-
-                thread_kwargs = {
-                    "project_path": project_path,
-                    "allocated_machines": allocated_machines,
-                    "project_config": project_config,
-                    "project_name": project_name,
-                }
-                thread = threading.Thread(target=self.task_runner, daemon=True, kwargs=thread_kwargs)
-                thread.start()
-                threads_list.append(thread)
+        with mkdtemp_persistent(persistent=self.keep_sim_data, dir=self.proj_dir, prefix=f"{self.version}_") as tmp_dir:
+            asyncio.run(self.run_projects(tmp_dir))
 
-            for th in threads_list:
-                # wait for all threads to finish before delete folder
-                th.join()
+            self.render_main_html(finished=True)
+            if self.runtime_history is not None and not self.extract_only:
+                # duration of extraction is not a runtime of the project
+                write_runtime_history(self.runtime_history, self.measured_runtimes)
 
-            self.render_main_html(finished=True)  # make thread-safe render
             msg = (
                 f"Job is completed.\nReference result folder is stored under {self.reference_folder}"
                 f"\nYou can view report by opening in web browser: {self.results_path / 'main.html'}"
@@ -212,6 +381,572 @@ class ElectronicsDesktopTester:
 
             logger.info(msg)
 
+    async def run_projects(self, tmp_dir: str) -> None:
+        """Start all projects from a single event loop and wait until they finish.
+
+        Parameters
+        ----------
+        tmp_dir : str
+            Path where projects are copied and solved.
+
+        """
+        tasks = []
+        if self.result_cache is not None:
+            await self.restore_cached_projects(tmp_dir)
+
+        pool = self.start_session_pool(Path(tmp_dir) / "sessions")
+        if pool is not None:
+            tasks.append(asyncio.ensure_future(self.run_pooled_projects(pool, tmp_dir)))
+
+        self.batches = group_batches(
+            self.project_tests_config,
+            [project_name for project_name in self.priority if project_name not in self.pooled],
+            self.batch_size,
+        )
+        self.estimate_batch_runtimes()
+
+        # one copy at a time keeps dependencies shared by projects consistent, folders are copied in parallel
+        self.staging_executor = ThreadPoolExecutor(max_workers=1)
+        try:
+            async for project_name, allocated_machines in self.allocator():
+                # batch is started once, its projects are retried one by one
+                project_names = self.batches.pop(project_name, [project_name])
+                tasks.append(asyncio.ensure_future(self.start_project(project_names, allocated_machines, tmp_dir)))
+                self.prefetch_projects(tmp_dir)
+
+            # wait for all tasks to finish before delete folder
+            await asyncio.gather(*tasks)
+        finally:
+            self.staging_executor.shutdown(wait=True)
+
+        if self.scratch is not None and not self.keep_sim_data:
+            # projects that failed in all attempts are left on scratch for the retry
+            for project_name, hosts in list(self.scratch_hosts.items()):
+                for host in list(hosts):
+                    await self.remove_from_scratch(project_name, host)
+
+        if self.staging is not None:
+            logger.info(self.staging.summary())
+
+    async def restore_cached_projects(self, tmp_dir: str) -> None:
+        """Report projects with unchanged inputs from ``self.result_cache`` and remove them from the queue.
+
+        Parameters
+        ----------
+        tmp_dir : str
+            Path where cached results are restored.
+
+        """
+        assert self.result_cache is not None
+        loop = asyncio.get_running_loop()
+        with open(self.script, "rb") as file:
+            # results of another extraction script are not comparable
+            salt = f"{hashlib.sha1(file.read()).hexdigest()}\0{self.extract_only}"
+
+        for project_name in list(self.priority):
+            project_config = self.project_tests_config[project_name]
+            key = await loop.run_in_executor(
+                None, self.result_cache.key, project_config, self.version, salt, self.extract_only
+            )
+            self.cache_keys[project_name] = key
+            entry = self.result_cache.lookup(key)
+            if entry is None:
+                continue
+
+            logger.info(f"Project {project_name} is unchanged, results are restored from the result cache")
+            cached_dir = Path(tmp_dir, "cached", project_name)
+            report_file = await loop.run_in_executor(None, self.result_cache.restore, entry, project_name, cached_dir)
+            self.priority.remove(project_name)
+            self.report_data["projects"][project_name]["cached"] = True
+            await self.report_project(project_name, str(report_file.with_suffix(".aedt")))
+
+    async def start_project(
+        self, project_names: List[str], allocated_machines: Dict[str, Dict[str, int]], tmp_dir: str
+    ) -> None:
+        """Wait until the project or batch is staged and solve it on allocated machines.
+
+        Parameters
+        ----------
+        project_names : list
+            Names of the project or of all projects of a batch.
+        allocated_machines : dict
+            Machines and cores that were allocated.
+        tmp_dir : str
+            Path where projects are copied and solved.
+
+        """
+        start = time.monotonic()
+        project_paths = []
+        try:
+            for project_name in project_names:
+                logger.info(f"Start project {project_name}")
+                project_paths.append(await self.stage_project(project_name, tmp_dir))
+                # retry of the project is staged again
+                self.staged.pop(project_name)
+            if self.scratch is not None:
+                host = list(allocated_machines)[0]
+                for project_name, project_path in zip(project_names, project_paths):
+                    await self.push_to_scratch(project_name, project_path, host, tmp_dir)
+        except Exception as exc:
+            # cores are allocated already, the allocator would wait for them forever
+            logger.exception(f"Staging of {project_names[0]} failed")
+            self.ledger.release_cores(allocated_machines, project_names[0])
+            for project_name in project_names:
+                self.staged.pop(project_name, None)
+                project_path = self.staged_path(project_name, tmp_dir)
+                await self.report_project(project_name, project_path, errors=f"Staging of the project failed: {exc}")
+            self.ledger.finish_task()
+            return
+
+        logger.debug(f"Allocated cores waited {time.monotonic() - start:.1f} s for staging of {project_names[0]}")
+
+        if len(project_names) > 1:
+            await self.batch_task_runner(project_names, project_paths, allocated_machines, tmp_dir)
+        else:
+            await self.task_runner(
+                project_name=project_names[0],
+                project_path=project_paths[0],
+                project_config=self.project_tests_config[project_names[0]],
+                allocated_machines=allocated_machines,
+            )
+
+    def prefetch_projects(self, tmp_dir: str) -> None:
+        """Start staging of the next ``self.prefetch`` projects of the queue in background.
+
+        Parameters
+        ----------
+        tmp_dir : str
+            Path where projects are copied and solved.
+
+        """
+        for lead in self.queue[: self.prefetch]:
+            for project_name in self.batches.get(lead, [lead]):
+                self.stage_project(project_name, tmp_dir)
+
+    def stage_project(self, project_name: str, tmp_dir: str) -> "asyncio.Future[str]":
+        """Start copy of the project and its dependencies unless it is already started.
+
+        Parameters
+        ----------
+        project_name : str
+            Name of the project.
+        tmp_dir : str
+            Path where projects are copied and solved.
+
+        Returns
+        -------
+        asyncio.Future
+            Path to the copied project when staging is finished.
+
+        """
+        if project_name not in self.staged:
+            loop = asyncio.get_running_loop()
+            self.staged[project_name] = loop.run_in_executor(
+                self.staging_executor, self.copy_project, project_name, tmp_dir
+            )
+        return self.staged[project_name]
+
+    def staged_path(self, project_name: str, tmp_dir: str) -> str:
+        """Path to the copy of the project, also if staging failed.
+
+        Parameters
+        ----------
+        project_name : str
+            Name of the project.
+        tmp_dir : str
+            Path where projects are copied and solved.
+
+        Returns
+        -------
+        str
+            Path to the copied project.
+
+        """
+        project_dir = Path(tmp_dir)
+        if self.scratch is not None:
+            # folder of the project is transferred to scratch as a whole
+            project_dir /= project_name
+        return str(project_dir / Path(self.project_tests_config[project_name]["path"]).name)
+
+    def copy_project(self, project_name: str, tmp_dir: str) -> str:
+        """Copy project and its dependencies, executed in the staging thread.
+
+        Parameters
+        ----------
+        project_name : str
+            Name of the project.
+        tmp_dir : str
+            Path where projects are copied and solved.
+
+        Returns
+        -------
+        str
+            Path to the copied project.
+
+        """
+        start = time.monotonic()
+        project_config = self.project_tests_config[project_name]
+        tmp_dir = str(Path(self.staged_path(project_name, tmp_dir)).parent)
+        copy_dependencies(project_config, tmp_dir, self.staging)
+        project_path = copy_proj(project_config, tmp_dir, self.staging, results=self.extract_only)
+        lock_file = Path(f"{project_path}.lock")
+        if project_name in self.attempts and lock_file.exists():
+            # crashed Electronics Desktop leaves the project locked
+            lock_file.unlink()
+
+        self.staging_times[project_name] = round(time.monotonic() - start, 1)
+        logger.info(f"Project {project_name} is staged in {self.staging_times[project_name]} s")
+        return str(project_path)
+
+    async def push_to_scratch(self, project_name: str, project_path: str, host: str, tmp_dir: str) -> None:
+        """Transfer staged project to scratch of the host that solves it.
+
+        If the transfer fails, the project is solved in the shared run folder.
+
+        Parameters
+        ----------
+        project_name : str
+            Name of the project.
+        project_path : str
+            Path to the staged project.
+        host : str
+            Host that solves the project.
+        tmp_dir : str
+            Path where projects are copied and solved.
+
+        """
+        assert self.scratch is not None
+        local_dir = Path(tmp_dir) / project_name
+        remote_dir = self.scratch.project_dir(project_name)
+        start = time.monotonic()
+        try:
+            await self.scratch.push(local_dir, host, remote_dir)
+        except subprocess.CalledProcessError as exc:
+            logger.warning(
+                f"Transfer of {project_name} to scratch of {host} failed, solve it in {local_dir}: {exc.output}"
+            )
+            return
+        except OSError as exc:
+            logger.warning(f"Transfer of {project_name} to scratch of {host} failed, solve it in {local_dir}: {exc}")
+            return
+
+        logger.debug(
+            f"Project {project_name} is transferred to {host}:{remote_dir} in {time.monotonic() - start:.1f} s"
+        )
+        self.scratch_hosts.setdefault(project_name, set()).add(host)
+        self.scratch_paths[project_name] = (host, str(remote_dir / Path(project_path).relative_to(local_dir)))
+
+    async def pull_from_scratch(self, project_name: str, project_path: str) -> None:
+        """Transfer results of the project solved on scratch back to the staged project.
+
+        Only ``<project_name>.json``, the checkpoint and the profiles and mesh statistics they refer to are
+        transferred, the whole folder if simulation data is saved. Paths in the results are rewritten to the staged
+        project. Folder on scratch is removed once the results are transferred, unless simulation data is saved.
+
+        Parameters
+        ----------
+        project_name : str
+            Name of the project.
+        project_path : str
+            Path to the staged project.
+
+        """
+        if project_name not in self.scratch_paths:
+            return
+
+        assert self.scratch is not None
+        host, run_path = self.scratch_paths.pop(project_name)
+        remote_dir = self.scratch.project_dir(project_name)
+        depth = len(Path(run_path).relative_to(remote_dir).parts)
+        local_dir = Path(project_path).parents[depth - 1]
+        # checkpoint is left only if Electronics Desktop crashed, retry resumes from it
+        results_files = [
+            Path(project_path).parent / f"{project_name}{suffix}" for suffix in (".json", CHECKPOINT_SUFFIX)
+        ]
+        if self.keep_sim_data:
+            await self.pull_file(project_name, host, remote_dir, local_dir)
+        else:
+            for results_file in results_files:
+                remote_path = Path(run_path).parent / results_file.name
+                await self.pull_file(project_name, host, remote_path, results_file)
+
+        loop = asyncio.get_running_loop()
+        relative_paths: Set[str] = set()
+        for results_file in results_files:
+            relative_paths.update(
+                await loop.run_in_executor(None, relocate_results, results_file, remote_dir, local_dir)
+            )
+
+        if self.keep_sim_data:
+            return
+
+        for relative_path in sorted(relative_paths):
+            await self.pull_file(project_name, host, remote_dir / relative_path, local_dir / relative_path)
+
+        if results_files[0].exists():
+            await self.remove_from_scratch(project_name, host)
+
+    async def remove_from_scratch(self, project_name: str, host: str) -> None:
+        """Remove folder of the project from scratch of the host, failure is only logged.
+
+        Parameters
+        ----------
+        project_name : str
+            Name of the project.
+        host : str
+            Host that holds the project on scratch.
+
+        """
+        assert self.scratch is not None
+        remote_dir = self.scratch.project_dir(project_name)
+        self.scratch_hosts.get(project_name, set()).discard(host)
+        try:
+            await self.scratch.remove(host, remote_dir)
+        except subprocess.CalledProcessError as exc:
+            logger.warning(f"Folder {host}:{remote_dir} is not removed from scratch: {exc.output}")
+        except OSError as exc:
+            logger.warning(f"Folder {host}:{remote_dir} is not removed from scratch: {exc}")
+
+    async def pull_file(self, project_name: str, host: str, remote_path: Path, local_path: Path) -> None:
+        """Transfer file or folder from scratch of the host, missing files are ignored.
+
+        Parameters
+        ----------
+        project_name : str
+            Name of the project.
+        host : str
+            Host that solved the project.
+        remote_path : pathlib.Path
+            File or folder on scratch of the host.
+        local_path : pathlib.Path
+            Destination in the shared run folder.
+
+        """
+        assert self.scratch is not None
+        try:
+            await self.scratch.pull(host, remote_path, local_path)
+        except (OSError, subprocess.CalledProcessError) as exc:
+            # e.g. Electronics Desktop crashed before results were written
+            logger.debug(f"Results of {project_name} are not transferred from {host}:{remote_path}: {exc}")
+
+    def run_path(self, project_name: str, project_path: str) -> str:
+        """Path to the project that is opened by Electronics Desktop, on scratch if it was transferred.
+
+        Parameters
+        ----------
+        project_name : str
+            Name of the project.
+        project_path : str
+            Path to the staged project.
+
+        """
+        return self.scratch_paths.get(project_name, ("", project_path))[1]
+
+    def estimate_batch_runtimes(self) -> None:
+        """Replace runtime estimate of the project that leads a batch by the estimate of the whole batch.
+
+        If runtime of any project of the batch is unknown, the batch has no estimate. Estimate of the batch is
+        added to ``self.task_durations`` under the task name of the batch.
+
+        """
+        for lead, project_names in self.batches.items():
+            estimates = [self.runtime_estimates.get(project_name) for project_name in project_names]
+            if None in estimates:
+                self.runtime_estimates.pop(lead, None)
+            else:
+                self.runtime_estimates[lead] = sum(estimates)  # type: ignore[arg-type]
+                self.task_durations[f"{BATCH_PREFIX}{lead}"] = self.runtime_estimates[lead]
+
+    def start_session_pool(self, pool_dir: Path) -> Optional[SessionPool]:
+        """Allocate cores and start sessions for projects that can be solved in the session pool.
+
+        Sets ``self.pooled``, these projects are not passed to the allocator.
+
+        Parameters
+        ----------
+        pool_dir : pathlib.Path
+            Directory for files of the sessions.
+
+        Returns
+        -------
+        SessionPool or None
+            Started pool or ``None`` if pool is disabled or nothing can be solved in it.
+
+        """
+        # projects restored from the result cache are not in the queue anymore
+        pooled = [
+            project_name
+            for project_name in select_pooled_projects(self.project_tests_config, self.session_cores)
+            if project_name in self.priority
+        ]
+        if not self.session_pool or not pooled:
+            return None
+
+        launchers = []
+        distribution_config = session_distribution(self.session_cores)
+        for number in range(1, min(self.session_pool, len(pooled)) + 1):
+            allocated_machines = allocate_task_within_node(
+                distribution_config, self.ledger.machines_dict, self.placement
+            )
+            if not allocated_machines or self.ledger.cores_left() < self.session_cores:
+                break
+
+            session_name = f"session_{number}"
+            self.ledger.acquire(allocated_machines, session_name)
+            self.session_allocations[session_name] = allocated_machines
+            launchers.append(functools.partial(self.launch_session, allocated_machines))
+
+        if not launchers:
+            logger.warning("Not enough resources to start sessions, all projects are started separately")
+            return None
+
+        logger.info(f"Started {len(launchers)} session(s) for projects: {', '.join(pooled)}")
+        self.pooled = [project_name for project_name in self.priority if project_name in pooled]
+        self.pending_pooled = len(self.pooled)
+        return SessionPool(pool_dir, launchers, max_restarts=self.retries)
+
+    async def launch_session(self, allocated_machines: Dict[str, Dict[str, int]], worker_dir: Path) -> None:
+        """Start Electronics Desktop session that processes jobs from ``worker_dir``.
+
+        Parameters
+        ----------
+        allocated_machines : dict
+            Machines and cores that were allocated for the session.
+        worker_dir : pathlib.Path
+            Directory with inbox and outbox of the session.
+
+        """
+        log_file = LOGFOLDER_PATH / f"framework_{worker_dir.name}.log"
+        sampler = ProcessTreeSampler(self.telemetry_interval) if self.telemetry_interval else None
+        if sampler is not None:
+            self.session_samplers[worker_dir.name] = sampler
+        await execute_aedt(
+            self.version,
+            allocated_machines,
+            distribution_config=session_distribution(self.session_cores),
+            script=self.script,
+            script_args=self.script_args.format(log_file) + f" --worker-dir='{worker_dir}'",
+            output_log=LOGFOLDER_PATH / f"{worker_dir.name}_stdout.log",
+            launcher=self.launcher,
+            task_name=worker_dir.name,
+            sampler=sampler,
+        )
+
+    async def run_pooled_projects(self, pool: SessionPool, tmp_dir: str) -> None:
+        """Solve all pooled projects, then stop the sessions and return their cores.
+
+        Parameters
+        ----------
+        pool : SessionPool
+            Started session pool.
+        tmp_dir : str
+            Path where projects are copied and solved.
+
+        """
+        try:
+            await asyncio.gather(
+                *(self.session_task_runner(pool, project_name, tmp_dir) for project_name in self.pooled)
+            )
+        finally:
+            await pool.stop()
+            for session_name, allocated_machines in self.session_allocations.items():
+                self.ledger.release_cores(allocated_machines, session_name)
+                self.ledger.finish_task()
+
+    async def session_task_runner(self, pool: SessionPool, project_name: str, tmp_dir: str) -> None:
+        """Solve project in an idle session of the pool and render its report.
+
+        Attempts, retries, telemetry and runtime are recorded as for a project started separately. Project that
+        crashed the session is retried separately. If no session is left, the project is started separately.
+
+        Parameters
+        ----------
+        pool : SessionPool
+            Started session pool.
+        project_name : str
+            Name of the project to start.
+        tmp_dir : str
+            Path where projects are copied and solved.
+
+        """
+        try:
+            try:
+                worker = await pool.acquire()
+            except SessionError as exc:
+                logger.warning(f"{exc}, project {project_name} is started separately")
+                self.return_to_queue(project_name)
+                return
+
+            await self.solve_in_session(pool, worker, project_name, tmp_dir)
+        finally:
+            self.pending_pooled -= 1
+            self.ledger.notify()
+
+    async def solve_in_session(self, pool: SessionPool, worker: SessionWorker, project_name: str, tmp_dir: str) -> None:
+        """Solve project in the acquired session, return the session and report the project or schedule its retry.
+
+        Parameters
+        ----------
+        pool : SessionPool
+            Started session pool.
+        worker : SessionWorker
+            Session acquired for the project.
+        project_name : str
+            Name of the project to start.
+        tmp_dir : str
+            Path where projects are copied and solved.
+
+        """
+        project_config = self.project_tests_config[project_name]
+        logger.info(f"Start project {project_name} in {worker.name}")
+        try:
+            project_path = await self.stage_project(project_name, tmp_dir)
+        except Exception as exc:
+            logger.exception(f"Staging of {project_name} failed")
+            pool.release(worker)
+            self.staged.pop(project_name, None)
+            project_path = self.staged_path(project_name, tmp_dir)
+            await self.report_project(project_name, project_path, errors=f"Staging of the project failed: {exc}")
+            return
+
+        self.staged.pop(project_name)
+        self.report_data["projects"][project_name].update({"time": time_now(), "status": "running"})
+        self.render_main_html()
+
+        sampler = self.session_samplers.get(worker.name)
+        if sampler is not None:
+            # session samples resource usage since its start
+            sampler.reset()
+        errors = None
+        outcome = "success"
+        start_time = time.monotonic()
+        try:
+            timeout = project_config["distribution"].get("timeout", self.timeout)
+            result = await worker.submit({"project_path": project_path}, timeout)
+            if result["status"] != "done":
+                errors = f"Project failed in {worker.name}: {result.get('error')}"
+                outcome = "fail"
+        except SessionError as exc:
+            errors = str(exc)
+            outcome = "crash"
+        except subprocess.TimeoutExpired as exc:
+            errors = f"Electronics Desktop was killed after timeout of {exc.timeout} s"
+            outcome = "timeout"
+        finally:
+            pool.release(worker)
+
+        if outcome == "success":
+            self.measured_runtimes[project_name] = time.monotonic() - start_time
+
+        if sampler is not None and sampler.samples["time"]:
+            self.telemetry[project_name] = sampler.report(self.session_cores)
+
+        if self.record_attempt(project_name, self.session_allocations[worker.name], outcome, start_time):
+            # session is restarted for the next project, retry is started separately
+            self.schedule_retry(project_name, errors)  # type: ignore[arg-type]
+        else:
+            await self.report_project(project_name, project_path, errors, outcome == "timeout")
+
     def validate_hardware(self) -> None:
         """Validate that we have enough hardware resources to run requested configuration."""
         all_cores = [val for val in self.machines_dict.values()]
@@ -224,16 +959,21 @@ class ElectronicsDesktopTester:
             ):
                 raise ValueError(f"{proj} requires {proj_cores} cores. Not enough resources to run")
 
+            if proj_cores > self.max_cores:
+                raise ValueError(f"{proj} requires {proj_cores} cores. Limit set by --max-cores is {self.max_cores}")
+
     def initialize_results(self) -> None:
-        """Copy static web parts (HTML, CSS, JS).
+        """Link static web parts (CSS, JS) from the assets folder shared by all runs in the output directory.
 
         Mutate ``self.report_data``. Set all projects status to be ``'Queued'``, default link and delta.
+        Reference artifacts are linked later, when report of the project is prepared.
 
         """
         if self.results_path.exists():
-            remove_tree(str(self.results_path))
-        copy_path_to(str(MODULE_DIR / "static" / "css"), str(self.results_path))
-        copy_path_to(str(MODULE_DIR / "static" / "js"), str(self.results_path))
+            shutil.rmtree(self.results_path)
+        assets_dir = share_static_assets(self.out_dir / ASSETS_FOLDER)
+        for folder in ("css", "js"):
+            file_transfer.copy_tree(assets_dir / folder, self.results_path / folder, file_transfer.link_file)
         self.reference_folder.mkdir()
         if self.only_reference:
             for project_name in self.project_tests_config:
@@ -255,12 +995,6 @@ class ElectronicsDesktopTester:
                 # initialize integer for proper rendering
                 self.report_data["projects"][project_name]["delta"] = 0
                 self.report_data["projects"][project_name]["avg"] = 0
-                if project_name in self.reference_data:
-                    reference_path = Path(self.reference_data[project_name]["filepath"], project_name)
-                    copy_path_to(
-                        reference_path.resolve(),
-                        self.reference_folder,
-                    )
 
         self.render_main_html()
 
@@ -280,6 +1014,7 @@ class ElectronicsDesktopTester:
             "finished": finished,
             "all_delta": self.report_data["all_delta"],
             "has_reference": not self.only_reference,
+            "cores": self.ledger.budget_usage(),
         }
         data = MAIN_PAGE_TEMPLATE.render(context=ctx)
         with open(self.results_path / "main.html", "w") as file:
@@ -308,18 +1043,22 @@ class ElectronicsDesktopTester:
             "slider_limit": project_report["slider_limit"],
             "max_avg": project_report["max_avg"],
             "has_reference": not self.only_reference,
+            "attempts": self.attempts.get(project_name, []),
+            "telemetry": project_report.get("telemetry"),
         }
         data = PROJECT_PAGE_TEMPLATE.render(context=page_ctx)
         with open(self.results_path / f"{project_name}.html", "w") as file:
             file.write(data)
 
-    def task_runner(
+    async def task_runner(
         self, project_name: str, project_path: str, project_config: Dict[str, Any], allocated_machines: Dict[str, Any]
     ) -> None:
-        """Task runner that is called by each thread.
+        """Task runner coroutine that is started for each project.
 
-        Mutates ``self.report_data["projects"]`` and ``self.machines_dict``
+        Mutates ``self.report_data["projects"]`` and returns resources to ``self.ledger``
         Calls update of HTML pages status, starts AEDT process, calls render of project_name.html
+        Report is prepared in a thread pool to keep the event loop responsive.
+        If Electronics Desktop crashes and retries are left, project is put back to the queue instead.
 
         Parameters
         ----------
@@ -336,35 +1075,253 @@ class ElectronicsDesktopTester:
         self.report_data["projects"][project_name]["status"] = "running"
         self.render_main_html()
 
-        log_file = LOGFOLDER_PATH / f"framework_{project_name}.log"
-        errors = None
+        sampler = ProcessTreeSampler(self.telemetry_interval) if self.telemetry_interval else None
+        start_time = time.monotonic()
         try:
-            execute_aedt(
-                self.version,
+            errors, outcome = await self.run_electronics_desktop(
                 allocated_machines,
                 distribution_config=project_config["distribution"],
+                task_name=project_name,
+                timeout=project_config["distribution"].get("timeout", self.timeout),
+                project_path=self.run_path(project_name, project_path),
+                sampler=sampler,
+            )
+        finally:
+            # return cores back, allocator is woken up immediately
+            self.ledger.release_cores(allocated_machines, project_name)
+
+        try:
+            await self.pull_from_scratch(project_name, project_path)
+
+            if outcome == "success":
+                logger.debug(f"Project {project_name} analyses finished. Prepare report.")
+                self.measured_runtimes[project_name] = time.monotonic() - start_time
+
+            if sampler is not None and sampler.samples["time"]:
+                cores = sum(machine["cores"] for machine in allocated_machines.values())
+                self.telemetry[project_name] = sampler.report(cores)
+
+            if self.record_attempt(project_name, allocated_machines, outcome, start_time):
+                self.schedule_retry(project_name, errors)  # type: ignore[arg-type]
+            else:
+                await self.report_project(project_name, project_path, errors, outcome == "timeout")
+        finally:
+            self.ledger.finish_task()
+
+    async def batch_task_runner(
+        self,
+        project_names: List[str],
+        project_paths: List[str],
+        allocated_machines: Dict[str, Any],
+        tmp_dir: str,
+    ) -> None:
+        """Solve several projects one after another in a single Electronics Desktop launch.
+
+        Projects that wrote their results before a crash or timeout are reported as usual. Projects are solved in
+        order, so only the first project without results was running when the launch ended: it is retried alone
+        if retries are left, otherwise it is reported with the error of the launch. Following projects without
+        a checkpoint were not started, they are put back to the queue without using up an attempt.
+        Runtime of a batch is not recorded in the runtime history, resource usage is shared by all its projects.
+
+        Parameters
+        ----------
+        project_names : list
+            Names of the projects of the batch, the first one leads the batch.
+        project_paths : list
+            Paths to the copied projects.
+        allocated_machines : dict
+            Machines and cores that were allocated for the batch.
+        tmp_dir : str
+            Path where projects are copied and solved.
+
+        """
+        batch_name = f"{BATCH_PREFIX}{project_names[0]}"
+        for project_name in project_names:
+            self.report_data["projects"][project_name].update({"time": time_now(), "status": "running"})
+        self.render_main_html()
+
+        batch_file = Path(tmp_dir) / f"{batch_name}.json"
+        with open(batch_file, "w") as file:
+            run_paths = [self.run_path(*project) for project in zip(project_names, project_paths)]
+            json.dump({"projects": run_paths}, file, indent=4)
+
+        timeouts = [
+            self.project_tests_config[project_name]["distribution"].get("timeout", self.timeout)
+            for project_name in project_names
+        ]
+        sampler = ProcessTreeSampler(self.telemetry_interval) if self.telemetry_interval else None
+        start_time = time.monotonic()
+        try:
+            errors, outcome = await self.run_electronics_desktop(
+                allocated_machines,
+                distribution_config=self.project_tests_config[project_names[0]]["distribution"],
+                task_name=batch_name,
+                timeout=None if None in timeouts else sum(timeouts),
+                script_args=f" --batch-file='{batch_file}'",
+                sampler=sampler,
+            )
+        finally:
+            self.ledger.release_cores(allocated_machines, project_names[0])
+
+        try:
+            for project_name, project_path in zip(project_names, project_paths):
+                await self.pull_from_scratch(project_name, project_path)
+
+            if sampler is not None and sampler.samples["time"]:
+                cores = sum(machine["cores"] for machine in allocated_machines.values())
+                telemetry = sampler.report(cores)
+                self.telemetry.update((project_name, telemetry) for project_name in project_names)
+
+            interrupted = False
+            for project_name, project_path in zip(project_names, project_paths):
+                project_dir = Path(project_path).parent
+                if (project_dir / f"{project_name}.json").exists():
+                    # project was finished before the launch ended
+                    self.record_attempt(project_name, allocated_machines, "success", start_time)
+                    await self.report_project(project_name, project_path)
+                elif interrupted and not (project_dir / f"{project_name}{CHECKPOINT_SUFFIX}").exists():
+                    self.return_to_queue(project_name)
+                elif self.record_attempt(project_name, allocated_machines, outcome, start_time):
+                    interrupted = True
+                    self.schedule_retry(project_name, errors)  # type: ignore[arg-type]
+                else:
+                    interrupted = True
+                    await self.report_project(project_name, project_path, errors, outcome == "timeout")
+        finally:
+            self.ledger.finish_task()
+
+    async def run_electronics_desktop(
+        self,
+        allocated_machines: Dict[str, Any],
+        distribution_config: Dict[str, Any],
+        task_name: str,
+        timeout: Optional[float],
+        project_path: Optional[str] = None,
+        script_args: str = "",
+        sampler: Optional[ProcessTreeSampler] = None,
+    ) -> Tuple[Optional[str], str]:
+        """Run the script in Electronics Desktop and describe how the run ended.
+
+        Parameters
+        ----------
+        allocated_machines : dict
+            Machines and cores that were allocated for the run.
+        distribution_config : dict
+            Distribution configuration for the run.
+        task_name : str
+            Name of the project or batch, used for names of log files.
+        timeout : float, optional
+            Wall time limit in seconds.
+        project_path : str, optional
+            Path to the project opened on start.
+        script_args : str, default=""
+            Arguments appended to the common arguments of the script.
+        sampler : ProcessTreeSampler, optional
+            Sampler of resource usage of the process tree.
+
+        Returns
+        -------
+        tuple
+            Error message or ``None`` and outcome: ``success``, ``fail``, ``crash`` or ``timeout``.
+
+        """
+        log_file = LOGFOLDER_PATH / f"framework_{task_name}.log"
+        try:
+            await execute_aedt(
+                self.version,
+                allocated_machines,
+                distribution_config=distribution_config,
                 script=self.script,
-                script_args=self.script_args.format(log_file),
+                script_args=self.script_args.format(log_file) + script_args,
                 project_path=project_path,
+                output_log=LOGFOLDER_PATH / f"{task_name}_stdout.log",
+                timeout=timeout,
+                sampler=sampler,
+                launcher=self.launcher,
+                task_name=task_name,
             )
-            logger.debug(f"Project {project_name} analyses finished. Prepare report.")
-
         except OSError as exc:
-            errors = str(exc)
+            return str(exc), "fail"
         except subprocess.CalledProcessError as exc:
             errors = f"Electronics Desktop crashed. Most probably design is not valid. Log: {exc}"
-        finally:
-            # return cores back
-            for machine in allocated_machines:
-                self.machines_dict[machine] += allocated_machines[machine]["cores"]
+            if exc.output:
+                errors += f"\nLast lines of output:\n{exc.output}"
+            return errors, "crash"
+        except subprocess.TimeoutExpired as exc:
+            errors = f"Electronics Desktop was killed after timeout of {exc.timeout} s"
+            if exc.output:
+                errors += f"\nLast lines of output:\n{exc.output}"
+            return errors, "timeout"
+
+        return None, "success"
+
+    def record_attempt(
+        self, project_name: str, allocated_machines: Dict[str, Any], outcome: str, start_time: float
+    ) -> bool:
+        """Add attempt to the history of the project.
+
+        Parameters
+        ----------
+        project_name : str
+            Name of the project.
+        allocated_machines : dict
+            Machines and cores that were allocated for the attempt.
+        outcome : str
+            Outcome of the attempt, see ``run_electronics_desktop()``.
+        start_time : float
+            Monotonic time when the attempt was started.
 
-        project_report = self.prepare_project_report(project_name, project_path)
+        Returns
+        -------
+        bool
+            ``True`` if Electronics Desktop crashed and the project must be retried.
+
+        """
+        attempts = self.attempts.setdefault(project_name, [])
+        attempts.append(
+            {
+                "attempt": len(attempts) + 1,
+                "hosts": list(allocated_machines),
+                "status": outcome,
+                "duration": round(time.monotonic() - start_time, 1),
+                "staging": self.staging_times.get(project_name),
+                "time": self.report_data["projects"][project_name]["time"],
+            }
+        )
+        return outcome == "crash" and len(attempts) <= self.retries
+
+    async def report_project(
+        self, project_name: str, project_path: str, errors: Optional[str] = None, timed_out: bool = False
+    ) -> None:
+        """Prepare and render report of the finished project, update its status on the main page.
+
+        Parameters
+        ----------
+        project_name : str
+            Name of the project.
+        project_path : str
+            Path to the project.
+        errors : str, optional
+            Error of the Electronics Desktop run.
+        timed_out : bool, default=False
+            Whether Electronics Desktop was killed after timeout.
+
+        """
+        loop = asyncio.get_running_loop()
+        if not errors and not timed_out:
+            # report renames exported files, store them before
+            await loop.run_in_executor(None, self.store_in_result_cache, project_name, project_path)
+        project_report = await loop.run_in_executor(None, self.prepare_project_report, project_name, project_path)
+        # runner memory does not grow with the number of compared projects
+        self.reference_data.release(project_name)
         if errors:
             project_report["error_exception"].insert(0, errors)  # type: ignore[union-attr]
 
         self.render_project_html(project_name, project_report)
 
         status = "success" if not project_report["error_exception"] else "fail"
+        if timed_out:
+            status = "timeout"
         self.report_data["projects"][project_name].update(
             {
                 "link": f"{project_name}.html",
@@ -376,7 +1333,81 @@ class ElectronicsDesktopTester:
         )
 
         self.render_main_html()
-        self.active_tasks -= 1
+
+    def store_in_result_cache(self, project_name: str, project_path: str) -> None:
+        """Store results of the successfully solved project in ``self.result_cache``.
+
+        Parameters
+        ----------
+        project_name : str
+            Name of the project.
+        project_path : str
+            Path to the project.
+
+        """
+        if (
+            self.result_cache is None
+            or project_name not in self.cache_keys
+            or self.report_data["projects"][project_name].get("cached")
+        ):
+            return
+
+        report_file = Path(project_path).parent / f"{project_name}.json"
+        try:
+            self.result_cache.store(self.cache_keys[project_name], project_name, report_file)
+        except (OSError, ValueError) as exc:
+            # e.g. missing report, it is reported as an error of the project
+            logger.warning(f"Results of {project_name} are not stored in the result cache: {exc}")
+
+    def schedule_retry(self, project_name: str, errors: str) -> None:
+        """Put crashed project back to the queue after exponential backoff.
+
+        Parameters
+        ----------
+        project_name : str
+            Name of the crashed project.
+        errors : str
+            Error message of the crashed attempt.
+
+        """
+        attempt = len(self.attempts[project_name])
+        delay = self.retry_backoff * 2 ** (attempt - 1)
+        logger.warning(f"Project {project_name} crashed, attempt {attempt}. Retry in {delay} s. {errors}")
+        self.report_data["projects"][project_name].update({"status": "retry", "time": time_now()})
+        self.render_main_html()
+
+        # allocator must wait for the project even if the queue is empty
+        self.pending_retries += 1
+        asyncio.get_running_loop().call_later(delay, self.requeue, project_name)
+
+    def return_to_queue(self, project_name: str) -> None:
+        """Put project that was not started back to the queue without backoff, no attempt is recorded.
+
+        Parameters
+        ----------
+        project_name : str
+            Name of the project.
+
+        """
+        logger.info(f"Project {project_name} was not started, it is put back to the queue")
+        self.report_data["projects"][project_name].update({"status": "queued", "time": time_now()})
+        self.render_main_html()
+        self.pending_retries += 1
+        self.requeue(project_name)
+
+    def requeue(self, project_name: str) -> None:
+        """Return project to the queue keeping the initial order of priority and wake up the allocator.
+
+        Parameters
+        ----------
+        project_name : str
+            Name of the project.
+
+        """
+        self.pending_retries -= 1
+        self.queue.append(project_name)
+        self.queue.sort(key=self.priority.index)
+        self.ledger.notify()
 
     def prepare_project_report(self, project_name: str, project_path: str) -> Dict[str, Union[List[Any], int]]:
         """Prepare project report dictionary that is required by ``render_project_html()``.
@@ -402,10 +1433,21 @@ class ElectronicsDesktopTester:
             "simulation_time": [],
             "slider_limit": 0,
             "max_avg": 0,
+            "telemetry": {},
         }
         project_data = self.check_all_results_present(project_report["error_exception"], report_file, project_name)
         project_data["aedt_version"] = self.version
         project_data["name"] = project_name
+        if project_name in self.telemetry:
+            # samples are plotted in the report only, results keep the summary
+            project_data["telemetry"] = self.telemetry[project_name]["summary"]
+            self.extract_telemetry_data(self.telemetry[project_name], project_report)
+
+        if project_name in self.reference_data:
+            try:
+                self.link_reference_artifacts(project_name)
+            except OSError as exc:
+                project_report["error_exception"].append(f"Reference artifacts are not available: {exc}")
 
         keys_missing = bool(project_report["error_exception"])
 
@@ -426,22 +1468,47 @@ class ElectronicsDesktopTester:
                 # extract XY curve data
                 self.extract_curve_data(design_data, design_name, project_name, project_report)
 
-            with open(self.reference_folder / f"ref_{project_name}.json", "w") as file:
-                json.dump(project_data, file, indent=4)
+            if not report_file.exists():
+                # partial results restored from the checkpoint must not become a reference
+                project_report["error_exception"].append(
+                    f"Results of {project_name} are incomplete, reference file is not written"
+                )
+                return project_report
+
+            if self.results_format == "binary":
+                write_results(project_data, self.reference_folder / f"ref_{project_name}{BINARY_SUFFIX}")
+            else:
+                with open(self.reference_folder / f"ref_{project_name}.json", "w") as file:
+                    json.dump(project_data, file, indent=4)
 
         except Exception as exc:
             project_report["error_exception"].append(str(exc))
 
         return project_report
 
+    def link_reference_artifacts(self, project_name: str) -> None:
+        """Link profiles and mesh statistics of the reference run to the results folder.
+
+        Parameters
+        ----------
+        project_name : str
+            Name of the project.
+
+        """
+        reference_path = Path(self.reference_data[project_name]["filepath"], project_name).resolve()
+        if reference_path.is_dir():
+            file_transfer.copy_tree(reference_path, self.reference_folder / project_name, file_transfer.link_file)
+
     def check_all_results_present(
         self, project_exceptions: List[str], report_file: Path, project_name: str
     ) -> Dict[str, Any]:
-        """Check that report file exists.
+        """Check that report file exists, otherwise assemble partial results from the checkpoint.
 
         Check that project report exists in reference data.
         Check that all keys present in the reference data are also in the current run data.
         Check that all keys present in the current run data are also in the reference data.
+        Results restored from the checkpoint are compared only for their designs, every design that is missing
+        is added to errors of the project, so the restored designs are still compared.
 
         Parameters
         ----------
@@ -459,26 +1526,49 @@ class ElectronicsDesktopTester:
 
         """
         project_data: Dict[str, Any] = {"error_exception": []}
-        if not report_file.exists():
-            project_exceptions.append(f"Project report for {project_name} does not exist")
-            return project_data
-
-        with open(report_file) as file:
-            project_data = json.load(file)
+        restored = False
+        if report_file.exists():
+            with open(report_file) as file:
+                project_data = json.load(file)
+        else:
+            checkpoint_data = read_checkpoint(report_file.with_suffix(CHECKPOINT_SUFFIX))
+            if checkpoint_data is None:
+                project_exceptions.append(f"Project report for {project_name} does not exist")
+                return project_data
+
+            # designs of the crashed run are still compared
+            project_data = checkpoint_data
+            project_data["error_exception"].insert(
+                0, f"Project report for {project_name} is incomplete, designs were restored from checkpoint"
+            )
+            restored = True
 
         if not self.only_reference:
             if project_name not in self.reference_data:
                 project_exceptions.append(f"Project report for {project_name} does not exist in reference file")
             else:
+                reference_designs = self.reference_data[project_name]["designs"]
+                if restored:
+                    for design_name in reference_designs:
+                        if design_name not in project_data["designs"]:
+                            project_data["error_exception"].append(
+                                f"Design {design_name} is missing, it was not extracted before the crash"
+                            )
+                    reference_designs = {
+                        design_name: design_data
+                        for design_name, design_data in reference_designs.items()
+                        if design_name in project_data["designs"]
+                    }
+
                 compare_keys(
-                    self.reference_data[project_name]["designs"],
+                    reference_designs,
                     project_data["designs"],
                     exceptions_list=project_exceptions,
                     results_type="current",
                 )
                 compare_keys(
                     project_data["designs"],
-                    self.reference_data[project_name]["designs"],
+                    reference_designs,
                     exceptions_list=project_exceptions,
                     results_type="reference",
                 )
@@ -543,16 +1633,7 @@ class ElectronicsDesktopTester:
                             project_report["error_exception"].append(msg)
                             continue
 
-                        max_delta = 0
-                        difference = []
-                        for ref, actual in zip(y_ref_data, curve_data["y_data"]):
-                            difference.append(ref - actual)
-                            # avoid division by zero by using small tolerance of 1e-20
-                            max_delta = max(max_delta, abs(1 - ref / (actual or 1e-20)))
-
-                        max_delta_perc = round(max_delta * 100, 3)
-                        mean_curve_data = mean(curve_data["y_data"])
-                        avg_perc = round(abs(1 - mean(y_ref_data) / (mean_curve_data or 1e-20)), 3)
+                        difference, max_delta_perc, avg_perc = compare_curve(y_ref_data, curve_data["y_data"])
 
                         # take always integer since ticks are integers, and +1 to allow to slide
                         project_report["slider_limit"] = max(project_report["slider_limit"], int(max_delta_perc) + 1)
@@ -560,7 +1641,8 @@ class ElectronicsDesktopTester:
                         plot_data.update(
                             {
                                 "version_ref": self.reference_data[project_name]["aedt_version"],
-                                "y_axis_ref": y_ref_data,
+                                # binary references hold memory-mapped arrays
+                                "y_axis_ref": list(y_ref_data),
                                 "diff": difference,
                                 "delta": max_delta_perc,
                                 "avg": avg_perc,
@@ -569,6 +1651,48 @@ class ElectronicsDesktopTester:
 
                     project_report["plots"].append(plot_data)
 
+    def extract_telemetry_data(
+        self, telemetry: Dict[str, Any], project_report: Dict[str, Union[List[Any], Any]]
+    ) -> None:
+        """Extract resource usage summary and plots of sampled metrics.
+
+        Mutate project_report.
+
+        Parameters
+        ----------
+        telemetry : dict
+            Samples and summary reported by ``ProcessTreeSampler``.
+        project_report : dict
+            Project report dictionary that is required by 'render_project_html()'.
+
+        """
+        project_report["telemetry"] = telemetry["summary"]
+        samples = telemetry["samples"]
+        metrics = {
+            "cpu": ("CPU utilization", "[cores]", 1),
+            "rss": ("Memory RSS", "[MB]", 1),
+            "threads": ("Threads", "[]", 1),
+            "read_bytes": ("Disk read", "[MB]", MB),
+            "write_bytes": ("Disk write", "[MB]", MB),
+        }
+        for key, (name, unit, divider) in metrics.items():
+            project_report["plots"].append(
+                {
+                    "name": f"Resource usage:{name}",
+                    "id": unique_id(),
+                    "x_label": '"Time [s]"',
+                    "y_label": f'"{unit}"',
+                    "x_axis": samples["time"],
+                    "version_ref": -1,
+                    "y_axis_ref": [],
+                    "version_now": str(self.version),
+                    "y_axis_now": [round(value / divider, 2) for value in samples[key]],
+                    "diff": [],
+                    "delta": -1,
+                    "avg": -1,
+                }
+            )
+
     def extract_mesh_or_time_data(
         self,
         key_name: str,
@@ -609,7 +1733,10 @@ class ElectronicsDesktopTester:
                     cont += 1
                 filepath.rename(new_absolute_path)
 
-                new_path = str(copy_path_to(new_absolute_path, reference_profiles))
+                reference_profiles.mkdir(parents=True, exist_ok=True)
+                new_path = str(reference_profiles / new_absolute_path.name)
+                # exported file is removed together with the project, thus it is not symlinked
+                file_transfer.link_file(new_absolute_path, Path(new_path), symlink=False)
                 new_path_relative = str(Path(new_path).relative_to(self.proj_dir)).replace("\\", "/")
                 design_data[extract][variation_name][setup_name] = new_path_relative
                 stat_dict = {
@@ -625,71 +1752,630 @@ class ElectronicsDesktopTester:
                         )
                         continue
 
-                    stat_dict["ref"] = reference_dict[key_name][variation_name][setup_name]
-                    stat_dict["ref_link"] = reference_dict[extract][variation_name][setup_name]
+                    stat_dict["ref"] = reference_dict[key_name][variation_name][setup_name]
+                    stat_dict["ref_link"] = reference_dict[extract][variation_name][setup_name]
+
+                project_report[key_name].append(stat_dict)
+
+    async def allocator(self) -> AsyncIterator[Tuple[str, Dict[str, Dict[str, int]]]]:
+        """Asynchronous generator that yields resources.
+
+        Waits on ``self.ledger`` until resources are available. Finished tasks notify
+        the ledger, so freed cores are granted without delay. Runs until ``self.queue`` is empty,
+        no crashed project waits for a retry and no pooled project may be started separately.
+
+        Yields
+        ------
+        proj_name : str
+            Name of the project.
+        allocated_machines : Dict
+            Allocated machines.
+        """
+        batched = {project_name for project_names in self.batches.values() for project_name in project_names[1:]}
+        self.queue = [
+            project_name
+            for project_name in self.priority
+            if project_name not in self.pooled and project_name not in batched
+        ]
+        queue = self.queue
+        logger.debug(f"Projects queue: {', '.join(queue)}")
+        while queue or self.pending_retries or self.pending_pooled:
+            allocation = self.try_allocate(queue) if queue else None
+            if allocation is None:
+                await self.ledger.wait()
+                continue
+
+            proj_name, allocated_machines = allocation
+            estimate = self.runtime_estimates.get(proj_name)
+            expected_end = time.monotonic() + estimate if estimate is not None else None
+            self.ledger.acquire(allocated_machines, proj_name, expected_end)
+
+            queue.remove(proj_name)
+            yield proj_name, allocated_machines
+
+    def try_allocate(self, queue: List[str]) -> Optional[Tuple[str, Dict[str, Dict[str, int]]]]:
+        """Try to allocate resources for the first project in ``queue`` that fits.
+
+        Parameters
+        ----------
+        queue : list
+            Names of projects waiting for resources, in order of priority.
+
+        Returns
+        -------
+        tuple or None
+            Project name and allocated machines or ``None`` if nothing can be allocated now.
+
+        """
+        if self.ledger.active_tasks >= self.max_parallel_projects:
+            logger.debug("Number of maximum tasks limit is reached. Wait for job to finish")
+            return None
+
+        if self.backfill:
+            allocation = find_backfill_allocation(
+                queue,
+                self.project_tests_config,
+                self.ledger.machines_dict,
+                self.ledger.running_tasks(),
+                time.monotonic(),
+                self.runtime_estimates,
+                self.placement,
+                self.ledger.cores_left(),
+            )
+        else:
+            allocation = find_allocation(
+                queue, self.project_tests_config, self.ledger.machines_dict, self.placement, self.ledger.cores_left()
+            )
+
+        if allocation is not None:
+            return self.avoid_failed_hosts(*self.prefer_scratch_hosts(*allocation))
+
+        if not self.ledger.active_tasks:
+            # nothing is running, so no resources will be returned
+            raise RuntimeError(f"Not enough resources to run any of projects: {', '.join(queue)}")
+
+        msg = f"Waiting for resources. Cores left within --max-cores: {self.ledger.cores_left()}\n"
+        msg += "Cores left per machine:\n"
+        for machine, cores in self.ledger.machines_dict.items():
+            msg += f"{machine} has {cores} core(s) free\n"
+
+        logger.debug(msg)
+        return None
+
+    def prefer_scratch_hosts(
+        self, project_name: str, allocated_machines: Dict[str, Dict[str, int]]
+    ) -> Tuple[str, Dict[str, Dict[str, int]]]:
+        """Move project to hosts that already hold it on scratch, if they have enough free cores.
+
+        Only changed files are transferred to such host again.
+
+        Parameters
+        ----------
+        project_name : str
+            Name of the project.
+        allocated_machines : dict
+            Allocation found for the project.
+
+        Returns
+        -------
+        tuple
+            Project name and allocated machines.
+
+        """
+        scratch_hosts = self.scratch_hosts.get(project_name)
+        if not scratch_hosts or list(allocated_machines)[0] in scratch_hosts:
+            return project_name, allocated_machines
+
+        local_machines = {host: cores for host, cores in self.ledger.machines_dict.items() if host in scratch_hosts}
+        allocation = find_allocation(
+            [project_name], self.project_tests_config, local_machines, self.placement, self.ledger.cores_left()
+        )
+        return allocation or (project_name, allocated_machines)
+
+    def avoid_failed_hosts(
+        self, project_name: str, allocated_machines: Dict[str, Dict[str, int]]
+    ) -> Tuple[str, Dict[str, Dict[str, int]]]:
+        """Move retried project to machines where it did not crash, if they have enough free cores.
+
+        Parameters
+        ----------
+        project_name : str
+            Name of the project.
+        allocated_machines : dict
+            Allocation found for the project.
+
+        Returns
+        -------
+        tuple
+            Project name and allocated machines.
+
+        """
+        failed_hosts = {host for attempt in self.attempts.get(project_name, []) for host in attempt["hosts"]}
+        if not failed_hosts.intersection(allocated_machines):
+            return project_name, allocated_machines
+
+        other_machines = {host: cores for host, cores in self.ledger.machines_dict.items() if host not in failed_hosts}
+        allocation = find_allocation(
+            [project_name], self.project_tests_config, other_machines, self.placement, self.ledger.cores_left()
+        )
+        return allocation or (project_name, allocated_machines)
+
+
+class ResourceLedger:
+    """Ledger of resources shared between the allocator and task runners.
+
+    All changes are done from the event loop thread, thus no locking is required.
+    Every release wakes up the coroutine that waits for resources.
+
+    Parameters
+    ----------
+    machines_dict : dict
+        Free cores per machine.
+    max_cores : float, default=math.inf
+        Global limit of cores in use.
+
+    """
+
+    def __init__(self, machines_dict: Dict[str, int], max_cores: float = math.inf) -> None:
+        self.machines_dict = machines_dict
+        self.total_cores = sum(machines_dict.values())
+        self.max_cores = max_cores
+        self.cores_in_use = 0
+        self.peak_cores = 0
+        self.active_tasks = 0
+        self.running: Dict[str, Tuple[Optional[float], Dict[str, Dict[str, int]]]] = {}
+        self._changed: Optional[asyncio.Event] = None
+
+    def acquire(
+        self,
+        allocated_machines: Dict[str, Dict[str, int]],
+        project_name: Optional[str] = None,
+        expected_end: Optional[float] = None,
+    ) -> None:
+        """Take cores from the pool and register a new active task.
+
+        Parameters
+        ----------
+        allocated_machines : dict
+            Machines and cores that were allocated for the task.
+        project_name : str, optional
+            Name of the project that holds the cores.
+        expected_end : float, optional
+            Time (``time.monotonic()``) when the cores are expected to be returned.
+
+        """
+        for machine in allocated_machines:
+            self.machines_dict[machine] -= allocated_machines[machine]["cores"]
+            self.cores_in_use += allocated_machines[machine]["cores"]
+        self.peak_cores = max(self.peak_cores, self.cores_in_use)
+        self.active_tasks += 1
+        if project_name is not None:
+            self.running[project_name] = (expected_end, allocated_machines)
+
+    def release_cores(self, allocated_machines: Dict[str, Dict[str, int]], project_name: Optional[str] = None) -> None:
+        """Return cores back to the pool and wake up the waiting coroutine.
+
+        Parameters
+        ----------
+        allocated_machines : dict
+            Machines and cores that were allocated for the task.
+        project_name : str, optional
+            Name of the project that held the cores.
+
+        """
+        for machine in allocated_machines:
+            self.machines_dict[machine] += allocated_machines[machine]["cores"]
+            self.cores_in_use -= allocated_machines[machine]["cores"]
+        self.running.pop(project_name or "", None)
+        self.notify()
+
+    def cores_left(self) -> float:
+        """Number of cores that can be allocated within the global limit."""
+        return self.max_cores - self.cores_in_use
+
+    def budget_usage(self) -> Dict[str, Any]:
+        """Cores in use, peak usage and the effective limit of cores for the report."""
+        return {
+            "in_use": self.cores_in_use,
+            "peak": self.peak_cores,
+            "limit": min(self.max_cores, self.total_cores),
+        }
+
+    def running_tasks(self) -> List[Tuple[Optional[float], Dict[str, Dict[str, int]]]]:
+        """Expected end time and allocated machines of the tasks that hold cores."""
+        return list(self.running.values())
+
+    def finish_task(self) -> None:
+        """Unregister active task and wake up the waiting coroutine."""
+        self.active_tasks -= 1
+        self.notify()
+
+    def notify(self) -> None:
+        """Wake up the coroutine that waits for resources."""
+        if self._changed is not None:
+            self._changed.set()
+
+    async def wait(self) -> None:
+        """Wait until resources are returned or a task is finished."""
+        # event is created for every wait, resources are always checked before waiting
+        self._changed = asyncio.Event()
+        try:
+            await self._changed.wait()
+        finally:
+            self._changed = None
+
+
+def prioritize_projects(
+    project_tests_config: Dict[str, Any], runtime_estimates: Optional[Dict[str, float]] = None
+) -> List[str]:
+    """Order projects in which the allocator tries to start them.
+
+    Longest processing time first: projects with the longest estimated runtime start first, so they do not
+    stretch the tail of the run. Projects without estimate follow, all ties are sorted by cores.
+
+    Parameters
+    ----------
+    project_tests_config : dict
+        Configuration of all projects.
+    runtime_estimates : dict, optional
+        Estimated wall time of the projects in seconds.
+
+    Returns
+    -------
+    list
+        Project names sorted by estimated runtime and number of cores, descending.
+
+    """
+    runtime_estimates = runtime_estimates or {}
+    return sorted(
+        project_tests_config.keys(),
+        key=lambda x: (runtime_estimates.get(x, 0), project_tests_config[x]["distribution"]["cores"]),
+        reverse=True,
+    )
+
+
+def select_pooled_projects(project_tests_config: Dict[str, Any], session_cores: int) -> List[str]:
+    """Select projects that can be solved in a session of the pool.
+
+    Sessions are started with automatic distribution on a single machine, thus only projects
+    with automatic distribution, without parametric tasks and that fit into cores of a session are selected.
+
+    Parameters
+    ----------
+    project_tests_config : dict
+        Configuration of all projects.
+    session_cores : int
+        Number of cores of each session.
+
+    Returns
+    -------
+    list
+        Names of the projects.
+
+    """
+    return [
+        project_name
+        for project_name, config in project_tests_config.items()
+        if config["distribution"]["auto"]
+        and config["distribution"]["parametric_tasks"] == 1
+        and config["distribution"]["cores"] <= session_cores
+    ]
+
+
+def group_batches(
+    project_tests_config: Dict[str, Any], project_names: List[str], batch_size: int
+) -> Dict[str, List[str]]:
+    """Group batchable projects with identical distribution into batches solved by a single launch.
+
+    Parameters
+    ----------
+    project_tests_config : dict
+        Configuration of all projects.
+    project_names : list
+        Names of projects that can be batched, in order of priority.
+    batch_size : int
+        Maximum number of projects in a batch.
+
+    Returns
+    -------
+    dict
+        Projects of each batch keyed by the first project of the batch. Batches of a single project are omitted.
+
+    """
+    groups: Dict[str, List[str]] = {}
+    for project_name in project_names:
+        config = project_tests_config[project_name]
+        if not config["batchable"]:
+            continue
+
+        # timeout is summed up for the batch, all other keys define the command line
+        distribution = {key: value for key, value in config["distribution"].items() if key != "timeout"}
+        groups.setdefault(json.dumps(distribution, sort_keys=True), []).append(project_name)
+
+    batches = {}
+    for group in groups.values():
+        for start in range(0, len(group), batch_size):
+            end = start + batch_size
+            batch = group[start:end]
+            if len(batch) > 1:
+                batches[batch[0]] = batch
+
+    return batches
+
+
+def session_distribution(cores: int) -> Dict[str, Any]:
+    """Distribution configuration of a session of the pool.
+
+    Parameters
+    ----------
+    cores : int
+        Number of cores of the session.
+
+    Returns
+    -------
+    dict
+        Distribution configuration.
+
+    """
+    return {
+        "cores": cores,
+        "distribution_types": ["default"],
+        "parametric_tasks": 1,
+        "multilevel_distribution_tasks": 0,
+        "single_node": True,
+        "auto": True,
+    }
+
+
+def find_allocation(
+    queue: List[str],
+    project_tests_config: Dict[str, Any],
+    machines_dict: Dict[str, int],
+    placement: str = "first-fit",
+    cores_left: float = math.inf,
+) -> Optional[Tuple[str, Dict[str, Dict[str, int]]]]:
+    """Find the first project in ``queue`` that fits on free machines and within the cores limit.
+
+    Does not modify ``machines_dict``.
+
+    Parameters
+    ----------
+    queue : list
+        Names of projects waiting for resources, in order of priority.
+    project_tests_config : dict
+        Configuration of all projects.
+    machines_dict : dict
+        All available machines in pool.
+    placement : str, default="first-fit"
+        Placement strategy, one of ``PLACEMENT_STRATEGIES``.
+    cores_left : float, default=math.inf
+        Number of cores that can be allocated within the global limit.
+
+    Returns
+    -------
+    tuple or None
+        Project name and allocated machines or ``None`` if no project fits.
+
+    """
+    queue = [proj_name for proj_name in queue if project_tests_config[proj_name]["distribution"]["cores"] <= cores_left]
+    for proj_name in queue:
+        # first try to fit all jobs within a single node for stability, since projects are sorted
+        # by cores, this ensures that we have optimized resource utilization
+        allocated_machines = allocate_task_within_node(
+            project_tests_config[proj_name]["distribution"], machines_dict, placement
+        )
+        if allocated_machines:
+            return proj_name, allocated_machines
+
+    for proj_name in queue:
+        # since no more machines to fit the whole project, let's split it across machines
+        split_machines = allocate_task(project_tests_config[proj_name]["distribution"], machines_dict, placement)
+        if split_machines:
+            return proj_name, split_machines
+
+    return None
+
+
+def reserve_resources(
+    distribution_config: Dict[str, Any],
+    machines_dict: Dict[str, int],
+    running: List[Tuple[Optional[float], Dict[str, Dict[str, int]]]],
+    placement: str = "first-fit",
+    cores_left: float = math.inf,
+) -> Optional[Tuple[float, Dict[str, int], float]]:
+    """Find the earliest time when a task fits, assuming running tasks end as expected.
+
+    Parameters
+    ----------
+    distribution_config : dict
+        Data about required distribution for the project.
+    machines_dict : dict
+        All available machines in pool.
+    running : list
+        Expected end time (``None`` if unknown) and allocated machines of the running tasks.
+    placement : str, default="first-fit"
+        Placement strategy, one of ``PLACEMENT_STRATEGIES``.
+    cores_left : float, default=math.inf
+        Number of cores that can be allocated now within the global limit.
+
+    Returns
+    -------
+    tuple or None
+        Reservation time (``inf`` if it depends on a task with unknown end), cores per machine and cores within
+        the global limit that stay free after the task starts at that time. ``None`` if the task never fits.
+
+    """
+    free_machines = dict(machines_dict)
+    for expected_end, allocated_machines in sorted(running, key=lambda x: math.inf if x[0] is None else x[0]):
+        for machine, conf in allocated_machines.items():
+            free_machines[machine] += conf["cores"]
+            cores_left += conf["cores"]
+
+        if distribution_config["cores"] > cores_left:
+            continue
+
+        reserved = allocate_task_within_node(distribution_config, free_machines, placement) or allocate_task(
+            distribution_config, free_machines, placement
+        )
+        if reserved:
+            for machine, conf in reserved.items():
+                free_machines[machine] -= conf["cores"]
+            reserved_time = math.inf if expected_end is None else expected_end
+            return reserved_time, free_machines, cores_left - distribution_config["cores"]
+
+    return None
+
+
+def find_backfill_allocation(
+    queue: List[str],
+    project_tests_config: Dict[str, Any],
+    machines_dict: Dict[str, int],
+    running: List[Tuple[Optional[float], Dict[str, Dict[str, int]]]],
+    now: float,
+    runtime_estimates: Dict[str, float],
+    placement: str = "first-fit",
+    cores_left: float = math.inf,
+) -> Optional[Tuple[str, Dict[str, Dict[str, int]]]]:
+    """Find allocation using EASY backfilling.
+
+    The first project in ``queue`` gets a reservation at the earliest time when enough cores are expected to
+    be free. Other projects start only if they do not delay the reservation: either they are expected to finish
+    before it or they use cores that stay free after the first project starts. If the reservation depends on a
+    running task without estimate, its time is unknown and only the cores that stay free are used.
+
+    Parameters
+    ----------
+    queue : list
+        Names of projects waiting for resources, in order of priority.
+    project_tests_config : dict
+        Configuration of all projects.
+    machines_dict : dict
+        All available machines in pool.
+    running : list
+        Expected end time (``None`` if unknown) and allocated machines of the running tasks.
+    now : float
+        Current time, same clock as used for expected end of running tasks.
+    runtime_estimates : dict
+        Estimated wall time of the projects in seconds.
+    placement : str, default="first-fit"
+        Placement strategy, one of ``PLACEMENT_STRATEGIES``.
+    cores_left : float, default=math.inf
+        Number of cores that can be allocated now within the global limit.
+
+    Returns
+    -------
+    tuple or None
+        Project name and allocated machines or ``None`` if no project can start now.
+
+    """
+    head, candidates = queue[0], queue[1:]
+    allocation = find_allocation([head], project_tests_config, machines_dict, placement, cores_left)
+    if allocation is not None:
+        return allocation
+
+    reservation = reserve_resources(
+        project_tests_config[head]["distribution"], machines_dict, running, placement, cores_left
+    )
+    if reservation is None:
+        # head will never fit, do not block other projects
+        return find_allocation(candidates, project_tests_config, machines_dict, placement, cores_left)
+
+    reserved_time, extra_machines, extra_cores = reservation
+    logger.debug(f"Project {head} is reserved to start in {reserved_time - now:.0f} seconds")
+    for proj_name in candidates:
+        estimate = runtime_estimates.get(proj_name)
+        if estimate is not None and math.isfinite(reserved_time) and now + estimate <= reserved_time:
+            available_machines = machines_dict
+            available_cores = cores_left
+        else:
+            available_machines = {
+                machine: min(cores, extra_machines.get(machine, 0)) for machine, cores in machines_dict.items()
+            }
+            available_cores = min(cores_left, extra_cores)
+
+        allocation = find_allocation([proj_name], project_tests_config, available_machines, placement, available_cores)
+        if allocation is not None:
+            logger.debug(f"Backfill project {proj_name} while {head} waits for resources")
+            return allocation
+
+    return None
+
+
+def order_machines(machines_dict: Dict[str, int], cores: int, placement: str = "first-fit") -> List[str]:
+    """Order machines in which they are filled by a task that is split across nodes.
+
+    * first-fit: order of ``machines_dict``
+    * best-fit: the least free machines first
+    * worst-fit: the most free machines first
+    * min-fragmentation: consume whole machines, the largest first, until the rest of the task fits on a
+      single machine, then take the smallest machine that fits the rest
+
+    Parameters
+    ----------
+    machines_dict : dict
+        All available machines in pool.
+    cores : int
+        Number of cores requested by the task.
+    placement : str, default="first-fit"
+        Placement strategy, one of ``PLACEMENT_STRATEGIES``.
+
+    Returns
+    -------
+    list
+        Machine names.
 
-                project_report[key_name].append(stat_dict)
+    """
+    if placement == "first-fit":
+        return list(machines_dict)
 
-    def allocator(self) -> Iterable[Tuple[str, Dict[str, Dict[str, int]]]]:
-        """Generator that yields resources.
+    if placement == "best-fit":
+        return sorted(machines_dict, key=lambda x: machines_dict[x])
 
-        Waits until resources are available.
+    if placement == "worst-fit":
+        return sorted(machines_dict, key=lambda x: machines_dict[x], reverse=True)
 
-        Yields
-        ------
-        proj_name : str
-            Name of the project.
-        allocated_machines : Dict
-            Allocated machines.
-        """
-        sorted_by_cores_desc = sorted(
-            self.project_tests_config.keys(),
-            key=lambda x: self.project_tests_config[x]["distribution"]["cores"],
-            reverse=True,
-        )
-        proj_name = ""
-        while sorted_by_cores_desc:
-            if self.active_tasks >= self.max_parallel_projects:
-                logger.debug("Number of maximum tasks limit is reached. Wait for job to finish")
-                sleep(4)
-                continue
+    if placement == "min-fragmentation":
+        ordered = []
+        left = sorted(machines_dict, key=lambda x: machines_dict[x])
+        to_fill = cores
+        while left and to_fill > 0:
+            fitting = [machine for machine in left if machines_dict[machine] >= to_fill]
+            machine = fitting[0] if fitting else left[-1]
+            ordered.append(machine)
+            left.remove(machine)
+            to_fill -= machines_dict[machine]
 
-            allocated_machines = None
-            for proj_name in sorted_by_cores_desc:
-                # first try to fit all jobs within a single node for stability, since projects are sorted
-                # by cores, this ensures that we have optimized resource utilization
-                allocated_machines = allocate_task_within_node(
-                    self.project_tests_config[proj_name]["distribution"], self.machines_dict
-                )
-                if allocated_machines:
-                    break
-            else:
-                for proj_name in sorted_by_cores_desc:
-                    # since no more machines to fit the whole project, let's split it across machines
-                    allocated_machines = allocate_task(
-                        self.project_tests_config[proj_name]["distribution"], self.machines_dict
-                    )
-                    if allocated_machines:
-                        break
-                else:
-                    msg = "Waiting for resources. Cores left per machine:\n"
-                    for machine, cores in self.machines_dict.items():
-                        msg += f"{machine} has {cores} core(s) free\n"
+        return ordered + left
+
+    raise ValueError(f"Unknown placement strategy: {placement}")
+
+
+def fragmentation(machines_dict: Dict[str, int]) -> float:
+    """Calculate fragmentation of free cores.
+
+    Fragmentation is ``0`` when all free cores are on a single machine and approaches ``1``
+    when free cores are spread in small chunks.
+
+    Parameters
+    ----------
+    machines_dict : dict
+        All available machines in pool.
 
-                    logger.debug(msg)
-                    sleep(5)
+    Returns
+    -------
+    float
+        Fragmentation in range ``[0, 1)``.
 
-            if allocated_machines:
-                for machine in allocated_machines:
-                    self.machines_dict[machine] -= allocated_machines[machine]["cores"]
+    """
+    total = sum(cores for cores in machines_dict.values() if cores > 0)
+    if not total:
+        return 0.0
 
-                sorted_by_cores_desc.remove(proj_name)
-                self.active_tasks += 1
-                yield proj_name, allocated_machines
+    return 1 - max(machines_dict.values()) / total
 
 
 def allocate_task(
-    distribution_config: Dict[str, int], machines_dict: Dict[str, int]
+    distribution_config: Dict[str, int], machines_dict: Dict[str, int], placement: str = "first-fit"
 ) -> Optional[Dict[str, Dict[str, int]]]:
     """Allocate task on one or more nodes.
 
@@ -702,6 +2388,8 @@ def allocate_task(
         Data about required distribution for the project.
     machines_dict : dict
         All available machines in pool.
+    placement : str, default="first-fit"
+        Placement strategy, one of ``PLACEMENT_STRATEGIES``.
 
     Returns
     -------
@@ -722,7 +2410,8 @@ def allocate_task(
     to_fill = distribution_config["cores"]
 
     allocated_machines = {}
-    for machine, cores in machines_dict.items():
+    for machine in order_machines(machines_dict, distribution_config["cores"], placement):
+        cores = machines_dict[machine]
         if cores < 1:
             # skip machine if no cores available
             continue
@@ -757,7 +2446,7 @@ def allocate_task(
 
 
 def allocate_task_within_node(
-    distribution_config: Dict[str, int], machines_dict: Dict[str, int]
+    distribution_config: Dict[str, int], machines_dict: Dict[str, int], placement: str = "first-fit"
 ) -> Dict[str, Dict[str, int]]:
     """Try to fit a task in a node without splitting.
 
@@ -767,6 +2456,9 @@ def allocate_task_within_node(
         Data about required distribution for the project.
     machines_dict : dict
         All available machines in pool.
+    placement : str, default="first-fit"
+        Placement strategy, one of ``PLACEMENT_STRATEGIES``. ``min-fragmentation`` picks the machine
+        that leaves free cores least fragmented, ties are resolved by best-fit.
 
     Returns
     -------
@@ -774,18 +2466,33 @@ def allocate_task_within_node(
         Allocated machines for the project or ``None`` if not allocated.
 
     """
-    for machine, cores in machines_dict.items():
-        if cores - distribution_config["cores"] >= 0:
-            return {
-                machine: {
-                    "cores": distribution_config["cores"],
-                    "tasks": distribution_config["parametric_tasks"],
-                }
-            }
-    return {}
+    candidates = [
+        machine
+        for machine in order_machines(machines_dict, distribution_config["cores"], placement)
+        if machines_dict[machine] - distribution_config["cores"] >= 0
+    ]
+    if not candidates:
+        return {}
+
+    if placement == "min-fragmentation":
+        candidates.sort(
+            key=lambda x: (
+                fragmentation(dict(machines_dict, **{x: machines_dict[x] - distribution_config["cores"]})),
+                machines_dict[x],
+            )
+        )
+
+    return {
+        candidates[0]: {
+            "cores": distribution_config["cores"],
+            "tasks": distribution_config["parametric_tasks"],
+        }
+    }
 
 
-def copy_proj(project_config: Dict[str, Any], dst: str) -> Union[str, List[str]]:
+def copy_proj(
+    project_config: Dict[str, Any], dst: str, staging: Optional[StagingCache] = None, results: bool = False
+) -> Union[str, List[str]]:
     """Copy project to run location, temp by default.
 
     Parameters
@@ -794,6 +2501,10 @@ def copy_proj(project_config: Dict[str, Any], dst: str) -> Union[str, List[str]]
         Configuration of project, distribution, etc.
     dst : str
         Path where to copy.
+    staging : StagingCache, optional
+        Cache to place files from, files are copied from the source if not set.
+    results : bool, default=False
+        Copy saved solutions in ``.aedtresults`` folder next to the project as well.
 
     Returns
     -------
@@ -804,31 +2515,43 @@ def copy_proj(project_config: Dict[str, Any], dst: str) -> Union[str, List[str]]
     src = project_config["path"]
     src_aedb = src.replace(".aedt", ".aedb")
     if Path(src_aedb).exists():
-        copy_path_to(src_aedb, dst)
-    return copy_path_to(src, dst)
+        copy_path_to(src_aedb, dst, staging)
+    if results:
+        src_results = Path(src).with_suffix(".aedtresults")
+        if src_results.exists():
+            copy_path_to(str(src_results), dst, staging)
+        else:
+            logger.warning(f"No saved solutions in {src_results}, all setups of {src} are solved")
+    return copy_path_to(src, dst, staging)
 
 
-def copy_dependencies(project_config: Dict[str, Any], dst: str) -> None:
+def copy_dependencies(project_config: Dict[str, Any], dst: str, staging: Optional[StagingCache] = None) -> None:
     """Copies project dependencies to run location.
 
+    Dependencies are only read, thus they may be hardlinked from ``staging``.
+
     Parameters
     ----------
     project_config : dict
         Configuration of project, distribution, etc.
     dst : str
         Path where to copy.
+    staging : StagingCache, optional
+        Cache to place files from, files are copied from the source if not set.
 
     """
     deps = project_config["dependencies"]
 
     if isinstance(deps, list):
         for dep in deps:
-            copy_path_to(dep, dst)
+            copy_path_to(dep, dst, staging, link=True)
     elif isinstance(deps, str):
-        copy_path_to(deps, dst)
+        copy_path_to(deps, dst, staging, link=True)
 
 
-def copy_path_to(src: Union[str, Path], dst: Union[str, Path]) -> Union[str, List[str]]:
+def copy_path_to(
+    src: Union[str, Path], dst: Union[str, Path], staging: Optional[StagingCache] = None, link: bool = False
+) -> Union[str, List[str]]:
     """Copy path from src to dst.
 
     If ``src`` is a relative path, preserves relative folder tree.
@@ -839,6 +2562,10 @@ def copy_path_to(src: Union[str, Path], dst: Union[str, Path]) -> Union[str, Lis
         Path with copy target, relative or absolute.
     dst : str or Path
         Path where to copy.
+    staging : StagingCache, optional
+        Cache to place files from, files are copied from the source if not set.
+    link : bool, default=False
+        Allow hardlinks to files of ``staging``.
 
     Returns
     -------
@@ -864,14 +2591,53 @@ def copy_path_to(src: Union[str, Path], dst: Union[str, Path]) -> Union[str, Lis
     if not src.exists():
         raise FileExistsError(f"File {src} doesn't exist")
 
-    dst = str(unpack_dst)
-    mkpath(dst)
+    unpack_dst.mkdir(parents=True, exist_ok=True)
+
+    if staging is not None:
+        if src.is_file():
+            return staging.stage_file(src, unpack_dst, link)
+        return staging.stage_tree(src, unpack_dst, link)
 
     if src.is_file():
-        file_path = copy_file(str(src), dst)
-        return file_path[0]
+        file_transfer.copy_file(src, unpack_dst / src.name)
+        return str(unpack_dst / src.name)
     else:
-        return copy_tree(str(src), dst)
+        return file_transfer.copy_tree(src, unpack_dst)
+
+
+def share_static_assets(assets_dir: Path) -> Path:
+    """Copy static web parts once per version of the package to the folder shared by all runs.
+
+    Parameters
+    ----------
+    assets_dir : pathlib.Path
+        Folder of shared assets in the output directory.
+
+    Returns
+    -------
+    pathlib.Path
+        Folder with ``css`` and ``js`` folders.
+
+    """
+    static_dir = MODULE_DIR / "static"
+    digest = hashlib.sha1()
+    for path in sorted(path for folder in ("css", "js") for path in (static_dir / folder).rglob("*")):
+        stat = path.stat()
+        digest.update(f"{path.relative_to(static_dir)}\0{stat.st_size}\0{stat.st_mtime_ns}\n".encode())
+
+    shared_dir = assets_dir / digest.hexdigest()[:12]
+    if shared_dir.is_dir():
+        return shared_dir
+
+    tmp_dir = assets_dir / f"{shared_dir.name}.{os.getpid()}.tmp"
+    for folder in ("css", "js"):
+        file_transfer.copy_tree(static_dir / folder, tmp_dir / folder)
+    try:
+        os.replace(tmp_dir, shared_dir)
+    except OSError:
+        # assets were shared by a concurrent run
+        shutil.rmtree(tmp_dir)
+    return shared_dir
 
 
 def mkdtemp_persistent(*args: Any, persistent: bool = True, **kwargs: Any) -> Any:
@@ -903,19 +2669,13 @@ def mkdtemp_persistent(*args: Any, persistent: bool = True, **kwargs: Any) -> An
         return tempfile.TemporaryDirectory(*args, **kwargs)
 
 
-def generator_unique_id() -> Iterator[str]:
-    """Generator that incrementally yields new IDs."""
-    i = 1
-    while True:
-        yield f"a{i}"
-        i += 1
-
-
-id_generator = generator_unique_id()
+id_counter = itertools.count(1)
+# reports are prepared in a thread pool, counter is advanced by one thread at a time
+id_lock = threading.Lock()
 
 
 def unique_id() -> str:
-    """When called runs generator to pick new unique ID.
+    """When called advances the counter to pick new unique ID, safe to call from several threads.
 
     Returns
     -------
@@ -923,18 +2683,26 @@ def unique_id() -> str:
         New ID.
 
     """
-    return next(id_generator)
+    with id_lock:
+        return f"a{next(id_counter)}"
 
 
-def execute_aedt(
+async def execute_aedt(
     version: str,
     machines: Dict[str, Any],
     distribution_config: Dict[str, Any],
     script: Optional[str] = None,
     script_args: Optional[str] = None,
     project_path: Optional[str] = None,
+    output_log: Optional[Path] = None,
+    timeout: Optional[float] = None,
+    sampler: Optional[ProcessTreeSampler] = None,
+    launcher: Optional[LocalLauncher] = None,
+    task_name: str = "aedt",
 ) -> None:
-    """Execute single instance of Electronics Desktop.
+    """Execute single instance of Electronics Desktop as a subprocess of the running event loop.
+
+    If the coroutine is cancelled or timeout expires, the process tree is killed.
 
     Parameters
     ----------
@@ -950,10 +2718,28 @@ def execute_aedt(
         Arguments to the script.
     project_path : str, optional
         Path to the project.
+    output_log : pathlib.Path, optional
+        File where standard output and error of the process are streamed. Output is discarded if not set.
+    timeout : float, optional
+        Wall time limit in seconds.
+    sampler : ProcessTreeSampler, optional
+        Sampler of resource usage of the process tree.
+    launcher : LocalLauncher, optional
+        Backend that starts Electronics Desktop. Intel MPI on Linux and direct start on Windows by default.
+    task_name : str, default="aedt"
+        Name of the project or batch passed to the launcher.
 
     """
-    aedt_path = get_aedt_executable_path(version)
-    command = [aedt_path]
+    if launcher is None:
+        launcher = create_launcher("auto", version)
+
+    if isinstance(launcher, DryRunLauncher):
+        # installation is not required
+        command = ["ansysedt"]
+    else:
+        command = [get_aedt_executable_path(version)]
+
+    machines = launcher.machines(machines)
 
     if int(version) >= 231:
         os.environ["ANSYSEM_GEOM_KERN_FORCE_OVERWRITE_ORIG_PROJECT"] = "1"
@@ -999,14 +2785,227 @@ def execute_aedt(
             project_path,
         ]
 
-    if platform.system() == "Linux":
-        logger.debug("Execute via Intel MPI")
-        mpi_path = get_intel_mpi_path(version)
-        command = [mpi_path, "-envall", "-n", "1", "-hosts", list(machines.keys())[0]] + command
+    command = launcher.command(command, machines, task_name)
+    logger.debug(f"Execute {task_name} via {type(launcher).__name__}")
+    await run_process(command, output_log, timeout, sampler, launcher.stop_command)
+
+
+def create_launcher(
+    name: str,
+    version: str,
+    submit_command: Optional[str] = None,
+    cancel_command: Optional[str] = None,
+    script_dir: Path = LOGFOLDER_PATH / "job_scripts",
+    durations: Optional[Dict[str, float]] = None,
+    dry_run_speedup: float = 1,
+) -> LocalLauncher:
+    """Create backend that starts Electronics Desktop.
+
+    Parameters
+    ----------
+    name : str
+        One of ``LAUNCHERS``. ``auto`` is ``mpiexec`` on Linux and ``local`` on other platforms.
+    version : str
+        Version of Electronics Desktop.
+    submit_command : str, optional
+        Command template of ``submit`` launcher.
+    cancel_command : str, optional
+        Command template of ``submit`` launcher that cancels the job after timeout or interruption.
+    script_dir : pathlib.Path, default=LOGFOLDER_PATH / "job_scripts"
+        Directory for job scripts of ``submit`` launcher.
+    durations : dict, optional
+        Durations of projects for ``dry-run`` launcher in seconds.
+    dry_run_speedup : float, default=1
+        Factor to shorten durations of ``dry-run`` launcher.
+
+    Returns
+    -------
+    LocalLauncher
+        Launcher.
+
+    """
+    if name == "auto":
+        name = "mpiexec" if platform.system() == "Linux" else "local"
+
+    if name == "mpiexec":
+        return MpiexecLauncher(get_intel_mpi_path(version))
+    if name == "srun":
+        return SrunLauncher()
+    if name == "submit":
+        if not submit_command:
+            raise ValueError("submit launcher requires --submit-command")
+        return SubmitLauncher(submit_command, script_dir, create_launcher("auto", version), cancel_command)
+    if name == "dry-run":
+        return DryRunLauncher(durations if durations is not None else {}, speedup=dry_run_speedup)
+    if name == "local":
+        return LocalLauncher()
+
+    raise ValueError(f"Unknown launcher: {name}")
+
+
+async def run_process(
+    command: List[str],
+    output_log: Optional[Path] = None,
+    timeout: Optional[float] = None,
+    sampler: Optional[ProcessTreeSampler] = None,
+    stop_command: Optional[Callable[[str], Optional[List[str]]]] = None,
+) -> None:
+    """Run process and stream its output to the log file.
+
+    Process is started in a new session, so the whole process tree (e.g. ``mpiexec`` and
+    ``ansysedt``) is killed if timeout expires or the coroutine is cancelled. Work that outlives the process tree,
+    e.g. a job of the batch scheduler, is stopped by the command from ``stop_command``.
+
+    Parameters
+    ----------
+    command : list
+        Command to execute.
+    output_log : pathlib.Path, optional
+        File where standard output and error of the process are appended after a separator line with the time and
+        the command. Output is discarded if not set.
+    timeout : float, optional
+        Wall time limit in seconds.
+    sampler : ProcessTreeSampler, optional
+        Sampler of resource usage that runs while the process is alive.
+    stop_command : callable, optional
+        Returns command to run after the process tree is killed from the beginning of its output, see
+        ``LocalLauncher.stop_command()``.
+
+    Raises
+    ------
+    subprocess.CalledProcessError
+        Process exited with non-zero code. Last lines of the output are stored in ``output``.
+    subprocess.TimeoutExpired
+        Process was killed after ``timeout``. Last lines of the output are stored in ``output``.
+
+    """
+    output_log = output_log or Path(os.devnull)
+    logger.debug(f"Execute {subprocess.list2cmdline(command)}. Output is written to {output_log}")
+    with open(output_log, "a") as file:
+        # output of a retry is appended, it does not overwrite the output of the crash
+        file.write(f"===== {time_now()} {subprocess.list2cmdline(command)} =====\n")
+    process = await asyncio.create_subprocess_exec(
+        *command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, start_new_session=True
+    )
+    tail: Deque[bytes] = deque(maxlen=OUTPUT_TAIL_LINES)
+    head = bytearray()
+
+    async def communicate() -> None:
+        await stream_output(process.stdout, output_log, tail, head)  # type: ignore[arg-type]
+        await process.wait()
+
+    async def kill() -> None:
+        kill_process_tree(process.pid)
+        await process.wait()
+        command = stop_command(head.decode(errors="replace")) if stop_command is not None else None
+        if command:
+            await run_stop_command(command)
+
+    sampling = asyncio.ensure_future(sampler.run(process.pid)) if sampler is not None else None
+    try:
+        await asyncio.wait_for(communicate(), timeout)
+    except asyncio.TimeoutError:
+        logger.warning(f"Kill process {process.pid} after timeout of {timeout} s")
+        await kill()
+        raise subprocess.TimeoutExpired(command, timeout, decode_tail(tail))  # type: ignore[arg-type]
+    except asyncio.CancelledError:
+        await kill()
+        raise
+    finally:
+        if sampling is not None:
+            sampling.cancel()
+            # sample in progress is finished before samples are reported
+            await asyncio.gather(sampling, return_exceptions=True)
+
+    if process.returncode:
+        raise subprocess.CalledProcessError(process.returncode, command, decode_tail(tail))
+
+
+async def run_stop_command(command: List[str]) -> None:
+    """Run command that stops work of the killed process, failure is only logged.
+
+    Parameters
+    ----------
+    command : list
+        Command to run, e.g. cancel of the job of the batch scheduler.
+
+    """
+    logger.info(f"Execute {subprocess.list2cmdline(command)}")
+    try:
+        process = await asyncio.create_subprocess_exec(
+            *command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, stdin=subprocess.DEVNULL
+        )
+        output, _ = await process.communicate()
+    except OSError as exc:
+        logger.warning(f"{command[0]} failed: {exc}")
+        return
+
+    if process.returncode:
+        logger.warning(f"{command[0]} failed with code {process.returncode}: {output.decode(errors='replace')}")
+
 
-    logger.debug(f"Execute {subprocess.list2cmdline(command)}")
-    output = subprocess.check_output(command)
-    logger.debug(output.decode())
+def kill_process_tree(pid: int) -> None:
+    """Kill process and all its children.
+
+    Parameters
+    ----------
+    pid : int
+        ID of the process that was started in a new session.
+
+    """
+    if sys.platform == "win32":
+        subprocess.run(["taskkill", "/F", "/T", "/PID", str(pid)], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    else:
+        try:
+            # process started with ``start_new_session`` is the leader of its process group
+            os.killpg(pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+
+
+async def stream_output(
+    stream: asyncio.StreamReader, output_log: Path, tail: Deque[bytes], head: Optional[bytearray] = None
+) -> None:
+    """Write output of a process to the log file while it is running.
+
+    Output is read in chunks of ``OUTPUT_CHUNK_SIZE``, so memory usage does not depend on the
+    size of the output or on the length of a line.
+
+    Parameters
+    ----------
+    stream : asyncio.StreamReader
+        Output of the process.
+    output_log : pathlib.Path
+        Path to the log file, output is appended.
+    tail : collections.deque
+        Bounded deque that is filled with last lines of the output.
+    head : bytearray, optional
+        Filled with up to ``OUTPUT_CHUNK_SIZE`` first bytes of the output.
+
+    """
+    partial_line = b""
+    with open(output_log, "ab") as file:
+        while True:
+            chunk = await stream.read(OUTPUT_CHUNK_SIZE)
+            if not chunk:
+                break
+
+            file.write(chunk)
+            file.flush()
+            if head is not None and len(head) < OUTPUT_CHUNK_SIZE:
+                head += chunk[: OUTPUT_CHUNK_SIZE - len(head)]
+            *lines, partial_line = (partial_line + chunk).split(b"\n")
+            tail.extend(lines)
+            # do not grow on output without line breaks
+            partial_line = partial_line[-OUTPUT_CHUNK_SIZE:]
+
+    if partial_line:
+        tail.append(partial_line)
+
+
+def decode_tail(tail: Deque[bytes]) -> str:
+    """Decode last lines of the output."""
+    return "\n".join(line.decode(errors="replace").rstrip("\r") for line in tail)
 
 
 def get_intel_mpi_path(version: str) -> str:
@@ -1122,6 +3121,161 @@ def compare_keys(
             compare_keys(val, dict_2[key], exceptions_list, dict_path=f"{dict_path}{key}", results_type=results_type)
 
 
+def read_checkpoint(checkpoint_file: Path) -> Optional[Dict[str, Any]]:
+    """Assemble partial results from the checkpoint of the project.
+
+    Parameters
+    ----------
+    checkpoint_file : pathlib.Path
+        Checkpoint that is written by ``simulation_data.py`` after every design.
+
+    Returns
+    -------
+    dict or None
+        Project data in format of the project report file or ``None`` if no design was checkpointed.
+
+    """
+    if not checkpoint_file.is_file():
+        return None
+
+    project_data: Dict[str, Any] = {"error_exception": [], "designs": {}}
+    with open(checkpoint_file) as file:
+        for line in file:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                # line was cut by the crash
+                continue
+            project_data["designs"][record["design"]] = record["data"]
+            project_data["error_exception"] += record["errors"]
+
+    return project_data if project_data["designs"] else None
+
+
+def parse_simulation_time(simulation_time: str) -> int:
+    """Convert simulation time from the profile to seconds.
+
+    Parameters
+    ----------
+    simulation_time : str
+        Elapsed time in format ``HH:MM:SS``.
+
+    Returns
+    -------
+    int
+        Number of seconds.
+
+    """
+    hours, minutes, seconds = simulation_time.split(":")
+    return int(hours or 0) * 3600 + int(minutes) * 60 + int(seconds)
+
+
+def estimate_runtime(project_data: Dict[str, Any], parametric_tasks: int = 1) -> Optional[float]:
+    """Estimate wall time of a project from simulation times of its designs.
+
+    Simulation time of all designs, variations and setups is summed up. Variations are solved in parallel,
+    thus the sum is divided by number of parametric tasks.
+
+    Parameters
+    ----------
+    project_data : dict
+        Results of the project, e.g. reference data.
+    parametric_tasks : int, default=1
+        Number of parametric tasks that are run in parallel.
+
+    Returns
+    -------
+    float or None
+        Estimated wall time in seconds or ``None`` if no simulation time is recorded.
+
+    """
+    total = None
+    for design_data in project_data.get("designs", {}).values():
+        for variation_data in design_data.get("simulation_time", {}).values():
+            for simulation_time in variation_data.values():
+                if isinstance(simulation_time, str):
+                    total = (total or 0) + parse_simulation_time(simulation_time)
+
+    if total is None:
+        return None
+
+    return total / max(parametric_tasks, 1)
+
+
+def estimate_runtimes(
+    project_tests_config: Dict[str, Any], reference_data: Dict[str, Any], runtime_history: Dict[str, float]
+) -> Dict[str, float]:
+    """Estimate wall time of all projects.
+
+    Wall time measured in previous runs is preferred, otherwise estimate from reference simulation times is used.
+
+    Parameters
+    ----------
+    project_tests_config : dict
+        Configuration of all projects.
+    reference_data : dict
+        Reference data of the projects.
+    runtime_history : dict
+        Wall time in seconds measured in previous runs.
+
+    Returns
+    -------
+    dict
+        Estimated wall time in seconds of projects that have any data.
+
+    """
+    estimates = {}
+    for project_name, project_config in project_tests_config.items():
+        if project_name in runtime_history:
+            estimates[project_name] = runtime_history[project_name]
+        elif project_name in reference_data:
+            estimate = estimate_runtime(
+                reference_data[project_name], project_config["distribution"]["parametric_tasks"]
+            )
+            if estimate is not None:
+                estimates[project_name] = estimate
+
+    return estimates
+
+
+def read_runtime_history(history_file: Optional[Path]) -> Dict[str, float]:
+    """Read wall time of projects measured in previous runs.
+
+    Parameters
+    ----------
+    history_file : Path, optional
+        JSON file in format ``{"project_name": seconds}``.
+
+    Returns
+    -------
+    dict
+        Wall time of the projects. Empty if the file does not exist.
+
+    """
+    if history_file is None or not history_file.exists():
+        return {}
+
+    with open(history_file) as file:
+        return json.load(file)
+
+
+def write_runtime_history(history_file: Path, measured_runtimes: Dict[str, float]) -> None:
+    """Update history file with wall time measured in the current run.
+
+    Parameters
+    ----------
+    history_file : Path
+        JSON file in format ``{"project_name": seconds}``.
+    measured_runtimes : dict
+        Wall time of the projects measured in the current run.
+
+    """
+    history = read_runtime_history(history_file)
+    history.update({name: round(runtime, 1) for name, runtime in measured_runtimes.items()})
+    with open(history_file, "w") as file:
+        json.dump(history, file, indent=4)
+
+
 def read_configs(config_folder: Path) -> Dict[str, Any]:
     """Reads configuration files.
 
@@ -1151,9 +3305,10 @@ def read_configs(config_folder: Path) -> Dict[str, Any]:
         except KeyError as exc:
             raise KeyError("Configuration file misses project name or has incorrect format") from exc
 
-        default_config = {
+        default_config: Dict[str, Any] = {
             "path": f"{proj_name}.aedt",
             "dependencies": [],
+            "batchable": False,
             "distribution": {
                 "cores": 1,
                 "distribution_types": ["default"],
@@ -1165,9 +3320,7 @@ def read_configs(config_folder: Path) -> Dict[str, Any]:
         }
 
         merged = dict(default_config, **proj_conf)
-        merged["distribution"] = dict(
-            default_config["distribution"], **proj_conf.get("distribution", {})  # type: ignore[arg-type]
-        )
+        merged["distribution"] = dict(default_config["distribution"], **proj_conf.get("distribution", {}))
         project_tests_config[proj_name] = merged
 
     if not project_tests_config:
@@ -1205,10 +3358,143 @@ def parse_arguments() -> argparse.Namespace:
     parser.add_argument(
         "--save-sim-data", "-s", action="store_true", help="Save simulation data under output dir (--out-dir flag)"
     )
+    parser.add_argument(
+        "--results-format",
+        choices=["json", "binary"],
+        default="json",
+        help=f"Format of written references, binary {BINARY_SUFFIX} files hold curves as packed float64 arrays "
+        "that are memory-mapped when read (default: json)",
+    )
+    parser.add_argument(
+        "--staging-cache",
+        type=Path,
+        help="Directory to cache projects and dependencies between runs, files are copied only when changed",
+    )
+    parser.add_argument(
+        "--prefetch",
+        type=int,
+        default=2,
+        help="Number of queued projects that are copied in background while they wait for cores (default: 2)",
+    )
+    parser.add_argument(
+        "--extract-only",
+        action="store_true",
+        help="Extract results from saved solutions in .aedtresults next to projects on a single core per project, "
+        "only setups without solution are solved",
+    )
+    parser.add_argument(
+        "--result-cache",
+        type=Path,
+        help="Directory to cache results between runs, projects with unchanged inputs are not solved again",
+    )
+    parser.add_argument(
+        "--result-cache-size",
+        type=float,
+        default=10,
+        help="Limit of the result cache size in GB, least recently used results are evicted (default: 10)",
+    )
+    parser.add_argument(
+        "--local-scratch",
+        help="Folder on a local disk of every host, for example $TMPDIR. Projects are solved there and only "
+        "results are transferred back to the output directory",
+    )
+    parser.add_argument(
+        "--scratch-copy-command",
+        default=DEFAULT_COPY_COMMAND,
+        help="Command that transfers projects to and results from scratch of other hosts, "
+        "remote paths are given as host:path (default: '%(default)s')",
+    )
     parser.add_argument("--max-cores", "-c", type=int, help="total number of cores limit", default=99999)
     parser.add_argument(
         "--max-projects", "-mp", type=int, help="total number of parallel projects limit", default=99999
     )
+    parser.add_argument(
+        "--max-cores-per-host", type=int, help="limit of cores used on each machine, >= 1 (default: not limited)"
+    )
+    parser.add_argument(
+        "--custom-hosts",
+        help="Machines available for projects instead of hosts of the scheduler job, format: host1:15,host2:10",
+    )
+    parser.add_argument(
+        "--placement",
+        choices=PLACEMENT_STRATEGIES,
+        default="first-fit",
+        help="Strategy to place projects on machines (default: first-fit)",
+    )
+
+    parser.add_argument(
+        "--backfill",
+        action="store_true",
+        help="Reserve resources for the first queued project and start others only if they do not delay it",
+    )
+    parser.add_argument(
+        "--runtime-history",
+        type=Path,
+        help="JSON file to read and update wall time of projects, used to start the longest projects first",
+    )
+
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        help="Wall time limit of each project in seconds, overridden by 'timeout' in project configuration",
+    )
+
+    parser.add_argument(
+        "--retries", type=int, default=0, help="Number of retries of a project if Electronics Desktop crashes"
+    )
+    parser.add_argument(
+        "--retry-backoff",
+        type=float,
+        default=60,
+        help="Delay in seconds before the first retry, doubled for every next retry (default: 60)",
+    )
+
+    parser.add_argument(
+        "--telemetry-interval",
+        type=float,
+        default=None,
+        help="Interval in seconds to sample CPU, memory and I/O of Electronics Desktop (default: not sampled)",
+    )
+
+    parser.add_argument(
+        "--session-pool",
+        type=int,
+        default=0,
+        help="Number of long-lived Electronics Desktop sessions that solve small projects one by one (default: 0)",
+    )
+    parser.add_argument(
+        "--session-cores",
+        type=int,
+        default=1,
+        help="Cores of each session, projects with automatic distribution that fit are solved in sessions",
+    )
+    parser.add_argument(
+        "--launcher",
+        choices=LAUNCHERS,
+        default="auto",
+        help="Backend that starts Electronics Desktop (default: auto, mpiexec on Linux and local on Windows)",
+    )
+    parser.add_argument(
+        "--submit-command",
+        help="Command of submit launcher that submits {script} and waits for the job, may use {name} and {cores}",
+    )
+    parser.add_argument(
+        "--cancel-command",
+        help="Command of submit launcher that cancels job {job} after timeout or interruption, e.g. 'scancel {job}'",
+    )
+    parser.add_argument(
+        "--dry-run-speedup",
+        type=float,
+        default=1,
+        help="Estimated runtimes are divided by this factor to get sleep time of dry-run launcher (default: 1)",
+    )
+
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=10,
+        help="Maximum number of batchable projects solved by a single Electronics Desktop launch (default: 10)",
+    )
 
     parser.add_argument("--debug", action="store_true", help="Adds additional DEBUG logs")
     cli_args = parser.parse_args()
@@ -1228,13 +3514,13 @@ def parse_arguments() -> argparse.Namespace:
         if not cli_args.reference_folder.is_dir():
             raise ValueError(f"Reference folder does not exist: {cli_args.reference_folder}")
 
-        if len(list(cli_args.reference_folder.rglob("*.json"))) < 1:
-            raise ValueError(f"No reference .json file found in {cli_args.reference_folder}")
+        if not has_references(cli_args.reference_folder):
+            raise ValueError(f"No reference .json or {BINARY_SUFFIX} file found in {cli_args.reference_folder}")
 
     if cli_args.suppress_validation and cli_args.only_validate:
         raise ValueError("--only-validate and --suppress-validation are mutually exclusive")
 
-    if not (cli_args.max_cores or cli_args.max_tasks):
+    if not (cli_args.max_cores or cli_args.max_projects):
         logger.warning(
             "No limits are specified for current job. This may lead to failure if you lack of license or resources"
         )
@@ -1247,6 +3533,45 @@ def parse_arguments() -> argparse.Namespace:
     if not cli_args.config_folder.is_dir():
         raise ValueError(f"Configuration folder does not exist: {cli_args.config_folder}")
 
+    if cli_args.timeout is not None and cli_args.timeout <= 0:
+        raise ValueError("--timeout must be a positive number of seconds")
+
+    if cli_args.session_pool < 0 or cli_args.session_cores < 1:
+        raise ValueError("--session-pool must not be negative and --session-cores must be >= 1")
+
+    if cli_args.launcher == "submit" and not cli_args.submit_command:
+        raise ValueError("--submit-command is required by submit launcher")
+
+    if cli_args.cancel_command and "{job}" not in cli_args.cancel_command:
+        raise ValueError("--cancel-command must contain {job}")
+
+    if cli_args.launcher == "dry-run" and cli_args.session_pool:
+        raise ValueError("Session pool cannot be used with dry-run launcher")
+
+    if cli_args.dry_run_speedup <= 0:
+        raise ValueError("--dry-run-speedup must be positive")
+
+    if cli_args.prefetch < 0:
+        raise ValueError("--prefetch must not be negative")
+
+    if "{src}" not in cli_args.scratch_copy_command or "{dst}" not in cli_args.scratch_copy_command:
+        raise ValueError("--scratch-copy-command must contain {src} and {dst}")
+
+    if cli_args.result_cache_size <= 0:
+        raise ValueError("--result-cache-size must be positive")
+
+    if cli_args.telemetry_interval is not None and cli_args.telemetry_interval <= 0:
+        raise ValueError("--telemetry-interval must be positive")
+
+    if cli_args.batch_size < 1:
+        raise ValueError("--batch-size must be >= 1")
+
+    if cli_args.max_cores_per_host is not None and cli_args.max_cores_per_host < 1:
+        raise ValueError("--max-cores-per-host must be >= 1")
+
+    if cli_args.retries < 0 or cli_args.retry_backoff < 0:
+        raise ValueError("--retries and --retry-backoff must not be negative")
+
     if cli_args.save_sim_data and not cli_args.out_dir:
         raise ValueError("Saving of simulation data was requested but output directory is not provided")
 
@@ -0,0 +1,262 @@
+"""Backends that turn the Electronics Desktop command into the command started by the framework.
+
+* ``LocalLauncher`` starts Electronics Desktop directly, default on Windows.
+* ``MpiexecLauncher`` starts it on the first allocated host via Intel MPI, default on Linux.
+* ``SrunLauncher`` starts it as a step of the Slurm job the framework runs in.
+* ``SubmitLauncher`` submits a job script per project to the batch scheduler and waits for the job.
+* ``DryRunLauncher`` does not start Electronics Desktop and sleeps instead.
+
+All backends return a command that is started and supervised by the framework, thus timeouts and output streaming
+work the same for every backend. Killing the process tree stops Electronics Desktop of every backend except
+``SubmitLauncher``, where it stops only the local submit command: the job is stopped by the command returned from
+``stop_command()``, if a cancel command is configured.
+
+"""
+import itertools
+import os
+import re
+import shlex
+import sys
+from pathlib import Path
+from typing import Dict
+from typing import List
+from typing import Optional
+
+# replaced by the name of the execution host within the submitted job script
+HOST_PLACEHOLDER = "AEDTTEST_EXECUTION_HOST"
+# first number in the output of the submit command, e.g. "Submitted batch job 1234" or "Job <1234> is submitted"
+JOB_ID_PATTERN = re.compile(r"\b(\d+)\b")
+
+
+class LocalLauncher:
+    """Start Electronics Desktop directly on the machine of the framework."""
+
+    def machines(self, machines: Dict[str, Dict[str, int]]) -> Dict[str, Dict[str, int]]:
+        """Machines that are passed to Electronics Desktop in ``-machinelist``.
+
+        Parameters
+        ----------
+        machines : dict
+            Machines allocated by the framework.
+
+        Returns
+        -------
+        dict
+            Machines for the machine list.
+
+        """
+        return machines
+
+    def command(self, aedt_command: List[str], machines: Dict[str, Dict[str, int]], task_name: str) -> List[str]:
+        """Command that is started by the framework.
+
+        Parameters
+        ----------
+        aedt_command : list
+            Command of Electronics Desktop.
+        machines : dict
+            Machines from ``machines()``.
+        task_name : str
+            Name of the project or batch.
+
+        Returns
+        -------
+        list
+            Command to start.
+
+        """
+        return aedt_command
+
+    def stop_command(self, output: str) -> Optional[List[str]]:
+        """Command that stops work left behind by the killed process tree.
+
+        Parameters
+        ----------
+        output : str
+            Beginning of the output of the killed command.
+
+        Returns
+        -------
+        list, optional
+            Command to run, ``None`` if killing of the process tree is enough.
+
+        """
+        return None
+
+
+class MpiexecLauncher(LocalLauncher):
+    """Start Electronics Desktop on the first allocated host via Intel MPI.
+
+    Parameters
+    ----------
+    mpi_path : str
+        Path to ``mpiexec`` of Intel MPI shipped with Electronics Desktop.
+
+    """
+
+    def __init__(self, mpi_path: str) -> None:
+        self.mpi_path = mpi_path
+
+    def command(self, aedt_command: List[str], machines: Dict[str, Dict[str, int]], task_name: str) -> List[str]:
+        return [self.mpi_path, "-envall", "-n", "1", "-hosts", list(machines)[0]] + aedt_command
+
+
+class SrunLauncher(LocalLauncher):
+    """Start Electronics Desktop as a step of the Slurm job on the first allocated host.
+
+    The step gets all cores allocated on the host, Slurm kills the step together with ``srun``.
+
+    Parameters
+    ----------
+    job_id : str, optional
+        ID of the Slurm job, ``SLURM_JOB_ID`` by default.
+
+    """
+
+    def __init__(self, job_id: Optional[str] = None) -> None:
+        job_id = job_id or os.environ.get("SLURM_JOB_ID")
+        if not job_id:
+            raise ValueError("srun launcher requires a Slurm job, SLURM_JOB_ID is not set")
+        self.job_id = job_id
+
+    def command(self, aedt_command: List[str], machines: Dict[str, Dict[str, int]], task_name: str) -> List[str]:
+        host, config = next(iter(machines.items()))
+        return [
+            "srun",
+            f"--jobid={self.job_id}",
+            f"--job-name={task_name}",
+            "--nodes=1",
+            "--ntasks=1",
+            f"--cpus-per-task={config['cores']}",
+            f"--nodelist={host}",
+            "--exact",
+            "--export=ALL",
+        ] + aedt_command
+
+
+class SubmitLauncher(LocalLauncher):
+    """Submit a job script per project to the batch scheduler and wait until the job finishes.
+
+    Job runs on a single node that is chosen by the scheduler, therefore all allocated cores are merged
+    into a single machine that is resolved within the job script. Hosts known to the framework only limit
+    number of cores that are submitted at the same time.
+
+    Framework supervises only the local submit command: killing it on timeout does not stop the job, which is
+    cancelled by ``cancel_command`` with the job ID found in the output of the submit command. Telemetry samples
+    the submit command too, resource usage of the job on the execution host is not measured.
+
+    Parameters
+    ----------
+    submit_command : str
+        Command that submits the script and blocks until the job finishes, for example
+        ``"sbatch --wait --nodes=1 --ntasks={cores} --job-name={name} {script}"``.
+        Exit code of the command must be the exit code of the job.
+    script_dir : pathlib.Path
+        Directory where job scripts are written.
+    inner : LocalLauncher, optional
+        Launcher used within the job script, for example ``MpiexecLauncher`` on Linux.
+    cancel_command : str, optional
+        Command that cancels job ``{job}``, for example ``"scancel {job}"``. Job is left running if not set.
+
+    """
+
+    def __init__(
+        self,
+        submit_command: str,
+        script_dir: Path,
+        inner: Optional[LocalLauncher] = None,
+        cancel_command: Optional[str] = None,
+    ) -> None:
+        self.submit_command = submit_command
+        self.script_dir = script_dir
+        self.inner = inner or LocalLauncher()
+        self.cancel_command = cancel_command
+        self.script_ids = itertools.count(1)
+
+    def machines(self, machines: Dict[str, Dict[str, int]]) -> Dict[str, Dict[str, int]]:
+        return {
+            HOST_PLACEHOLDER: {
+                "cores": sum(config["cores"] for config in machines.values()),
+                "tasks": sum(config.get("tasks", 1) for config in machines.values()),
+            }
+        }
+
+    def command(self, aedt_command: List[str], machines: Dict[str, Dict[str, int]], task_name: str) -> List[str]:
+        self.script_dir.mkdir(parents=True, exist_ok=True)
+        script_path = self.script_dir / f"{task_name}_{next(self.script_ids)}.sh"
+        command = self.inner.command(aedt_command, machines, task_name)
+        script_path.write_text(job_script(command, Path.cwd()))
+        script_path.chmod(0o755)
+
+        return shlex.split(
+            self.submit_command.format(
+                name=task_name, cores=machines[HOST_PLACEHOLDER]["cores"], script=shlex.quote(str(script_path))
+            )
+        )
+
+    def stop_command(self, output: str) -> Optional[List[str]]:
+        if not self.cancel_command:
+            return None
+
+        match = JOB_ID_PATTERN.search(output)
+        if match is None:
+            # job was not submitted yet
+            return None
+        return [arg.format(job=match.group(1)) for arg in shlex.split(self.cancel_command)]
+
+
+class DryRunLauncher(LocalLauncher):
+    """Sleep instead of running Electronics Desktop, to exercise scheduling and reports without installation.
+
+    Parameters
+    ----------
+    durations : dict
+        Durations in seconds by name of the project or batch, for example estimated runtimes.
+    default_duration : float, default=1
+        Duration of projects that are not in ``durations``.
+    speedup : float, default=1
+        Durations are divided by this factor.
+
+    """
+
+    def __init__(self, durations: Dict[str, float], default_duration: float = 1, speedup: float = 1) -> None:
+        self.durations = durations
+        self.default_duration = default_duration
+        self.speedup = speedup
+
+    def command(self, aedt_command: List[str], machines: Dict[str, Dict[str, int]], task_name: str) -> List[str]:
+        duration = self.durations.get(task_name, self.default_duration) / self.speedup
+        return [sys.executable, "-c", f"import time; time.sleep({duration})"]
+
+
+def job_script(command: List[str], work_dir: Path) -> str:
+    """Shell script that runs the command on the execution host of the job.
+
+    Parameters
+    ----------
+    command : list
+        Command to run, ``HOST_PLACEHOLDER`` is replaced by the name of the execution host.
+    work_dir : pathlib.Path
+        Working directory of the command.
+
+    Returns
+    -------
+    str
+        Content of the script.
+
+    """
+    quoted = []
+    for arg in command:
+        # quote every argument and expand only the host variable
+        arg = "'" + arg.replace("'", "'\"'\"'") + "'"
+        quoted.append(arg.replace(HOST_PLACEHOLDER, "'\"$HOST\"'"))
+
+    return "\n".join(
+        [
+            "#!/bin/sh",
+            'HOST="$(hostname)"',
+            f"cd {shlex.quote(str(work_dir))} || exit 1",
+            "exec " + " ".join(quoted),
+            "",
+        ]
+    )
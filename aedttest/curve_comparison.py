@@ -0,0 +1,90 @@
+"""Comparison of XY curves of the current run with the reference.
+
+Curves are compared as whole sequences: every step runs in a single ``map()`` or reduction over the lists or
+memory-mapped float64 arrays, so no Python bytecode is executed per point. Metrics are the same as the point by
+point comparison: difference of the reference and the current value, maximum relative deviation and relative
+deviation of means, with zero values of the current curve replaced by ``ZERO_GUARD`` to avoid division by zero.
+
+"""
+import math
+import operator
+from itertools import chain
+from itertools import repeat
+from statistics import StatisticsError
+from typing import Any
+from typing import List
+from typing import NamedTuple
+from typing import Sequence
+
+# avoid division by zero by using small tolerance
+ZERO_GUARD = 1e-20
+
+
+class CurveComparison(NamedTuple):
+    difference: List[float]
+    max_delta_perc: float
+    avg_perc: float
+
+
+def mean(values: Sequence[float]) -> float:
+    """Arithmetic mean of the correctly rounded sum, differs from ``statistics.mean()`` by at most one ulp.
+
+    Parameters
+    ----------
+    values : Sequence
+        Float values.
+
+    """
+    if not values:
+        raise StatisticsError("mean requires at least one data point")
+    return math.fsum(values) / len(values)
+
+
+def guard_zeros(values: Sequence[float]) -> Sequence[float]:
+    """Replace zero values by ``ZERO_GUARD``, the values are returned as is if there are no zeros.
+
+    Parameters
+    ----------
+    values : Sequence
+        Float values.
+
+    """
+    if 0.0 not in values:
+        return values
+
+    # zeros are rare, only their positions are visited
+    guarded = list(values)
+    index = 0
+    try:
+        while True:
+            index = guarded.index(0.0, index)
+            guarded[index] = ZERO_GUARD
+    except ValueError:
+        return guarded
+
+
+def compare_curve(reference: Sequence[Any], current: Sequence[Any]) -> CurveComparison:
+    """Compare the curve of the current run with the reference curve of the same length.
+
+    Parameters
+    ----------
+    reference : Sequence
+        Y values of the reference curve, list or memory-mapped float64 array of a binary reference.
+    current : Sequence
+        Y values of the current curve.
+
+    Returns
+    -------
+    CurveComparison
+        Point by point difference, maximum deviation in percent and deviation of means, both rounded to
+        3 digits.
+
+    """
+    difference = list(map(operator.sub, reference, current))
+    ratios = map(operator.truediv, reference, guard_zeros(current))
+    deviations = map(abs, map(operator.sub, repeat(1.0), ratios))
+    # fold from zero keeps semantics of max(max_delta, deviation) for NaN values
+    max_delta = max(chain((0,), deviations))
+
+    avg_perc = abs(1 - mean(reference) / (mean(current) or ZERO_GUARD))
+    return CurveComparison(difference, round(max_delta * 100, 3), round(avg_perc, 3))
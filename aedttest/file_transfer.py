@@ -0,0 +1,227 @@
+"""Copy of files and folders to the run and results locations.
+
+Folders are walked with ``os.scandir`` and files are copied on a thread pool, so many small files of an ``.aedb``
+folder are copied in parallel. Large files are copied in the kernel with ``os.copy_file_range`` or
+``os.sendfile`` where available, without passing data through Python buffers.
+
+Permission bits and modification time of copied files are preserved. Files that are never modified, like static
+web parts and reference artifacts, are linked instead of copied where possible.
+
+"""
+import os
+import shutil
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+from aedttest.logger import logger
+
+MB = 1024 * 1024
+CHUNK_SIZE = 64 * MB
+# smaller files are copied by shutil, system calls per file dominate for them
+LARGE_FILE_SIZE = 8 * MB
+# copy is bound by I/O, not by CPU
+COPY_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+
+def copy_in_kernel(src_fd: int, dst_fd: int, size: int) -> bool:
+    """Copy file content without reading it to user space.
+
+    Parameters
+    ----------
+    src_fd : int
+        File descriptor of the source opened for reading.
+    dst_fd : int
+        File descriptor of the empty destination opened for writing.
+    size : int
+        Size of the source in bytes.
+
+    Returns
+    -------
+    bool
+        ``True`` if content was copied, ``False`` if the platform or file system does not support it.
+
+    """
+    copy: Callable[[int, int, int], int]
+    if hasattr(os, "copy_file_range"):
+        copy = os.copy_file_range
+    elif sys.platform.startswith("linux"):
+        # on other platforms sendfile supports only sockets as destination
+        copy = _sendfile
+    else:
+        return False
+
+    copied = 0
+    try:
+        while copied < size:
+            sent = copy(src_fd, dst_fd, min(CHUNK_SIZE, size - copied))
+            if sent == 0:
+                # source was truncated while copied
+                break
+            copied += sent
+    except OSError as exc:
+        # e.g. EXDEV on old kernels or file systems without support
+        logger.debug(f"Copy in kernel is not possible, fall back to user space: {exc}")
+        return False
+
+    return True
+
+
+def _sendfile(src_fd: int, dst_fd: int, count: int) -> int:
+    return os.sendfile(dst_fd, src_fd, None, count)
+
+
+def copy_file(src: Path, dst: Path) -> int:
+    """Copy file with its permission bits and modification time.
+
+    Parameters
+    ----------
+    src : pathlib.Path
+        Source file.
+    dst : pathlib.Path
+        Destination file, overwritten if exists.
+
+    Returns
+    -------
+    int
+        Number of copied bytes.
+
+    """
+    src_stat = os.stat(src)
+    if src_stat.st_size < LARGE_FILE_SIZE:
+        shutil.copyfile(src, dst)
+    else:
+        with open(src, "rb") as src_file, open(dst, "wb") as dst_file:
+            if not copy_in_kernel(src_file.fileno(), dst_file.fileno(), src_stat.st_size):
+                src_file.seek(0)
+                dst_file.seek(0)
+                dst_file.truncate()
+                shutil.copyfileobj(src_file, dst_file, CHUNK_SIZE)
+
+    os.chmod(dst, src_stat.st_mode & 0o7777)
+    os.utime(dst, ns=(src_stat.st_atime_ns, src_stat.st_mtime_ns))
+    return src_stat.st_size
+
+
+def link_file(src: Path, dst: Path, symlink: bool = True) -> str:
+    """Place the file with a hardlink, a symlink or a copy, whichever the file system supports first.
+
+    Linked files share content with the source, so neither of them may be modified in place.
+
+    Parameters
+    ----------
+    src : pathlib.Path
+        Source file.
+    dst : pathlib.Path
+        Destination file, overwritten if exists.
+    symlink : bool, default=True
+        Allow symlink, only if the source outlives the destination.
+
+    Returns
+    -------
+    str
+        How the file was placed: ``hardlink``, ``symlink`` or ``copy``.
+
+    """
+    if dst.exists() or dst.is_symlink():
+        dst.unlink()
+
+    try:
+        os.link(src, dst)
+        return "hardlink"
+    except OSError:
+        # e.g. EXDEV across file systems or links are not supported
+        pass
+
+    if symlink:
+        try:
+            os.symlink(Path(src).resolve(), dst)
+            return "symlink"
+        except OSError:
+            # e.g. missing privilege on Windows
+            pass
+
+    copy_file(src, dst)
+    return "copy"
+
+
+def iter_tree(src: Path, dst: Path) -> Iterator[Tuple[Path, Path, int]]:
+    """Create folder structure of ``src`` under ``dst`` and yield files to copy.
+
+    Parameters
+    ----------
+    src : pathlib.Path
+        Source folder.
+    dst : pathlib.Path
+        Destination folder.
+
+    Yields
+    ------
+    tuple
+        Source file, destination file and size of the source in bytes.
+
+    """
+    to_visit = [(src, dst)]
+    while to_visit:
+        src_dir, dst_dir = to_visit.pop()
+        dst_dir.mkdir(parents=True, exist_ok=True)
+        with os.scandir(src_dir) as entries:
+            for entry in entries:
+                if entry.is_dir():
+                    to_visit.append((Path(entry.path), dst_dir / entry.name))
+                else:
+                    yield Path(entry.path), dst_dir / entry.name, entry.stat().st_size
+
+
+def copy_tree(
+    src: Path,
+    dst: Path,
+    copy_function: Optional[Callable[[Path, Path], object]] = None,
+    workers: int = COPY_WORKERS,
+) -> List[str]:
+    """Copy content of the folder on a thread pool and log throughput.
+
+    Parameters
+    ----------
+    src : pathlib.Path
+        Source folder.
+    dst : pathlib.Path
+        Destination folder, created if missing.
+    copy_function : callable, optional
+        Function that copies a single file from source to destination path, ``copy_file()`` by default.
+    workers : int, default=COPY_WORKERS
+        Number of threads.
+
+    Returns
+    -------
+    list
+        Paths to all copied files.
+
+    """
+    copy_function = copy_function or copy_file
+    start = time.monotonic()
+    copied = []
+    total_size = 0
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = []
+        for src_file, dst_file, size in iter_tree(src, dst):
+            futures.append(executor.submit(copy_function, src_file, dst_file))
+            copied.append(str(dst_file))
+            total_size += size
+
+        for future in futures:
+            # raise the first error
+            future.result()
+
+    duration = time.monotonic() - start
+    logger.info(
+        f"Copied {len(copied)} file(s), {total_size / MB:.1f} MB from {src} in {duration:.1f} s "
+        f"({total_size / MB / max(duration, 1e-3):.1f} MB/s)"
+    )
+    return copied
@@ -0,0 +1,209 @@
+"""Index of reference results that loads data of a project only when it is compared.
+
+The index maps the project name to its reference file, size of the file, Electronics Desktop version and
+simulation times, which are needed to order projects before any of them is compared. The index is stored in
+``INDEX_FILE`` in the reference folder and is rebuilt only for files whose size or modification time changed, so
+reference files are not parsed on every run.
+
+Full data of a project is loaded on first access and kept until it is released.
+
+"""
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any
+from typing import Dict
+from typing import Iterator
+from typing import Mapping
+from typing import Optional
+
+from aedttest.logger import logger
+from aedttest.results_format import BINARY_SUFFIX
+from aedttest.results_format import find_results
+from aedttest.results_format import load_results
+
+INDEX_FILE = "reference_index.json"
+INDEX_VERSION = 1
+
+
+def summarize(project_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Part of the reference data that is kept in the index.
+
+    Parameters
+    ----------
+    project_data : dict
+        Reference data of the project.
+
+    Returns
+    -------
+    dict
+        Version of Electronics Desktop and simulation times of all designs.
+
+    """
+    return {
+        "aedt_version": project_data.get("aedt_version"),
+        "designs": {
+            design_name: {"simulation_time": design_data.get("simulation_time", {})}
+            for design_name, design_data in project_data.get("designs", {}).items()
+        },
+    }
+
+
+def has_references(reference_folder: Path) -> bool:
+    """Whether the folder holds any reference file.
+
+    Index of a previous run and references at the top of the folder are checked first, the folder is searched
+    recursively only if there are none.
+
+    Parameters
+    ----------
+    reference_folder : pathlib.Path
+        Folder of the reference results.
+
+    """
+    try:
+        with open(reference_folder / INDEX_FILE) as file:
+            if json.load(file).get("files"):
+                return True
+    except (OSError, ValueError, AttributeError):
+        pass
+
+    patterns = ("*.json", f"*{BINARY_SUFFIX}")
+    if any(True for pattern in patterns for _ in reference_folder.glob(f"ref_{pattern}")):
+        return True
+    # index of a previous run is not a reference
+    return any(path.name != INDEX_FILE for pattern in patterns for path in reference_folder.rglob(pattern))
+
+
+class ReferenceIndex(Mapping[str, Dict[str, Any]]):
+    """Reference data of projects by project name, loaded lazily.
+
+    Safe to use from several threads, reports of projects are prepared in a thread pool.
+
+    Parameters
+    ----------
+    reference_folder : pathlib.Path, optional
+        Folder of the reference results, index is empty if not set.
+    entries : dict, optional
+        Index entries by project name, built from ``reference_folder`` if not set.
+
+    """
+
+    def __init__(
+        self, reference_folder: Optional[Path] = None, entries: Optional[Dict[str, Dict[str, Any]]] = None
+    ) -> None:
+        self.reference_folder = reference_folder
+        if entries is None:
+            entries = self.build() if reference_folder is not None else {}
+        self.entries = entries
+        self.loaded: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def build(self) -> Dict[str, Dict[str, Any]]:
+        """Index all reference files of the folder, reuse entries of unchanged files from ``INDEX_FILE``.
+
+        Returns
+        -------
+        dict
+            Index entries by project name.
+
+        """
+        assert self.reference_folder is not None
+        index_path = self.reference_folder / INDEX_FILE
+        stored: Dict[str, Dict[str, Any]] = {}
+        try:
+            with open(index_path) as file:
+                index_data = json.load(file)
+            if index_data.get("version") == INDEX_VERSION:
+                stored = index_data["files"]
+        except (OSError, ValueError, KeyError):
+            # missing or broken index is rebuilt
+            pass
+
+        files: Dict[str, Dict[str, Any]] = {}
+        for path in find_results(self.reference_folder):
+            if path == index_path:
+                continue
+
+            relative_path = path.relative_to(self.reference_folder).as_posix()
+            file_stat = path.stat()
+            entry = stored.get(relative_path)
+            if entry is None or entry["size"] != file_stat.st_size or entry["mtime_ns"] != file_stat.st_mtime_ns:
+                project_data = load_results(path)
+                if "name" not in project_data:
+                    logger.warning(f"{path} is not a reference file, it has no project name")
+                    continue
+                entry = dict(summarize(project_data), name=project_data["name"])
+                entry.update({"size": file_stat.st_size, "mtime_ns": file_stat.st_mtime_ns})
+            files[relative_path] = entry
+
+        if files != stored:
+            self.write_index(index_path, files)
+
+        entries = {}
+        for relative_path, entry in files.items():
+            # later file overrides project of the same name
+            entries[entry["name"]] = dict(entry, file=str(self.reference_folder / relative_path))
+        return entries
+
+    @staticmethod
+    def write_index(index_path: Path, files: Dict[str, Dict[str, Any]]) -> None:
+        """Store the index next to the reference files, reference folder may be read-only.
+
+        Parameters
+        ----------
+        index_path : pathlib.Path
+            Path to ``INDEX_FILE``.
+        files : dict
+            Index entries by path of the file relative to the reference folder.
+
+        """
+        tmp_path = index_path.with_name(f"{index_path.name}.{os.getpid()}.tmp")
+        try:
+            with open(tmp_path, "w") as file:
+                json.dump({"version": INDEX_VERSION, "files": files}, file, indent=4)
+            os.replace(tmp_path, index_path)
+        except OSError as exc:
+            logger.debug(f"Reference index is not stored: {exc}")
+            if tmp_path.exists():
+                tmp_path.unlink()
+
+    def __getitem__(self, project_name: str) -> Dict[str, Any]:
+        with self._lock:
+            project_data = self.loaded.get(project_name)
+        if project_data is not None:
+            return project_data
+
+        # reading of one reference does not block other threads, first loaded copy wins
+        entry = self.entries[project_name]
+        logger.debug(f"Load reference of {project_name} from {entry['file']} ({entry['size'] / 1024:.0f} KB)")
+        project_data = load_results(Path(entry["file"]))
+        project_data["filepath"] = self.reference_folder
+        with self._lock:
+            return self.loaded.setdefault(project_name, project_data)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.entries)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __contains__(self, project_name: object) -> bool:
+        return project_name in self.entries
+
+    def release(self, project_name: str) -> None:
+        """Drop loaded data of the project, it is loaded again on next access.
+
+        Parameters
+        ----------
+        project_name : str
+            Name of the project.
+
+        """
+        with self._lock:
+            self.loaded.pop(project_name, None)
+
+    def summaries(self) -> Dict[str, Dict[str, Any]]:
+        """Index entries by project name, enough to estimate runtimes without loading reference data."""
+        return self.entries
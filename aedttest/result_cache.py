@@ -0,0 +1,240 @@
+"""Cache of results of projects that were solved before.
+
+Results are stored under a key of the content of the project (``.aedt`` file, ``.aedb`` folder and dependencies),
+its distribution, the Electronics Desktop version and the extraction script. Unchanged project is not solved
+again, its ``<project>.json`` and the exported profiles and mesh statistics are restored from the cache.
+
+Total size of the cache is bounded, least recently used entries are evicted first.
+
+"""
+import hashlib
+import json
+import os
+import shutil
+import threading
+from pathlib import Path
+from typing import Any
+from typing import Dict
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+from aedttest import file_transfer
+from aedttest.logger import logger
+
+HASH_CHUNK_SIZE = 1024 * 1024
+# keys of design data that hold paths to exported files
+ARTIFACT_KEYS = ("profile_name", "mesh_name")
+
+
+def hash_path(digest: "hashlib._Hash", path: Path) -> None:
+    """Update the digest with relative paths and content of all files of the file or folder.
+
+    Parameters
+    ----------
+    digest : hashlib._Hash
+        Digest to update.
+    path : pathlib.Path
+        File or folder.
+
+    """
+    files = sorted(path.rglob("*")) if path.is_dir() else [path]
+    for file_path in files:
+        if file_path.is_dir():
+            continue
+        digest.update(f"{file_path.relative_to(path) if path.is_dir() else path.name}\0".encode())
+        with open(file_path, "rb") as file:
+            for chunk in iter(lambda: file.read(HASH_CHUNK_SIZE), b""):
+                digest.update(chunk)
+
+
+def iter_artifacts(project_data: Dict[str, Any]) -> Iterator[Tuple[Dict[str, Any], str]]:
+    """Yield dictionaries and keys that hold paths to exported files in the project data.
+
+    Parameters
+    ----------
+    project_data : dict
+        Content of ``<project>.json``.
+
+    Yields
+    ------
+    tuple
+        Dictionary and its key with a path.
+
+    """
+    for design_data in project_data.get("designs", {}).values():
+        for artifact_key in ARTIFACT_KEYS:
+            for setups in design_data.get(artifact_key, {}).values():
+                for setup_name, path in setups.items():
+                    if path:
+                        yield setups, setup_name
+
+
+class ResultCache:
+    """Results of projects by key of the project content.
+
+    Parameters
+    ----------
+    cache_dir : pathlib.Path
+        Directory of the cache.
+    max_size : int
+        Limit of the total size of the cache in bytes.
+
+    """
+
+    def __init__(self, cache_dir: Path, max_size: int) -> None:
+        self.cache_dir = cache_dir
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_size = max_size
+        self._lock = threading.Lock()
+
+    def key(self, project_config: Dict[str, Any], version: str, salt: str = "", results: bool = False) -> str:
+        """Hash of everything that determines results of the project.
+
+        Parameters
+        ----------
+        project_config : dict
+            Configuration of project, distribution, etc.
+        version : str
+            Version of Electronics Desktop.
+        salt : str, default=""
+            Other inputs of the run, for example hash of the extraction script.
+        results : bool, default=False
+            Hash saved solutions in ``.aedtresults`` folder next to the project as well.
+
+        Returns
+        -------
+        str
+            Key of the cache entry.
+
+        """
+        digest = hashlib.sha256()
+        distribution = json.dumps(project_config["distribution"], sort_keys=True)
+        digest.update(f"{version}\0{distribution}\0{salt}\0".encode())
+
+        project_path = Path(project_config["path"])
+        paths = [project_path, project_path.with_suffix(".aedb")]
+        if results:
+            paths.append(project_path.with_suffix(".aedtresults"))
+        dependencies = project_config.get("dependencies") or []
+        paths += [
+            Path(dependency) for dependency in ([dependencies] if isinstance(dependencies, str) else dependencies)
+        ]
+        for path in paths:
+            if path.exists():
+                hash_path(digest, path)
+
+        return digest.hexdigest()
+
+    def lookup(self, key: str) -> Optional[Path]:
+        """Find the entry and mark it as recently used.
+
+        Parameters
+        ----------
+        key : str
+            Key of the entry.
+
+        Returns
+        -------
+        pathlib.Path or None
+            Folder of the entry or ``None`` if results are not cached.
+
+        """
+        entry = self.cache_dir / key
+        if not entry.is_dir():
+            return None
+
+        os.utime(entry)
+        return entry
+
+    def store(self, key: str, project_name: str, report_file: Path) -> None:
+        """Store results of the project with its exported files and evict old entries if the cache is full.
+
+        Results with errors of extraction are not stored.
+
+        Parameters
+        ----------
+        key : str
+            Key of the entry.
+        project_name : str
+            Name of the project.
+        report_file : pathlib.Path
+            Path to ``<project>.json``.
+
+        """
+        with open(report_file) as file:
+            project_data = json.load(file)
+        if project_data.get("error_exception"):
+            return
+
+        tmp_entry = self.cache_dir / f"{key}.{os.getpid()}.{threading.get_ident()}.tmp"
+        artifacts_dir = tmp_entry / "artifacts"
+        artifacts_dir.mkdir(parents=True)
+        for index, (setups, setup_name) in enumerate(iter_artifacts(project_data)):
+            src = Path(setups[setup_name])
+            relative_path = Path("artifacts", f"{index}_{src.name}")
+            file_transfer.copy_file(src, tmp_entry / relative_path)
+            setups[setup_name] = relative_path.as_posix()
+
+        with open(tmp_entry / f"{project_name}.json", "w") as file:
+            json.dump(project_data, file, indent=4)
+
+        try:
+            os.replace(tmp_entry, self.cache_dir / key)
+        except OSError:
+            # stored by a concurrent run
+            shutil.rmtree(tmp_entry)
+
+        self.evict()
+
+    def restore(self, entry: Path, project_name: str, dst_dir: Path) -> Path:
+        """Place results of the entry to the folder, paths to exported files point to the folder.
+
+        Parameters
+        ----------
+        entry : pathlib.Path
+            Folder of the entry.
+        project_name : str
+            Name of the project.
+        dst_dir : pathlib.Path
+            Folder where results are placed.
+
+        Returns
+        -------
+        pathlib.Path
+            Path to the restored ``<project>.json``.
+
+        """
+        with open(entry / f"{project_name}.json") as file:
+            project_data = json.load(file)
+
+        dst_dir.mkdir(parents=True, exist_ok=True)
+        for setups, setup_name in iter_artifacts(project_data):
+            dst = dst_dir / Path(setups[setup_name]).name
+            # report renames the file, cached file stays untouched
+            file_transfer.link_file(entry / setups[setup_name], dst, symlink=False)
+            setups[setup_name] = str(dst)
+
+        report_file = dst_dir / f"{project_name}.json"
+        with open(report_file, "w") as file:
+            json.dump(project_data, file, indent=4)
+        return report_file
+
+    def evict(self) -> None:
+        """Remove least recently used entries until the cache fits to ``max_size``."""
+        with self._lock:
+            entries: List[Tuple[float, int, Path]] = []
+            for entry in self.cache_dir.iterdir():
+                if entry.suffix == ".tmp" or not entry.is_dir():
+                    continue
+                size = sum(path.stat().st_size for path in entry.rglob("*") if path.is_file())
+                entries.append((entry.stat().st_mtime, size, entry))
+
+            total_size = sum(size for _, size, _ in entries)
+            for _, size, entry in sorted(entries):
+                if total_size <= self.max_size:
+                    break
+                logger.debug(f"Evict {entry.name} from result cache")
+                shutil.rmtree(entry, ignore_errors=True)
+                total_size -= size
@@ -0,0 +1,261 @@
+"""Compact binary format of project results and references.
+
+A binary file starts with ``MAGIC``, length of the header as 8-byte little-endian integer and the header, the
+project data as JSON. Arrays of ``x_data`` and ``y_data`` of every curve are replaced in the header by
+``{"__float64__": [offset, length]}`` and packed to a blob of float64 values at the end of the file, aligned to
+8 bytes. The blob is memory-mapped when the file is read, curves are read-only ``memoryview`` objects and are
+paged in only when they are accessed.
+
+Example of conversion of existing JSON references::
+
+    aedt_convert_results --reference-folder=references
+
+"""
+import argparse
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from pathlib import Path
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+MAGIC = b"AEDTRES1"
+BINARY_SUFFIX = ".bjson"
+ARRAY_KEYS = ("x_data", "y_data")
+ARRAY_MARKER = "__float64__"
+ITEM_SIZE = 8
+
+
+def is_numeric(values: Any) -> bool:
+    """Whether the value is a sequence of numbers that is stored as float64 without loss of meaning.
+
+    Parameters
+    ----------
+    values : Any
+        Value of ``x_data`` or ``y_data``.
+
+    """
+    if isinstance(values, memoryview):
+        return values.format == "d"
+    if isinstance(values, array):
+        return values.typecode == "d"
+    return isinstance(values, list) and all(
+        isinstance(value, (int, float)) and not isinstance(value, bool) for value in values
+    )
+
+
+def pack_arrays(data: Any, blob: "array[float]") -> Any:
+    """Copy of the data where numeric curve arrays are moved to the blob.
+
+    Parameters
+    ----------
+    data : Any
+        Project data or its part.
+    blob : array.array
+        Float64 values of all curves, extended in place.
+
+    Returns
+    -------
+    Any
+        Data with markers instead of curve arrays.
+
+    """
+    if isinstance(data, dict):
+        packed = {}
+        for key, value in data.items():
+            if key in ARRAY_KEYS and is_numeric(value):
+                packed[key] = {ARRAY_MARKER: [len(blob), len(value)]}
+                blob.extend(value)
+            else:
+                packed[key] = pack_arrays(value, blob)
+        return packed
+    if isinstance(data, list):
+        return [pack_arrays(value, blob) for value in data]
+    return data
+
+
+def unpack_arrays(data: Any, blob: "memoryview[Any]") -> Any:
+    """Replace markers of curve arrays by slices of the blob in place.
+
+    Parameters
+    ----------
+    data : Any
+        Header of the binary file or its part.
+    blob : memoryview
+        Float64 values of all curves.
+
+    Returns
+    -------
+    Any
+        Data with curve arrays.
+
+    """
+    if isinstance(data, dict):
+        if ARRAY_MARKER in data:
+            offset, length = data[ARRAY_MARKER]
+            stop = offset + length
+            return blob[offset:stop]
+        for key, value in data.items():
+            data[key] = unpack_arrays(value, blob)
+    elif isinstance(data, list):
+        for index, value in enumerate(data):
+            data[index] = unpack_arrays(value, blob)
+    return data
+
+
+def write_results(project_data: Dict[str, Any], path: Path) -> None:
+    """Write project data to the binary file.
+
+    Parameters
+    ----------
+    project_data : dict
+        Project data, not modified.
+    path : pathlib.Path
+        Path to the binary file.
+
+    """
+    blob = array("d")
+    header_data = pack_arrays(project_data, blob)
+    header_data["byteorder"] = sys.byteorder
+    header = json.dumps(header_data).encode()
+    # blob starts at a multiple of the item size
+    header += b" " * (-(len(MAGIC) + 8 + len(header)) % ITEM_SIZE)
+
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, "wb") as file:
+        file.write(MAGIC)
+        file.write(struct.pack("<Q", len(header)))
+        file.write(header)
+        blob.tofile(file)
+    os.replace(tmp_path, path)
+
+
+def read_results(path: Path) -> Dict[str, Any]:
+    """Read project data from the binary file, curve arrays are memory-mapped.
+
+    Parameters
+    ----------
+    path : pathlib.Path
+        Path to the binary file.
+
+    Returns
+    -------
+    dict
+        Project data, curve arrays are read-only sequences of floats.
+
+    """
+    with open(path, "rb") as file:
+        if file.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a binary results file")
+        (header_size,) = struct.unpack("<Q", file.read(8))
+        header_data = json.loads(file.read(header_size))
+        blob_offset = file.tell()
+        blob_size = os.fstat(file.fileno()).st_size - blob_offset
+
+        blob: "memoryview[Any]"
+        if header_data.pop("byteorder") != sys.byteorder:
+            values = array("d")
+            values.frombytes(file.read(blob_size))
+            values.byteswap()
+            blob = memoryview(values)
+        elif blob_size:
+            # mapping stays open while any curve of the file is referenced
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            blob = memoryview(mapped)[blob_offset:].cast("d")
+        else:
+            blob = memoryview(array("d"))
+
+    return unpack_arrays(header_data, blob)
+
+
+def load_results(path: Path) -> Dict[str, Any]:
+    """Read project data from JSON or binary file depending on its suffix.
+
+    Parameters
+    ----------
+    path : pathlib.Path
+        Path to ``.json`` or ``.bjson`` file.
+
+    Returns
+    -------
+    dict
+        Project data.
+
+    """
+    if path.suffix == BINARY_SUFFIX:
+        return read_results(path)
+
+    with open(path) as file:
+        return json.load(file)
+
+
+def find_results(folder: Path) -> List[Path]:
+    """Find all results files in the folder, binary file is preferred over JSON file of the same name.
+
+    Parameters
+    ----------
+    folder : pathlib.Path
+        Folder to search recursively.
+
+    Returns
+    -------
+    list
+        Paths to results files.
+
+    """
+    binary_files = set(folder.rglob(f"*{BINARY_SUFFIX}"))
+    json_files = [path for path in folder.rglob("*.json") if path.with_suffix(BINARY_SUFFIX) not in binary_files]
+    return sorted(json_files + list(binary_files))
+
+
+def convert_folder(folder: Path, keep_json: bool = False) -> List[Tuple[Path, int, int]]:
+    """Convert all JSON results with designs in the folder to binary files.
+
+    Parameters
+    ----------
+    folder : pathlib.Path
+        Folder to search recursively.
+    keep_json : bool, default=False
+        Keep the JSON files next to the binary files.
+
+    Returns
+    -------
+    list
+        Converted files with their size before and after conversion in bytes.
+
+    """
+    converted = []
+    for json_file in sorted(folder.rglob("*.json")):
+        project_data = load_results(json_file)
+        if not isinstance(project_data, dict) or "designs" not in project_data:
+            # e.g. configuration or runtime history
+            continue
+
+        binary_file = json_file.with_suffix(BINARY_SUFFIX)
+        write_results(project_data, binary_file)
+        converted.append((binary_file, json_file.stat().st_size, binary_file.stat().st_size))
+        if not keep_json:
+            json_file.unlink()
+
+    return converted
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Main function that is executed by ``flit`` CLI script and by executing this python file."""
+    parser = argparse.ArgumentParser(description="Convert JSON results and references to compact binary files")
+    parser.add_argument("--reference-folder", required=True, help="Folder with JSON results, searched recursively")
+    parser.add_argument("--keep-json", action="store_true", help="Keep JSON files next to converted files")
+    args = parser.parse_args(argv)
+
+    for binary_file, json_size, binary_size in convert_folder(Path(args.reference_folder), args.keep_json):
+        print(f"Converted {binary_file}: {json_size / 1024:.0f} KB -> {binary_size / 1024:.0f} KB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,225 @@
+"""Offline replay of the project scheduler.
+
+Replays a suite of project configurations on a set of machines without Electronics Desktop
+and reports makespan and average core utilization for every placement strategy.
+
+Example::
+
+    aedt_schedule_simulator --config-folder=examples/configs --hosts=host1:64,host2:32,host3:16
+
+"""
+import argparse
+import heapq
+import itertools
+import math
+from pathlib import Path
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import NamedTuple
+from typing import Optional
+from typing import Tuple
+
+from aedttest.aedt_test_runner import PLACEMENT_STRATEGIES
+from aedttest.aedt_test_runner import estimate_runtimes
+from aedttest.aedt_test_runner import find_allocation
+from aedttest.aedt_test_runner import find_backfill_allocation
+from aedttest.aedt_test_runner import prioritize_projects
+from aedttest.aedt_test_runner import read_configs
+from aedttest.aedt_test_runner import read_runtime_history
+from aedttest.clusters.job_hosts import parse_custom_input
+from aedttest.reference_index import ReferenceIndex
+
+
+class ScheduleStats(NamedTuple):
+    placement: str
+    makespan: float
+    utilization: float
+    start_times: Dict[str, float]
+
+
+def simulate_schedule(
+    project_tests_config: Dict[str, Any],
+    machines_dict: Dict[str, int],
+    durations: Dict[str, float],
+    placement: str = "first-fit",
+    max_parallel_projects: int = 99999,
+    default_duration: float = 1.0,
+    runtime_estimates: Optional[Dict[str, float]] = None,
+    backfill: bool = False,
+    max_cores: float = math.inf,
+) -> ScheduleStats:
+    """Simulate execution of all projects using the allocator logic of the test runner.
+
+    Parameters
+    ----------
+    project_tests_config : dict
+        Configuration of all projects.
+    machines_dict : dict
+        Cores per machine.
+    durations : dict
+        Wall time of the projects in seconds.
+    placement : str, default="first-fit"
+        Placement strategy, one of ``PLACEMENT_STRATEGIES``.
+    max_parallel_projects : int, default=99999
+        Limit of parallel projects.
+    default_duration : float, default=1.0
+        Wall time of the projects that are not listed in ``durations``.
+    runtime_estimates : dict, optional
+        Estimated wall time used to order the queue and for backfilling, as done by the test runner.
+    backfill : bool, default=False
+        Use EASY backfilling instead of starting the first project that fits.
+    max_cores : float, default=math.inf
+        Global limit of cores in use.
+
+    Returns
+    -------
+    ScheduleStats
+        Makespan in seconds, average core utilization in range ``[0, 1]`` and start time of each project.
+
+    """
+    free_machines = dict(machines_dict)
+    total_cores = sum(machines_dict.values())
+    runtime_estimates = runtime_estimates or {}
+    queue = prioritize_projects(project_tests_config, runtime_estimates)
+    running: List[Tuple[float, int, Dict[str, Dict[str, int]], Optional[float]]] = []
+    counter = itertools.count()
+    now = 0.0
+    cores_in_use = 0
+    busy_core_time = 0.0
+    start_times = {}
+
+    while queue or running:
+        while queue and len(running) < max_parallel_projects:
+            if backfill:
+                expected = [(expected_end, allocated) for _, _, allocated, expected_end in running]
+                allocation = find_backfill_allocation(
+                    queue,
+                    project_tests_config,
+                    free_machines,
+                    expected,
+                    now,
+                    runtime_estimates,
+                    placement,
+                    max_cores - cores_in_use,
+                )
+            else:
+                allocation = find_allocation(
+                    queue, project_tests_config, free_machines, placement, max_cores - cores_in_use
+                )
+            if allocation is None:
+                break
+
+            proj_name, allocated_machines = allocation
+            for machine, conf in allocated_machines.items():
+                free_machines[machine] -= conf["cores"]
+                cores_in_use += conf["cores"]
+
+            queue.remove(proj_name)
+            start_times[proj_name] = now
+            duration = durations.get(proj_name, default_duration)
+            busy_core_time += duration * sum(conf["cores"] for conf in allocated_machines.values())
+            estimate = runtime_estimates.get(proj_name)
+            expected_end = now + estimate if estimate is not None else None
+            # counter is used only to avoid comparison of dictionaries when times are equal
+            heapq.heappush(running, (now + duration, next(counter), allocated_machines, expected_end))
+
+        if not running:
+            raise ValueError(f"Not enough resources to run any of projects: {', '.join(queue)}")
+
+        now, _, allocated_machines, _ = heapq.heappop(running)
+        for machine, conf in allocated_machines.items():
+            free_machines[machine] += conf["cores"]
+            cores_in_use -= conf["cores"]
+
+    utilization = busy_core_time / (total_cores * now) if now else 0.0
+    return ScheduleStats(placement, now, utilization, start_times)
+
+
+def compare_placements(
+    project_tests_config: Dict[str, Any],
+    machines_dict: Dict[str, int],
+    durations: Dict[str, float],
+    max_parallel_projects: int = 99999,
+    backfill: bool = False,
+    max_cores: float = math.inf,
+) -> List[ScheduleStats]:
+    """Simulate the schedule with every placement strategy.
+
+    Durations are used also as runtime estimates to order the queue.
+
+    Parameters
+    ----------
+    project_tests_config : dict
+        Configuration of all projects.
+    machines_dict : dict
+        Cores per machine.
+    durations : dict
+        Wall time of the projects in seconds.
+    max_parallel_projects : int, default=99999
+        Limit of parallel projects.
+    backfill : bool, default=False
+        Use EASY backfilling instead of starting the first project that fits.
+    max_cores : float, default=math.inf
+        Global limit of cores in use.
+
+    Returns
+    -------
+    list
+        Statistics for each strategy in ``PLACEMENT_STRATEGIES``.
+
+    """
+    return [
+        simulate_schedule(
+            project_tests_config,
+            machines_dict,
+            durations,
+            placement,
+            max_parallel_projects,
+            runtime_estimates=durations,
+            backfill=backfill,
+            max_cores=max_cores,
+        )
+        for placement in PLACEMENT_STRATEGIES
+    ]
+
+
+def format_stats(all_stats: List[ScheduleStats]) -> str:
+    """Format statistics as a plain text table."""
+    lines = [f"{'Placement':<20}{'Makespan [s]':>15}{'Utilization [%]':>18}"]
+    for stats in all_stats:
+        lines.append(f"{stats.placement:<20}{stats.makespan:>15.1f}{stats.utilization * 100:>18.1f}")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Main function that is executed by ``flit`` CLI script and by executing this python file."""
+    parser = argparse.ArgumentParser(description="Compare placement strategies on a configuration suite")
+    parser.add_argument("--config-folder", required=True, help="Path to project configuration folder")
+    parser.add_argument("--hosts", required=True, help='Machines to simulate, format: "host1:64,host2:32"')
+    parser.add_argument(
+        "--durations", help="JSON file with wall time of each project in seconds, e.g. runner --runtime-history"
+    )
+    parser.add_argument("--reference-folder", help="Estimate missing durations from reference simulation times")
+    parser.add_argument(
+        "--max-projects", "-mp", type=int, help="total number of parallel projects limit", default=99999
+    )
+    parser.add_argument("--max-cores", "-c", type=int, help="total number of cores limit", default=99999)
+    parser.add_argument("--backfill", action="store_true", help="Simulate EASY backfilling")
+    args = parser.parse_args(argv)
+
+    machines_dict = {machine.hostname: machine.cores for machine in parse_custom_input(args.hosts)}
+    project_tests_config = read_configs(Path(args.config_folder))
+
+    durations = read_runtime_history(Path(args.durations)) if args.durations else {}
+    if args.reference_folder:
+        reference_index = ReferenceIndex(Path(args.reference_folder))
+        durations = estimate_runtimes(project_tests_config, reference_index.summaries(), durations)
+    all_stats = compare_placements(
+        project_tests_config, machines_dict, durations, args.max_projects, args.backfill, args.max_cores
+    )
+    print(format_stats(all_stats))
+
+
+if __name__ == "__main__":
+    main()
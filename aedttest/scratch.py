@@ -0,0 +1,278 @@
+"""Staging of projects on the local scratch of the host that runs Electronics Desktop.
+
+Projects are staged to the shared run folder first. When cores are allocated, the folder of the project is
+transferred to ``<scratch_dir>/<run_name>/<project_name>`` on the first allocated host, so Electronics Desktop
+reads and writes its results on a local disk. Only extracted results and the profiles and mesh statistics they
+refer to are transferred back, paths in the results are rewritten to the shared run folder.
+
+The framework host is served by a local copy, other hosts by ``copy_command``, ``rsync`` over SSH by default.
+Command templates are split into arguments before values are substituted, so paths may contain spaces.
+
+"""
+import asyncio
+import functools
+import json
+import shlex
+import shutil
+import socket
+import subprocess
+from pathlib import Path
+from typing import Any
+from typing import List
+from typing import Set
+
+from aedttest import file_transfer
+
+DEFAULT_COPY_COMMAND = "rsync -a --delete {src} {dst}"
+# remote shell splits the command again, path is quoted for it
+DEFAULT_MKDIR_COMMAND = "ssh {host} \"mkdir -p '{path}'\""
+DEFAULT_REMOVE_COMMAND = "ssh {host} \"rm -rf '{path}'\""
+
+
+def is_local_host(host: str) -> bool:
+    """Whether the host is the machine of the framework.
+
+    Parameters
+    ----------
+    host : str
+        Name of the host.
+
+    """
+    local_names = {"localhost", socket.gethostname(), socket.gethostname().split(".")[0]}
+    return host in local_names or host.split(".")[0] in local_names
+
+
+def format_command(template: str, **values: Any) -> List[str]:
+    """Split the command template into arguments and substitute the values in each of them.
+
+    Parameters
+    ----------
+    template : str
+        Command template with ``{name}`` fields, quoted as in a shell.
+    **values : Any
+        Values of the fields.
+
+    Returns
+    -------
+    list
+        Command to run.
+
+    """
+    return [arg.format(**values) for arg in shlex.split(template)]
+
+
+async def run_command(command: List[str]) -> None:
+    """Run short command and raise ``subprocess.CalledProcessError`` with its output if it fails.
+
+    Parameters
+    ----------
+    command : list
+        Command to run.
+
+    """
+    process = await asyncio.create_subprocess_exec(
+        *command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, stdin=subprocess.DEVNULL
+    )
+    output, _ = await process.communicate()
+    if process.returncode:
+        raise subprocess.CalledProcessError(process.returncode, command, output.decode(errors="replace"))
+
+
+def relocate(data: Any, remote_dir: Path, local_dir: Path, relocated: Set[str]) -> Any:
+    """Copy of the data where paths within the scratch folder point to the shared run folder.
+
+    Parameters
+    ----------
+    data : Any
+        Results of the project or their part.
+    remote_dir : pathlib.Path
+        Folder of the project on scratch.
+    local_dir : pathlib.Path
+        Folder of the project in the shared run folder.
+    relocated : set
+        Relative paths of the relocated files, extended in place.
+
+    Returns
+    -------
+    Any
+        Data with relocated paths.
+
+    """
+    if isinstance(data, dict):
+        return {key: relocate(value, remote_dir, local_dir, relocated) for key, value in data.items()}
+    if isinstance(data, list):
+        return [relocate(value, remote_dir, local_dir, relocated) for value in data]
+    if isinstance(data, str) and data.startswith(f"{remote_dir}/"):
+        relative_path = Path(data).relative_to(remote_dir)
+        relocated.add(relative_path.as_posix())
+        return str(local_dir / relative_path)
+    return data
+
+
+def relocate_results(results_file: Path, remote_dir: Path, local_dir: Path) -> List[str]:
+    """Rewrite paths within the scratch folder in the results or checkpoint file of the project.
+
+    Parameters
+    ----------
+    results_file : pathlib.Path
+        ``<project>.json`` or the checkpoint with one JSON record per line.
+    remote_dir : pathlib.Path
+        Folder of the project on scratch.
+    local_dir : pathlib.Path
+        Folder of the project in the shared run folder.
+
+    Returns
+    -------
+    list
+        Relative paths of files that the results refer to, sorted.
+
+    """
+    relocated: Set[str] = set()
+    if not results_file.exists():
+        return []
+
+    with open(results_file) as file:
+        lines = file.read().splitlines()
+
+    if results_file.suffix == ".json":
+        content = json.dumps(relocate(json.loads("\n".join(lines)), remote_dir, local_dir, relocated), indent=4)
+    else:
+        relocated_lines = []
+        for line in lines:
+            try:
+                line = json.dumps(relocate(json.loads(line), remote_dir, local_dir, relocated))
+            except ValueError:
+                # e.g. line torn by the crash, reader skips it
+                pass
+            relocated_lines.append(line)
+        content = "\n".join(relocated_lines) + "\n"
+
+    with open(results_file, "w") as file:
+        file.write(content)
+    return sorted(relocated)
+
+
+class NodeScratch:
+    """Transfer of project folders between the shared run folder and scratch of the hosts.
+
+    Parameters
+    ----------
+    scratch_dir : str
+        Path to the scratch folder, identical on all hosts.
+    run_name : str
+        Name of the folder of the current run within ``scratch_dir``.
+    copy_command : str, default=DEFAULT_COPY_COMMAND
+        Command template that copies ``{src}`` to ``{dst}``, remote paths are given as ``host:path``.
+        Folders are given with trailing slash, so their content is copied.
+    remove_command : str, default=DEFAULT_REMOVE_COMMAND
+        Command template that removes folder ``{path}`` on ``{host}``.
+    mkdir_command : str, default=DEFAULT_MKDIR_COMMAND
+        Command template that creates folder ``{path}`` and its parents on ``{host}``.
+
+    """
+
+    def __init__(
+        self,
+        scratch_dir: str,
+        run_name: str,
+        copy_command: str = DEFAULT_COPY_COMMAND,
+        remove_command: str = DEFAULT_REMOVE_COMMAND,
+        mkdir_command: str = DEFAULT_MKDIR_COMMAND,
+    ) -> None:
+        self.scratch_dir = Path(scratch_dir)
+        self.run_name = run_name
+        self.copy_command = copy_command
+        self.remove_command = remove_command
+        self.mkdir_command = mkdir_command
+
+    def project_dir(self, project_name: str) -> Path:
+        """Folder of the project on scratch of the host.
+
+        Parameters
+        ----------
+        project_name : str
+            Name of the project.
+
+        """
+        return self.scratch_dir / self.run_name / project_name
+
+    async def push(self, local_dir: Path, host: str, remote_dir: Path) -> None:
+        """Replace content of the scratch folder on the host by content of the local folder.
+
+        Parent folders are created first, copy command creates only the last folder of the destination.
+
+        Parameters
+        ----------
+        local_dir : pathlib.Path
+            Folder in the shared run folder.
+        host : str
+            Name of the host.
+        remote_dir : pathlib.Path
+            Folder on scratch of the host.
+
+        """
+        if is_local_host(host):
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, self._replace_local, local_dir, remote_dir)
+            return
+
+        await run_command(format_command(self.mkdir_command, host=host, path=remote_dir.parent))
+        await run_command(self._copy_command(f"{local_dir}/", f"{host}:{remote_dir}/"))
+
+    async def pull(self, host: str, remote_path: Path, local_path: Path) -> None:
+        """Copy file or folder from scratch of the host back to the shared run folder.
+
+        Parameters
+        ----------
+        host : str
+            Name of the host.
+        remote_path : pathlib.Path
+            File or folder on scratch of the host.
+        local_path : pathlib.Path
+            Destination in the shared run folder, folders are merged.
+
+        """
+        if is_local_host(host):
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, self._copy_local, remote_path, local_path)
+            return
+
+        if remote_path.suffix:
+            await run_command(self._copy_command(f"{host}:{remote_path}", str(local_path)))
+        else:
+            await run_command(self._copy_command(f"{host}:{remote_path}/", f"{local_path}/"))
+
+    async def remove(self, host: str, remote_dir: Path) -> None:
+        """Remove the folder from scratch of the host.
+
+        Parameters
+        ----------
+        host : str
+            Name of the host.
+        remote_dir : pathlib.Path
+            Folder on scratch of the host.
+
+        """
+        if is_local_host(host):
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, functools.partial(shutil.rmtree, remote_dir, ignore_errors=True))
+            return
+
+        await run_command(format_command(self.remove_command, host=host, path=remote_dir))
+
+    def _copy_command(self, src: str, dst: str) -> List[str]:
+        return format_command(self.copy_command, src=src, dst=dst)
+
+    @staticmethod
+    def _replace_local(local_dir: Path, remote_dir: Path) -> None:
+        if remote_dir.exists():
+            # e.g. lock file of the crashed attempt
+            shutil.rmtree(remote_dir)
+        file_transfer.copy_tree(local_dir, remote_dir)
+
+    @staticmethod
+    def _copy_local(remote_path: Path, local_path: Path) -> None:
+        if remote_path.is_dir():
+            file_transfer.copy_tree(remote_path, local_path)
+        else:
+            file_transfer.copy_file(remote_path, local_path)
@@ -0,0 +1,254 @@
+"""Pool of long-lived Electronics Desktop sessions.
+
+Every session runs ``simulation_data.py`` in worker mode and solves projects one by one, so start of Electronics
+Desktop and license checkout are paid once per session instead of once per project.
+
+Projects are handed over through files in the directory of each worker::
+
+    <worker_dir>/inbox/<job_id>.json   job written by the runner: {"project_path": "..."} or {"stop": true}
+    <worker_dir>/outbox/<job_id>.json  result written by the worker: {"status": "done", "results_json": "..."}
+                                       or {"status": "error", "error": "..."}
+
+Files are written under a temporary name and renamed, so the reader never sees a partial file.
+
+Session that exited is restarted when it is acquired next time, at most ``max_restarts`` times.
+
+"""
+import asyncio
+import itertools
+import json
+import os
+import subprocess
+from pathlib import Path
+from typing import Any
+from typing import Awaitable
+from typing import Callable
+from typing import Dict
+from typing import Optional
+from typing import Sequence
+
+from aedttest.logger import logger
+
+INBOX = "inbox"
+OUTBOX = "outbox"
+POLL_INTERVAL = 0.5
+
+
+class SessionError(RuntimeError):
+    """Electronics Desktop session exited or is not available."""
+
+
+def write_json_atomic(file_path: Path, data: Dict[str, Any]) -> None:
+    """Write JSON under a temporary name and rename it.
+
+    Parameters
+    ----------
+    file_path : pathlib.Path
+        Path to the JSON file.
+    data : dict
+        Data to write.
+
+    """
+    tmp_path = file_path.with_name(file_path.name + ".tmp")
+    with open(tmp_path, "w") as file:
+        json.dump(data, file)
+    os.replace(tmp_path, file_path)
+
+
+class SessionWorker:
+    """Single Electronics Desktop session that processes jobs from its inbox.
+
+    Parameters
+    ----------
+    worker_dir : pathlib.Path
+        Directory with inbox and outbox of the worker.
+    launch : callable
+        Coroutine function that starts the session for ``worker_dir`` and returns when it exits.
+
+    """
+
+    def __init__(self, worker_dir: Path, launch: Callable[[Path], Awaitable[None]]) -> None:
+        self.worker_dir = worker_dir
+        (worker_dir / INBOX).mkdir(parents=True, exist_ok=True)
+        (worker_dir / OUTBOX).mkdir(parents=True, exist_ok=True)
+        self.job_ids = itertools.count(1)
+        self.launch = launch
+        self.restarts = 0
+        self.process = asyncio.ensure_future(launch(worker_dir))
+
+    @property
+    def name(self) -> str:
+        return self.worker_dir.name
+
+    @property
+    def alive(self) -> bool:
+        return not self.process.done()
+
+    async def submit(self, job: Dict[str, Any], timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Hand over the job and wait for its result.
+
+        Parameters
+        ----------
+        job : dict
+            Job for the worker.
+        timeout : float, optional
+            Wall time limit in seconds. The session is killed if the limit is exceeded.
+
+        Returns
+        -------
+        dict
+            Result written by the worker.
+
+        Raises
+        ------
+        SessionError
+            Session exited before the result was written.
+        subprocess.TimeoutExpired
+            Result was not written within ``timeout``.
+
+        """
+        job_name = f"{next(self.job_ids):06d}.json"
+        write_json_atomic(self.worker_dir / INBOX / job_name, job)
+        try:
+            return await asyncio.wait_for(self.wait_result(self.worker_dir / OUTBOX / job_name), timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"Kill session {self.name} after timeout of {timeout} s")
+            await self.kill()
+            raise subprocess.TimeoutExpired(f"session {self.name}", timeout)  # type: ignore[arg-type]
+
+    async def wait_result(self, result_file: Path) -> Dict[str, Any]:
+        """Poll the outbox until the result appears.
+
+        Parameters
+        ----------
+        result_file : pathlib.Path
+            Expected result file.
+
+        Returns
+        -------
+        dict
+            Result written by the worker.
+
+        """
+        while not result_file.exists():
+            if not self.alive:
+                raise SessionError(f"Electronics Desktop session {self.name} exited: {self.exit_reason()}")
+            await asyncio.sleep(POLL_INTERVAL)
+
+        with open(result_file) as file:
+            result: Dict[str, Any] = json.load(file)
+        result_file.unlink()
+        return result
+
+    def exit_reason(self) -> str:
+        """Description of the session exit."""
+        if self.process.cancelled():
+            return "session was killed"
+        exc = self.process.exception()
+        return str(exc) if exc else "session finished unexpectedly"
+
+    def restart(self) -> None:
+        """Start new session after the previous one exited, jobs left by the previous session are dropped."""
+        for folder in (INBOX, OUTBOX):
+            for job_file in (self.worker_dir / folder).iterdir():
+                job_file.unlink()
+        self.restarts += 1
+        self.process = asyncio.ensure_future(self.launch(self.worker_dir))
+
+    async def stop(self) -> None:
+        """Ask the worker to finish after the current job and wait for the session to exit."""
+        if self.alive:
+            write_json_atomic(self.worker_dir / INBOX / "stop.json", {"stop": True})
+        try:
+            await self.process
+        except (asyncio.CancelledError, Exception) as exc:
+            logger.debug(f"Session {self.name} exited with: {exc!r}")
+
+    async def kill(self) -> None:
+        """Kill the session."""
+        self.process.cancel()
+        try:
+            await self.process
+        except (asyncio.CancelledError, Exception):
+            pass
+
+
+class SessionPool:
+    """Fixed number of Electronics Desktop sessions that are reused between projects.
+
+    Parameters
+    ----------
+    pool_dir : pathlib.Path
+        Directory where worker directories are created.
+    launchers : list
+        Coroutine functions that start one session each, see ``SessionWorker``.
+    max_restarts : int, default=0
+        Number of times each session is restarted after it exited.
+
+    """
+
+    def __init__(
+        self, pool_dir: Path, launchers: Sequence[Callable[[Path], Awaitable[None]]], max_restarts: int = 0
+    ) -> None:
+        self.max_restarts = max_restarts
+        self.workers = [
+            SessionWorker(pool_dir / f"session_{number}", launch) for number, launch in enumerate(launchers, 1)
+        ]
+        self.idle: "asyncio.Queue[Optional[SessionWorker]]" = asyncio.Queue()
+        for worker in self.workers:
+            self.idle.put_nowait(worker)
+
+    def usable(self, worker: SessionWorker) -> bool:
+        """Whether the session is running or can be restarted.
+
+        Parameters
+        ----------
+        worker : SessionWorker
+            Session of the pool.
+
+        """
+        return worker.alive or worker.restarts < self.max_restarts
+
+    async def acquire(self) -> SessionWorker:
+        """Wait for an idle session, restart it if it exited.
+
+        Raises
+        ------
+        SessionError
+            All sessions exited and cannot be restarted.
+
+        """
+        while True:
+            worker = await self.idle.get()
+            if worker is None:
+                # pass the marker to the next waiting project
+                self.idle.put_nowait(None)
+                raise SessionError("All Electronics Desktop sessions exited")
+
+            if worker.alive:
+                return worker
+
+            if self.usable(worker):
+                logger.warning(f"Restart session {worker.name}, previous one exited: {worker.exit_reason()}")
+                worker.restart()
+                return worker
+
+            self.release(worker)
+
+    def release(self, worker: SessionWorker) -> None:
+        """Return session back to the pool.
+
+        Parameters
+        ----------
+        worker : SessionWorker
+            Session acquired by ``acquire()``.
+
+        """
+        if self.usable(worker):
+            self.idle.put_nowait(worker)
+        elif not any(self.usable(other) for other in self.workers):
+            self.idle.put_nowait(None)
+
+    async def stop(self) -> None:
+        """Stop all sessions."""
+        await asyncio.gather(*(worker.stop() for worker in self.workers))
@@ -1,4 +1,5 @@
 import argparse
+import bisect
 import decimal
 import json
 import logging
@@ -6,6 +7,14 @@ import os
 import re
 import shlex
 import sys
+import time
+from array import array
+
+try:
+    import tracemalloc
+except ImportError:
+    # Python 2.7
+    tracemalloc = None
 
 DEBUG = False if "oDesktop" in dir() else True
 MODULE_DIR_PARENT = os.path.dirname(os.path.dirname(__file__))
@@ -22,8 +31,11 @@ def parse_args():
     parser.add_argument("--pyaedt-path")
     parser.add_argument("--logfile-path")
     parser.add_argument("--debug", action="store_true")
+    parser.add_argument("--worker-dir")
+    parser.add_argument("--batch-file")
+    parser.add_argument("--extract-only", action="store_true")
     args = parser.parse_args(shlex.split(arg_string))
-    return args.pyaedt_path, args.logfile_path, args.debug
+    return args.pyaedt_path, args.logfile_path, args.debug, args.worker_dir, args.batch_file, args.extract_only
 
 
 def parse_args_debug():
@@ -37,7 +49,7 @@ def parse_args_debug():
 
 log_level = logging.DEBUG
 if not DEBUG:
-    pyaedt_path, logfile_path, debug = parse_args()
+    pyaedt_path, logfile_path, debug, worker_dir, batch_file, extract_only = parse_args()
     sys.path.insert(0, pyaedt_path)
     specified_version = None
 
@@ -46,13 +58,17 @@ if not DEBUG:
 else:
     specified_version = parse_args_debug()
     logfile_path = os.path.join(MODULE_DIR_PARENT, "aedt_test_framework.log")
+    worker_dir = None
+    batch_file = None
+    extract_only = False
 
 try:
     import pyaedt  # noqa: E402
     from pyaedt import get_pyaedt_app  # noqa: E402
     from pyaedt.desktop import Desktop  # noqa: E402
+    from pyaedt.generic.constants import SI_UNITS  # noqa: E402
+    from pyaedt.generic.constants import unit_system  # noqa: E402
     from pyaedt.generic.general_methods import generate_unique_name  # noqa: E402
-    from pyaedt.generic.report_file_parser import parse_rdat_file  # noqa: E402
 except Exception as exc:
     set_logger(logging_file=logfile_path, level=log_level, pyaedt_module=None)
     logger.exception(str(exc))
@@ -63,6 +79,19 @@ set_logger(logging_file=logfile_path, level=log_level, pyaedt_module=pyaedt)
 
 PROJECT_DICT = {"error_exception": [], "designs": {}}
 
+# job protocol of the session pool, see aedttest/session_pool.py
+INBOX = "inbox"
+OUTBOX = "outbox"
+POLL_INTERVAL = 0.5
+
+# data of every extracted design is appended to ``<project_name>.checkpoint.jsonl`` next to the project,
+# see read_checkpoint() in aedttest/aedt_test_runner.py
+CHECKPOINT_SUFFIX = ".checkpoint.jsonl"
+
+# path of the block with reports in ``.rdat`` file
+REPORTS_BLOCK = ["ReportsData", "RepMgrRepsData"]
+COLUMN_PREFIX = "ColumnValues("
+
 
 class AedtTestException(Exception):
     """Base class for exceptions in this module."""
@@ -180,7 +209,7 @@ def parse_value_with_unit(string):
         return origin_string, ""
 
 
-def extract_data(desktop, project_dir, project_name, design_names):
+def extract_data(desktop, project_dir, project_name, design_names, checkpoint_file=None):
     """Extract designs' data for a project.
 
     Parameters
@@ -193,6 +222,8 @@ def extract_data(desktop, project_dir, project_name, design_names):
         Name of the project
     design_names : list
         List of design names.
+    checkpoint_file : str, optional
+        Path to the checkpoint, data of every design is appended to it as soon as the design is extracted.
 
     Returns
     -------
@@ -204,6 +235,7 @@ def extract_data(desktop, project_dir, project_name, design_names):
     designs_dict = {}
 
     for design_name in design_names:
+        errors_before = len(PROJECT_DICT["error_exception"])
         design_dict = {
             design_name: {"mesh": {}, "simulation_time": {}, "report": {}, "profile_name": {}, "mesh_name": {}}
         }
@@ -212,6 +244,13 @@ def extract_data(desktop, project_dir, project_name, design_names):
         if not setups_names:
             PROJECT_DICT["error_exception"].append("Design {} has no setups".format(design_name))
             designs_dict.update(design_dict)
+            if checkpoint_file:
+                append_checkpoint(
+                    checkpoint_file,
+                    design_name,
+                    design_dict[design_name],
+                    PROJECT_DICT["error_exception"][errors_before:],
+                )
             continue
 
         sweeps = app.existing_analysis_sweeps
@@ -222,7 +261,7 @@ def extract_data(desktop, project_dir, project_name, design_names):
                     setup_dict[setups] = sweep
                     break
 
-        analyze_success = desktop.analyze_all(design=design_name)
+        analyze_success = analyze_design(desktop, app, design_name, setups_names)
 
         if not analyze_success:
             logger.error("design {} 'analyze_all' failed".format(design_name))
@@ -251,10 +290,107 @@ def extract_data(desktop, project_dir, project_name, design_names):
         design_dict[design_name]["report"] = reports_dict
 
         designs_dict.update(design_dict)
+        if checkpoint_file:
+            append_checkpoint(
+                checkpoint_file, design_name, design_dict[design_name], PROJECT_DICT["error_exception"][errors_before:]
+            )
 
     return designs_dict
 
 
+def append_checkpoint(checkpoint_file, design_name, design_data, errors):
+    """Append data of the extracted design to the checkpoint and flush it to the disk.
+
+    Parameters
+    ----------
+    checkpoint_file : str
+        Path to the checkpoint.
+    design_name : str
+        Name of the design.
+    design_data : dict
+        Extracted data of the design.
+    errors : list
+        Errors raised during extraction of the design.
+
+    """
+    record = {"design": design_name, "data": design_data, "errors": errors}
+    with open(checkpoint_file, "a") as file:
+        file.write(json.dumps(record, default=json_default) + "\n")
+        file.flush()
+        os.fsync(file.fileno())
+
+
+def read_checkpoint(checkpoint_file):
+    """Read designs extracted by the previous attempt of the project.
+
+    Line that was not completely written before the crash is skipped.
+
+    Parameters
+    ----------
+    checkpoint_file : str
+        Path to the checkpoint.
+
+    Returns
+    -------
+    designs_dict : dict
+        Data by design name.
+    errors : list
+        Errors of the extracted designs.
+
+    """
+    designs_dict = {}
+    errors = []
+    if not os.path.isfile(checkpoint_file):
+        return designs_dict, errors
+
+    with open(checkpoint_file) as file:
+        for line in file:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            designs_dict[record["design"]] = record["data"]
+            errors.extend(record["errors"])
+
+    return designs_dict, errors
+
+
+def analyze_design(desktop, app, design_name, setups_names):
+    """Solve all setups of the design, in extract-only mode only setups without saved solution.
+
+    Parameters
+    ----------
+    desktop : pyaedt.desktop.Desktop
+        ``pyaedt`` ``Desktop`` object.
+    app : pyaedt.application.AedtObjects
+        Any ``pyaedt`` Electronics Desktop application object.
+    design_name : str
+        Name of the design.
+    setups_names : list
+        Names of the setups of the design.
+
+    Returns
+    -------
+    bool
+        ``True`` if all analyses succeeded.
+
+    """
+    if not extract_only:
+        return desktop.analyze_all(design=design_name)
+
+    unsolved = [setup for setup in setups_names if not app.get_setup(setup).is_solved]
+    logger.info(
+        "design {}: {} of {} setup(s) have saved solution".format(
+            design_name, len(setups_names) - len(unsolved), len(setups_names)
+        )
+    )
+    success = True
+    for setup in unsolved:
+        logger.warning("design {}: setup {} has no saved solution, solve it".format(design_name, setup))
+        success = app.analyze_setup(setup) and success
+    return success
+
+
 def extract_design_data(app, design_name, setup_dict, project_dir, design_dict):
     """Extract single design data.
 
@@ -374,73 +510,315 @@ def extract_reports_data(app, design_name, project_dir, report_names):
             report_file = app.post.export_report_to_file(
                 output_dir=project_dir, plot_name=report, extension=".rdat", unique_file=True
             )
-            data_dict = parse_rdat_file(report_file)
-            data_dict = compose_curve_keys(data_dict)
-            data_dict = check_nan(data_dict)
+            start = time.time()
+            (data_dict, stats), peak_memory = call_with_peak_memory(parse_rdat_stream, report_file)
+            logger.info(
+                "Report {} parsed in {:.2f} s, peak memory {}: {} curve(s), {} rejected".format(
+                    report,
+                    time.time() - start,
+                    "{:.1f} MB".format(peak_memory / 1024.0 / 1024.0) if peak_memory is not None else "not measured",
+                    stats["curves"],
+                    stats["rejected"],
+                )
+            )
             report_dict.update(data_dict)
 
     return report_dict
 
 
-def compose_curve_keys(data_dict):
-    """Format the curve keys' number to 0.9e.
+def call_with_peak_memory(func, *args):
+    """Call the function and measure peak of the memory allocated by Python during the call.
 
     Parameters
     ----------
-    data_dict : dict
-        Report data dictionary.
+    func : callable
+        Function to call.
+    *args
+        Arguments of the function.
 
     Returns
     -------
-    data_dict : dict
-        Report data dictionary with formatted keys.
+    result : Any
+        Return value of the function.
+    peak_memory : int or None
+        Peak of the allocated memory in bytes, ``None`` if ``tracemalloc`` is not available or already tracing.
 
     """
-    for plot_name in data_dict.keys():
-        for trace_name in data_dict[plot_name].keys():
-            curves_dict = data_dict[plot_name][trace_name]["curves"]
-            for curve_name in list(curves_dict.keys()):
-                if not curve_name:
-                    curve_name_composed = "nominal"
-                else:
-                    curve_name_composed = compose_variation_string(curve_name)
+    if tracemalloc is None or tracemalloc.is_tracing():
+        return func(*args), None
 
-                curves_dict[curve_name_composed] = curves_dict.pop(curve_name)
-    return data_dict
+    tracemalloc.start()
+    try:
+        result = func(*args)
+        peak_memory = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return result, peak_memory
 
 
-def check_nan(data_dict):
-    """Remove the curve if ``nan`` is in ``x`` or ``y`` data.
+class CurveColumn(object):
+    """Numeric column of the report stored as ``array('d')``.
+
+    Values are fed in pieces of the line. Non-numeric values are stored as NaN and indices of all NaN values are
+    kept, so curves with them are rejected without another pass over the data.
+
+    """
+
+    def __init__(self):
+        self.values = array("d")
+        self.invalid = []
+        self._tail = ""
+
+    def feed(self, text, continued):
+        """Parse comma separated values.
+
+        Parameters
+        ----------
+        text : str
+            Piece of the line after ``ColumnValues(``.
+        continued : bool
+            Whether the next piece continues the line, then the last value may be incomplete.
+
+        """
+        text = self._tail + text
+        if continued:
+            text, _, self._tail = text.rpartition(",")
+        else:
+            self._tail = ""
+            text = text.rstrip().rstrip(")")
+
+        for token in text.split(","):
+            token = token.strip()
+            if not token:
+                continue
+            try:
+                value = float(token)
+            except ValueError:
+                value = float("nan")
+            if value != value:
+                self.invalid.append(len(self.values))
+            self.values.append(value)
+
+    def is_valid(self, start, stop, step=1):
+        """Whether the slice of the column has no NaN or non-numeric values.
+
+        Parameters
+        ----------
+        start : int
+            First index of the slice.
+        stop : int
+            End index of the slice.
+        step : int, default=1
+            Step of the slice.
+
+        """
+        index = bisect.bisect_left(self.invalid, start)
+        while index < len(self.invalid) and self.invalid[index] < stop:
+            if (self.invalid[index] - start) % step == 0:
+                return False
+            index += 1
+        return True
+
+
+def read_rdat_lines(report_file):
+    """Yield lines of the ``.rdat`` file without indentation, undecodable binary lines are skipped.
+
+    Lines continued with a backslash are yielded in pieces, so a long column is never held as a single string.
 
     Parameters
     ----------
-    data_dict : dict
-        Report data dictionary.
+    report_file : str
+        Path to the ``.rdat`` file.
+
+    Yields
+    ------
+    line : str
+        Line or its piece without the backslash.
+    continued : bool
+        Whether the next piece continues the line.
+
+    """
+    with open(report_file, "rb") as file:
+        for raw_line in file:
+            try:
+                line = raw_line.decode("utf-8")
+            except UnicodeDecodeError:
+                continue
+            line = line.lstrip(" \t").rstrip("\r\n")
+            if line.endswith("\\"):
+                yield line[:-1], True
+            else:
+                yield line, False
+
+
+def unquote(value):
+    """Remove single quotes around the value of ``.rdat`` key."""
+    if len(value) > 1 and value.startswith("'") and value.endswith("'"):
+        return value[1:-1]
+    return value
+
+
+def compose_trace_curves(trace, stats):
+    """Slice columns of the trace to curves with composed names, curves with NaN or non-numeric values are rejected.
+
+    Parameters
+    ----------
+    trace : dict
+        Columns, units and curves info of the trace collected by ``parse_rdat_stream()``.
+    stats : dict
+        Statistics of the report, updated in place.
+
+    Returns
+    -------
+    dict
+        Trace data in format of ``pyaedt.generic.report_file_parser.parse_rdat_file()``.
+
+    """
+    comp_x = trace["comps"].get("0", {})
+    comp_y = trace["comps"].get("1", {})
+    if comp_x.get("ParameterType") == "ComplexParam":
+        # real and imaginary parts are interleaved in the first component
+        x_column, x_units = trace["sweep"], trace.get("sweep_units", "")
+        y_units = comp_x.get("Units", "")
+        parts = [("real", comp_x.get("column"), 0, 2), ("imag", comp_x.get("column"), 1, 2)]
+    else:
+        x_column, x_units = comp_x.get("column"), comp_x.get("Units", "")
+        y_units = comp_y.get("Units", "")
+        parts = [("", comp_y.get("column"), 0, 1)]
+
+    trace_dict = {
+        "x_name": comp_x.get("TraceCompExpr"),
+        "x_unit": SI_UNITS[unit_system(x_units)],
+        "y_unit": SI_UNITS[unit_system(y_units)],
+        "curves": {},
+    }
+    start = 0
+    for count, curve_name in trace["curves"]:
+        stop = start + count
+        for suffix, y_column, offset, step in parts:
+            curve_name_composed = curve_name + suffix
+            curve_name_composed = compose_variation_string(curve_name_composed) if curve_name_composed else "nominal"
+            y_start, y_stop = offset + step * start, offset + step * stop
+            if not x_column.is_valid(start, stop) or not y_column.is_valid(y_start, y_stop, step):
+                # rejected curve also removes the earlier curve with the same composed name
+                trace_dict["curves"].pop(curve_name_composed, None)
+                stats["rejected"] += 1
+                continue
+
+            trace_dict["curves"][curve_name_composed] = {
+                "x_data": x_column.values[start:stop],
+                "y_data": y_column.values[y_start:y_stop:step],
+            }
+        start = stop
+
+    stats["curves"] += len(trace_dict["curves"])
+    return trace_dict
+
+
+def parse_rdat_stream(report_file):
+    """Parse the ``.rdat`` file in a single pass.
+
+    Result is equal to ``parse_rdat_file()`` of ``pyaedt`` with curve names composed by
+    ``compose_variation_string()`` and curves with non-numeric values removed, except that curve data are
+    ``array('d')`` and curves with NaN values are rejected as well.
+    Only columns of the primary sweep and of the first two trace components are stored.
+
+    Parameters
+    ----------
+    report_file : str
+        Path to the ``.rdat`` file.
 
     Returns
     -------
-    data_dict : dict
-        Checked report data dictionary.
+    report_dict : dict
+        Report data dictionary.
+    stats : dict
+        Number of stored and rejected curves.
 
     """
+    report_dict = {}
+    stats = {"curves": 0, "rejected": 0}
+    stack = []
+    trace = None
+    column = None
+    skip_column = False
+    pending = ""
+    for line, continued in read_rdat_lines(report_file):
+        if column is not None or skip_column:
+            # piece of the column that started on the previous line
+            if column is not None:
+                column.feed(line, continued)
+            if not continued:
+                column, skip_column = None, False
+            continue
+
+        line = pending + line
+        if continued and not line.startswith(COLUMN_PREFIX):
+            pending = line
+            continue
+        pending = ""
+
+        if line.startswith("$begin '"):
+            stack.append(unquote(line.partition(" ")[2]))
+            if len(stack) == 5 and stack[:2] == REPORTS_BLOCK and stack[3] == "Traces":
+                trace = {"name": stack[4], "sweep": None, "comps": {}, "curves": []}
+            elif len(stack) == 3 and stack[:2] == REPORTS_BLOCK:
+                report_dict[stack[2]] = {}
+            continue
+
+        if line.startswith("$end '"):
+            if len(stack) == 5 and trace is not None:
+                report_dict[stack[2]][trace["name"]] = compose_trace_curves(trace, stats)
+                trace = None
+            stack.pop()
+            continue
 
-    for plot_name in data_dict.keys():
-        for trace_name in data_dict[plot_name].keys():
-            curves_dict = data_dict[plot_name][trace_name]["curves"]
-            for curve_name in list(curves_dict.keys()):
+        if trace is None:
+            continue
 
-                if sys.version_info.major == 3:
-                    number_types = (float, int)
-                else:
-                    # need to handle "long" data type in python 2
-                    number_types = (float, int, long)  # noqa: F821
+        path = stack[5:]
+        if line.startswith(COLUMN_PREFIX):
+            if path == ["PrimarySweepInfo", "PrimarySweepCol"]:
+                column = trace["sweep"] = CurveColumn()
+            elif path[:2] == ["TraceComponents", "TraceDataComps"] and path[3:] == ["TraceDataCol"]:
+                if path[2] in ("0", "1"):
+                    column = trace["comps"].setdefault(path[2], {})["column"] = CurveColumn()
+            if column is None:
+                skip_column = continued
+                continue
+            column.feed(line.partition("(")[2], continued)
+            if not continued:
+                column = None
+        elif path == ["CurvesInfo"]:
+            match = re.search(r"'(\d+)'\((.*)\)$", line)
+            if match:
+                count, _, curve_name = match.group(2).replace("\\'", '"').partition(",")
+                trace["curves"].append((int(count), unquote(curve_name.strip())))
+        else:
+            key, _, value = line.partition("=")
+            if not path and key == "TraceName":
+                trace["name"] = unquote(value)
+            elif path == ["PrimarySweepInfo", "PrimarySweepCol"] and key == "Units":
+                trace["sweep_units"] = unquote(value)
+            elif path[:2] == ["TraceComponents", "TraceDataComps"] and len(path) > 2:
+                if key in ("TraceCompExpr", "Units", "ParameterType"):
+                    trace["comps"].setdefault(path[2], {})[key] = unquote(value)
 
-                if any(not isinstance(x, number_types) for x in curves_dict[curve_name]["x_data"]) or any(
-                    not isinstance(x, number_types) for x in curves_dict[curve_name]["y_data"]
-                ):
-                    curves_dict.pop(curve_name)
+    return report_dict, stats
 
-    return data_dict
+
+def json_default(obj):
+    """Convert curve data to lists, called by ``json.dump()`` for objects it cannot serialize.
+
+    Parameters
+    ----------
+    obj : object
+        Object to serialize.
+
+    """
+    if isinstance(obj, array):
+        return obj.tolist()
+    raise TypeError("Object of type {} is not JSON serializable".format(type(obj).__name__))
 
 
 def generate_unique_file_path(project_dir, extension):
@@ -469,17 +847,44 @@ def generate_unique_file_path(project_dir, extension):
     return file_path
 
 
-def main():
-    desktop = Desktop(specified_version=specified_version, non_graphical=False, new_desktop_session=False)
+def process_project(desktop, project_name):
+    """Extract data of all designs of the project and dump it to ``<project_name>.json`` next to the project.
+
+    Parameters
+    ----------
+    desktop : pyaedt.desktop.Desktop
+        ``pyaedt`` ``Desktop`` object.
+    project_name : str
+        Name of the opened project.
+
+    Returns
+    -------
+    results_json : str
+        Path to the JSON file with results.
+
+    """
+    # dictionary is shared by all functions of the module, reset it for every project
+    PROJECT_DICT["error_exception"] = []
+    PROJECT_DICT["designs"] = {}
 
-    project_name = desktop.project_list().pop()
     project_dir = desktop.project_path(project_name=project_name)
     project_path = os.path.join(project_dir, project_name + ".aedt")
-    design_names = desktop.design_list()
+    design_names = desktop.design_list(project_name)
 
     if design_names:
+        checkpoint_file = os.path.join(project_dir, project_name + CHECKPOINT_SUFFIX)
+        designs_dict, errors = read_checkpoint(checkpoint_file)
+        if designs_dict:
+            logger.info("Designs restored from checkpoint: {}".format(", ".join(sorted(designs_dict))))
+            PROJECT_DICT["designs"].update(designs_dict)
+            PROJECT_DICT["error_exception"].extend(errors)
+            with open(checkpoint_file, "a") as file:
+                # last line may be cut by the crash
+                file.write("\n")
+
         logger.info("Start extraction for {}".format(project_path))
-        designs_dict = extract_data(desktop, project_dir, project_name, design_names)
+        remaining_designs = [design_name for design_name in design_names if design_name not in designs_dict]
+        designs_dict = extract_data(desktop, project_dir, project_name, remaining_designs, checkpoint_file)
         PROJECT_DICT["designs"].update(designs_dict)
     else:
         PROJECT_DICT["error_exception"].append("Project has no design")
@@ -488,9 +893,135 @@ def main():
 
     results_json = os.path.join(project_dir, project_name + ".json")
     with open(results_json, "w") as outfile:
-        json.dump(PROJECT_DICT, outfile, indent=4)
+        json.dump(PROJECT_DICT, outfile, indent=4, default=json_default)
+
+    if design_names and os.path.isfile(checkpoint_file):
+        # results are complete
+        os.remove(checkpoint_file)
 
     logger.debug("JSON dumped to {}".format(results_json))
+    return results_json
+
+
+def write_json_atomic(file_path, data):
+    """Write JSON under a temporary name and rename it, so the reader never sees a partial file.
+
+    Parameters
+    ----------
+    file_path : str
+        Path to the JSON file.
+    data : dict
+        Data to write.
+
+    """
+    tmp_path = file_path + ".tmp"
+    with open(tmp_path, "w") as outfile:
+        json.dump(data, outfile)
+    os.rename(tmp_path, file_path)
+
+
+def run_job(desktop, job):
+    """Open the project of the job, extract its data and close it.
+
+    Parameters
+    ----------
+    desktop : pyaedt.desktop.Desktop
+        ``pyaedt`` ``Desktop`` object.
+    job : dict
+        Job with ``project_path`` key.
+
+    Returns
+    -------
+    result : dict
+        Result of the job, ``status`` is either ``done`` or ``error``.
+
+    """
+    project_path = job["project_path"]
+    project_name = os.path.splitext(os.path.basename(project_path))[0]
+    try:
+        desktop.odesktop.OpenProject(project_path)
+        try:
+            return {"status": "done", "results_json": process_project(desktop, project_name)}
+        finally:
+            desktop.odesktop.CloseProject(project_name)
+    except Exception as exc:
+        logger.exception(str(exc))
+        return {"status": "error", "error": str(exc)}
+
+
+def run_worker(desktop, worker_dir, poll_interval=POLL_INTERVAL):
+    """Process jobs of the session pool until a stop job is received.
+
+    Jobs are read from ``<worker_dir>/inbox`` in order of their names, results are written to
+    ``<worker_dir>/outbox`` under the same name.
+
+    Parameters
+    ----------
+    desktop : pyaedt.desktop.Desktop
+        ``pyaedt`` ``Desktop`` object.
+    worker_dir : str
+        Directory of this worker.
+    poll_interval : float, default=POLL_INTERVAL
+        Interval in seconds to check for new jobs.
+
+    """
+    inbox = os.path.join(worker_dir, INBOX)
+    outbox = os.path.join(worker_dir, OUTBOX)
+    logger.info("Session worker is started in {}".format(worker_dir))
+    while True:
+        job_names = sorted(name for name in os.listdir(inbox) if name.endswith(".json"))
+        if not job_names:
+            time.sleep(poll_interval)
+            continue
+
+        job_file = os.path.join(inbox, job_names[0])
+        with open(job_file) as file:
+            job = json.load(file)
+        os.remove(job_file)
+
+        if job.get("stop"):
+            logger.info("Session worker is stopped")
+            return
+
+        logger.info("Start job {}".format(job_names[0]))
+        write_json_atomic(os.path.join(outbox, job_names[0]), run_job(desktop, job))
+
+
+def run_batch(desktop, batch_file):
+    """Solve projects of the batch one after another.
+
+    Results of every project are written to ``<project_name>.json`` next to the project. If the project
+    cannot be processed, the file contains only the error.
+
+    Parameters
+    ----------
+    desktop : pyaedt.desktop.Desktop
+        ``pyaedt`` ``Desktop`` object.
+    batch_file : str
+        Path to JSON file with list of project paths under ``projects`` key.
+
+    """
+    with open(batch_file) as file:
+        project_paths = json.load(file)["projects"]
+
+    for project_path in project_paths:
+        logger.info("Start batch project {}".format(project_path))
+        result = run_job(desktop, {"project_path": project_path})
+        if result["status"] != "done":
+            results_json = os.path.splitext(project_path)[0] + ".json"
+            with open(results_json, "w") as outfile:
+                json.dump({"error_exception": [result["error"]], "designs": {}}, outfile, indent=4)
+
+
+def main():
+    desktop = Desktop(specified_version=specified_version, non_graphical=False, new_desktop_session=False)
+
+    if worker_dir:
+        run_worker(desktop, worker_dir)
+    elif batch_file:
+        run_batch(desktop, batch_file)
+    else:
+        process_project(desktop, desktop.project_list().pop())
 
 
 if __name__ == "__main__":
@@ -1,31 +1,71 @@
+from array import array
 from typing import Any
+from typing import Callable
 from typing import Dict
+from typing import Iterator
 from typing import List
 from typing import Optional
+from typing import Tuple
+from typing import TypeVar
+
+T = TypeVar("T")
 
 DEBUG: bool
 
-def parse_args() -> str: ...
+def parse_args() -> Tuple[str, str, bool, Optional[str], Optional[str], bool]: ...
 def parse_args_debug() -> str: ...
 
 pyaedt_path: str
 specified_version: Optional[str]
+worker_dir: Optional[str]
+batch_file: Optional[str]
+extract_only: bool
 parser: Any
 args: Any
 PROJECT_DICT: Dict[str, Any]
+INBOX: str
+OUTBOX: str
+POLL_INTERVAL: float
+CHECKPOINT_SUFFIX: str
+REPORTS_BLOCK: List[str]
+COLUMN_PREFIX: str
 
 class AedtTestException(Exception): ...
 
 def parse_mesh_stats(mesh_stats_file: str, design_name: str, variation: str, setup_name: str) -> Optional[int]: ...
 def parse_profile_file(profile_file: str, design_name: str, variation: str, setup_name: str) -> Optional[str]: ...
 def parse_value_with_unit(string: str) -> str: ...
-def extract_data(desktop: Any, project_dir: str, project_name: str, design_names: List[str]) -> Dict[str, Any]: ...
+def extract_data(
+    desktop: Any, project_dir: str, project_name: str, design_names: List[str], checkpoint_file: Optional[str] = ...
+) -> Dict[str, Any]: ...
+def append_checkpoint(
+    checkpoint_file: str, design_name: str, design_data: Dict[str, Any], errors: List[str]
+) -> None: ...
+def read_checkpoint(checkpoint_file: str) -> Tuple[Dict[str, Any], List[str]]: ...
+def analyze_design(desktop: Any, app: Any, design_name: str, setups_names: List[str]) -> bool: ...
 def extract_design_data(
     app: Any, design_name: str, setup_dict: Dict[str, str], project_dir: str, design_dict: Dict[str, Any]
 ) -> Dict[str, Any]: ...
 def compose_variation_string(variation_string: str) -> str: ...
 def extract_reports_data(app: Any, design_name: str, project_dir: str, report_names: List[str]) -> Dict[str, Any]: ...
-def compose_curve_keys(data_dict: Dict[str, Any]) -> Dict[str, Any]: ...
-def check_nan(data_dict: Dict[str, Any]) -> Dict[str, Any]: ...
+def call_with_peak_memory(func: Callable[..., T], *args: Any) -> Tuple[T, Optional[int]]: ...
+
+class CurveColumn:
+    values: array[float]
+    invalid: List[int]
+    def __init__(self) -> None: ...
+    def feed(self, text: str, continued: bool) -> None: ...
+    def is_valid(self, start: int, stop: int, step: int = ...) -> bool: ...
+
+def read_rdat_lines(report_file: str) -> Iterator[Tuple[str, bool]]: ...
+def unquote(value: str) -> str: ...
+def compose_trace_curves(trace: Dict[str, Any], stats: Dict[str, int]) -> Dict[str, Any]: ...
+def parse_rdat_stream(report_file: str) -> Tuple[Dict[str, Any], Dict[str, int]]: ...
+def json_default(obj: object) -> List[float]: ...
 def generate_unique_file_path(project_dir: str, extension: str) -> str: ...
+def process_project(desktop: Any, project_name: str) -> str: ...
+def write_json_atomic(file_path: str, data: Dict[str, Any]) -> None: ...
+def run_job(desktop: Any, job: Dict[str, Any]) -> Dict[str, Any]: ...
+def run_worker(desktop: Any, worker_dir: str, poll_interval: float = ...) -> None: ...
+def run_batch(desktop: Any, batch_file: str) -> None: ...
 def main() -> None: ...
@@ -0,0 +1,202 @@
+"""Cache of projects and dependencies that are staged to the run location.
+
+Every file is stored once in the cache directory under a key of its resolved path, size and modification time.
+A changed source file gets a new key, so it is copied again. Files are placed to the run location from the
+cache with a reflink (copy-on-write clone) if the file system supports it, hardlinks are used only for
+dependencies, all other files are copied from the cache.
+
+Cached files are read-only, thus a hardlinked dependency cannot be modified in place by Electronics Desktop.
+
+"""
+import hashlib
+import os
+import stat
+import threading
+from pathlib import Path
+from typing import Dict
+from typing import List
+
+from aedttest import file_transfer
+from aedttest.logger import logger
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    # Windows
+    fcntl = None  # type: ignore[assignment]
+
+# ioctl request of Linux to clone file content, see ioctl_ficlone(2)
+FICLONE = 0x40049409
+WRITE_BITS = stat.S_IWUSR | stat.S_IWGRP | stat.S_IWOTH
+
+
+def reflink(src: Path, dst: Path) -> bool:
+    """Clone the file with copy-on-write.
+
+    Parameters
+    ----------
+    src : pathlib.Path
+        File to clone.
+    dst : pathlib.Path
+        Path of the clone.
+
+    Returns
+    -------
+    bool
+        ``True`` if the file was cloned, ``False`` if the platform or file system does not support it.
+
+    """
+    if fcntl is None:
+        return False
+
+    with open(src, "rb") as src_file, open(dst, "wb") as dst_file:
+        try:
+            fcntl.ioctl(dst_file.fileno(), FICLONE, src_file.fileno())
+            return True
+        except OSError:
+            pass
+
+    dst.unlink()
+    return False
+
+
+class StagingCache:
+    """Content of staged files keyed by path, size and modification time of the source.
+
+    Safe to use from several threads, a file is written to the cache under a temporary name and renamed.
+
+    Parameters
+    ----------
+    cache_dir : pathlib.Path
+        Directory of the cache, preferably on a local disk of the machine that runs the projects.
+
+    """
+
+    def __init__(self, cache_dir: Path) -> None:
+        self.cache_dir = cache_dir
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.stats: Dict[str, int] = {
+            "hits": 0,
+            "misses": 0,
+            "bytes_cached": 0,
+            "bytes_staged": 0,
+            "reflink": 0,
+            "hardlink": 0,
+            "copy": 0,
+        }
+        self._lock = threading.Lock()
+
+    def _count(self, **increments: int) -> None:
+        with self._lock:
+            for key, value in increments.items():
+                self.stats[key] += value
+
+    def fetch(self, src: Path) -> Path:
+        """Return cached copy of the file, copy it to the cache if it is missing or the source changed.
+
+        Parameters
+        ----------
+        src : pathlib.Path
+            Resolved path to the source file.
+
+        Returns
+        -------
+        pathlib.Path
+            Path to the read-only file in the cache.
+
+        """
+        src_stat = src.stat()
+        key = hashlib.sha1(f"{src}\0{src_stat.st_size}\0{src_stat.st_mtime_ns}".encode()).hexdigest()
+        entry = self.cache_dir / key[:2] / key
+        if entry.exists():
+            self._count(hits=1)
+            return entry
+
+        logger.debug(f"Staging cache miss: {src}")
+        entry.parent.mkdir(exist_ok=True)
+        tmp_entry = entry.with_name(f"{key}.{os.getpid()}.{threading.get_ident()}.tmp")
+        file_transfer.copy_file(src, tmp_entry)
+        os.chmod(tmp_entry, stat.S_IMODE(src_stat.st_mode) & ~WRITE_BITS)
+        os.replace(tmp_entry, entry)
+        self._count(misses=1, bytes_cached=src_stat.st_size)
+        return entry
+
+    def stage_file(self, src: Path, dst_dir: Path, link: bool = False) -> str:
+        """Place the file to the directory.
+
+        Parameters
+        ----------
+        src : pathlib.Path
+            Resolved path to the source file.
+        dst_dir : pathlib.Path
+            Directory where the file is placed, created if missing.
+        link : bool, default=False
+            Allow hardlink to the read-only cached file.
+
+        Returns
+        -------
+        str
+            Path to the placed file.
+
+        """
+        entry = self.fetch(src)
+        dst = dst_dir / src.name
+        dst_dir.mkdir(parents=True, exist_ok=True)
+        if dst.exists() or dst.is_symlink():
+            # file of the previous attempt of the project
+            dst.unlink()
+
+        # read-only files cannot be deleted on Windows, the run location would not be cleaned up
+        if link and os.name != "nt":
+            try:
+                os.link(entry, dst)
+                self._count(hardlink=1, bytes_staged=entry.stat().st_size)
+                return str(dst)
+            except OSError:
+                # cache is on another file system or links are not supported
+                pass
+
+        if reflink(entry, dst):
+            self._count(reflink=1)
+            src_stat = src.stat()
+            os.chmod(dst, stat.S_IMODE(src_stat.st_mode))
+            os.utime(dst, ns=(src_stat.st_atime_ns, src_stat.st_mtime_ns))
+            self._count(bytes_staged=src_stat.st_size)
+        else:
+            self._count(copy=1, bytes_staged=file_transfer.copy_file(entry, dst))
+            # cached file is read-only, placed file gets permissions of the source
+            os.chmod(dst, stat.S_IMODE(src.stat().st_mode))
+
+        return str(dst)
+
+    def stage_tree(self, src: Path, dst_dir: Path, link: bool = False) -> List[str]:
+        """Place all files of the folder to ``dst_dir`` preserving the folder structure.
+
+        Parameters
+        ----------
+        src : pathlib.Path
+            Resolved path to the source folder.
+        dst_dir : pathlib.Path
+            Directory where content of ``src`` is placed.
+        link : bool, default=False
+            Allow hardlinks to the read-only cached files.
+
+        Returns
+        -------
+        list
+            Paths to all placed files.
+
+        """
+        return file_transfer.copy_tree(
+            src, dst_dir, lambda src_file, dst_file: self.stage_file(src_file, dst_file.parent, link)
+        )
+
+    def summary(self) -> str:
+        """Statistics of the cache usage."""
+        stats = self.stats
+        return (
+            f"Staging cache: {stats['hits']} hit(s), {stats['misses']} miss(es), "
+            f"{stats['bytes_cached'] / 1024 ** 2:.1f} MB copied to cache, "
+            f"{stats['bytes_staged'] / 1024 ** 2:.1f} MB staged "
+            f"({stats['reflink']} reflink(s), {stats['hardlink']} hardlink(s), {stats['copy']} copies)"
+        )
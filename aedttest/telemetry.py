@@ -0,0 +1,263 @@
+"""Resource usage of a process tree sampled from ``/proc``.
+
+Only processes on the local machine are visible, for a distributed solve these are ``mpiexec`` and
+processes started on the first allocated host. On systems without ``/proc`` (Windows) nothing is sampled.
+
+"""
+import asyncio
+import os
+import threading
+import time
+from pathlib import Path
+from statistics import mean
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import NamedTuple
+from typing import Optional
+
+from aedttest.logger import logger
+
+PROC_PATH = Path("/proc")
+MAX_SAMPLES = 2000
+METRICS = ("cpu", "rss", "threads", "read_bytes", "write_bytes")
+MB = 1024 * 1024
+
+
+class ProcessStat(NamedTuple):
+    ppid: int
+    cpu_ticks: int
+    rss: int
+    peak_rss: int
+    threads: int
+    read_bytes: int
+    write_bytes: int
+
+
+def read_process(pid_dir: Path) -> Optional[ProcessStat]:
+    """Read statistics of a single process.
+
+    Parameters
+    ----------
+    pid_dir : pathlib.Path
+        Path to ``/proc/<pid>``.
+
+    Returns
+    -------
+    ProcessStat or None
+        Statistics, memory and I/O in bytes. ``None`` if process already finished.
+
+    """
+    try:
+        stat = (pid_dir / "stat").read_text()
+        status = (pid_dir / "status").read_text()
+    except OSError:
+        return None
+
+    # command name in brackets may contain spaces, fields after it start from the state (3rd field in proc(5))
+    fields = stat.rsplit(")", 1)[1].split()
+    memory = {}
+    for line in status.splitlines():
+        if line.startswith(("VmRSS:", "VmHWM:")):
+            key, value = line.split(":", 1)
+            memory[key] = int(value.split()[0]) * 1024
+
+    io_counters = {}
+    try:
+        for line in (pid_dir / "io").read_text().splitlines():
+            key, value = line.split(":", 1)
+            io_counters[key] = int(value)
+    except OSError:
+        # I/O counters of processes of other users are not readable
+        pass
+
+    return ProcessStat(
+        ppid=int(fields[1]),
+        cpu_ticks=int(fields[11]) + int(fields[12]),
+        rss=memory.get("VmRSS", 0),
+        peak_rss=memory.get("VmHWM", 0),
+        threads=int(fields[17]),
+        read_bytes=io_counters.get("read_bytes", 0),
+        write_bytes=io_counters.get("write_bytes", 0),
+    )
+
+
+def read_process_tree(pid: int, proc_path: Path = PROC_PATH) -> Dict[int, ProcessStat]:
+    """Read statistics of the process and all its descendants.
+
+    Parameters
+    ----------
+    pid : int
+        ID of the root process.
+    proc_path : pathlib.Path, default=PROC_PATH
+        Mount point of proc file system.
+
+    Returns
+    -------
+    dict
+        Statistics per process ID.
+
+    """
+    all_processes = {}
+    for pid_dir in proc_path.iterdir():
+        if pid_dir.name.isdigit():
+            process = read_process(pid_dir)
+            if process is not None:
+                all_processes[int(pid_dir.name)] = process
+
+    children: Dict[int, List[int]] = {}
+    for child_pid, process in all_processes.items():
+        children.setdefault(process.ppid, []).append(child_pid)
+
+    tree = {}
+    to_visit = [pid] if pid in all_processes else []
+    while to_visit:
+        current = to_visit.pop()
+        tree[current] = all_processes[current]
+        to_visit.extend(children.get(current, []))
+
+    return tree
+
+
+class ProcessTreeSampler:
+    """Periodically sample CPU utilization, memory, threads and I/O of a process tree.
+
+    Samples are stored column-wise in ``samples``. If number of samples exceeds ``max_samples``, every second
+    sample is dropped and the interval is doubled, so memory usage is bounded for runs of any length.
+
+    Parameters
+    ----------
+    interval : float
+        Interval between samples in seconds.
+    proc_path : pathlib.Path, default=PROC_PATH
+        Mount point of proc file system.
+    max_samples : int, default=MAX_SAMPLES
+        Maximum number of stored samples.
+
+    """
+
+    def __init__(self, interval: float, proc_path: Path = PROC_PATH, max_samples: int = MAX_SAMPLES) -> None:
+        self.interval = interval
+        self.proc_path = proc_path
+        self.max_samples = max_samples
+        self.samples: Dict[str, List[float]] = {key: [] for key in ("time",) + METRICS}
+        self.peak_rss = 0
+        self._initial_interval = interval
+        # high water mark of a process covers its whole life, not only the samples after reset
+        self._use_hwm = True
+        self._ticks: Dict[int, int] = {}
+        self._last_sample: Optional[float] = None
+        self._start = time.monotonic()
+        # samples are added in a thread, while the event loop resets or reports them
+        self._lock = threading.Lock()
+
+    async def run(self, pid: int) -> None:
+        """Sample the process tree until the coroutine is cancelled.
+
+        Parameters
+        ----------
+        pid : int
+            ID of the root process.
+
+        """
+        if not self.proc_path.is_dir():
+            logger.debug(f"{self.proc_path} is not available, resource usage is not sampled")
+            return
+
+        self._start = time.monotonic()
+        loop = asyncio.get_running_loop()
+        while True:
+            # walk of /proc takes a while on hosts with many processes, event loop is not blocked
+            sample = loop.run_in_executor(None, self.sample, pid)
+            try:
+                await asyncio.shield(sample)
+            except asyncio.CancelledError:
+                await sample
+                raise
+            await asyncio.sleep(self.interval)
+
+    def sample(self, pid: int, now: Optional[float] = None) -> None:
+        """Add single sample of the process tree.
+
+        Parameters
+        ----------
+        pid : int
+            ID of the root process.
+        now : float, optional
+            Time of the sample, ``time.monotonic()`` by default.
+
+        """
+        now = time.monotonic() if now is None else now
+        tree = read_process_tree(pid, self.proc_path)
+        if not tree:
+            return
+
+        with self._lock:
+            ticks = {child_pid: process.cpu_ticks for child_pid, process in tree.items()}
+            cpu = 0.0
+            if self._last_sample is not None and now > self._last_sample:
+                # processes that appeared after the previous sample spent all their ticks within the interval
+                busy_ticks = sum(value - self._ticks.get(child_pid, 0) for child_pid, value in ticks.items())
+                cpu = busy_ticks / os.sysconf("SC_CLK_TCK") / (now - self._last_sample)
+            self._ticks = ticks
+            self._last_sample = now
+
+            if self._use_hwm:
+                self.peak_rss = max(self.peak_rss, sum(process.peak_rss for process in tree.values()))
+            self.samples["time"].append(round(now - self._start, 1))
+            self.samples["cpu"].append(round(cpu, 2))
+            self.samples["rss"].append(round(sum(process.rss for process in tree.values()) / MB, 1))
+            self.samples["threads"].append(sum(process.threads for process in tree.values()))
+            self.samples["read_bytes"].append(sum(process.read_bytes for process in tree.values()))
+            self.samples["write_bytes"].append(sum(process.write_bytes for process in tree.values()))
+
+            if len(self.samples["time"]) > self.max_samples:
+                for key, values in self.samples.items():
+                    self.samples[key] = values[::2]
+                self.interval *= 2
+
+    def reset(self) -> None:
+        """Drop collected samples, e.g. when a long-lived session starts the next project.
+
+        CPU ticks of the previous sample are kept, so CPU utilization of the first new sample is valid.
+
+        """
+        with self._lock:
+            self.samples = {key: [] for key in ("time",) + METRICS}
+            self.interval = self._initial_interval
+            self.peak_rss = 0
+            self._use_hwm = False
+            self._start = time.monotonic()
+
+    def report(self, cores: int) -> Dict[str, Any]:
+        """Samples and summary of resource usage.
+
+        Parameters
+        ----------
+        cores : int
+            Number of cores allocated for the process.
+
+        Returns
+        -------
+        dict
+            ``samples`` and ``summary``. Memory is in MB, CPU utilization is in number of busy cores.
+
+        """
+        with self._lock:
+            # session keeps sampling after the report
+            samples = {key: list(values) for key, values in self.samples.items()}
+            peak_rss = self.peak_rss
+
+        # first sample has no previous reference for CPU ticks
+        cpu = samples["cpu"][1:] or [0.0]
+        summary = {
+            "cores": cores,
+            "avg_cpu": round(mean(cpu), 2),
+            "max_cpu": max(cpu),
+            "cpu_efficiency": round(100 * mean(cpu) / cores, 1) if cores else 0.0,
+            "peak_rss": round(max([peak_rss / MB] + samples["rss"]), 1),
+            "max_threads": max(samples["threads"], default=0),
+            "read_bytes": max(samples["read_bytes"], default=0),
+            "write_bytes": max(samples["write_bytes"], default=0),
+        }
+        return {"interval": self.interval, "samples": samples, "summary": summary}
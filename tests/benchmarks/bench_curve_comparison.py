@@ -0,0 +1,72 @@
+"""Micro-benchmark of the curve comparison against the point by point loop it replaced.
+
+Run from the repository root::
+
+    python -m tests.benchmarks.bench_curve_comparison --curves=2000 --points=2000
+
+"""
+import argparse
+import random
+import time
+from array import array
+from statistics import mean
+
+from aedttest.curve_comparison import compare_curve
+
+
+def loop_compare_curve(y_ref_data, y_data):
+    """Point by point comparison as it was done in ``extract_curve_data()``."""
+    max_delta = 0
+    difference = []
+    for ref, actual in zip(y_ref_data, y_data):
+        difference.append(ref - actual)
+        # avoid division by zero by using small tolerance of 1e-20
+        max_delta = max(max_delta, abs(1 - ref / (actual or 1e-20)))
+
+    max_delta_perc = round(max_delta * 100, 3)
+    mean_curve_data = mean(y_data)
+    avg_perc = round(abs(1 - mean(y_ref_data) / (mean_curve_data or 1e-20)), 3)
+    return difference, max_delta_perc, avg_perc
+
+
+def generate_curves(curves, points, seed=0):
+    """Pairs of reference and current curves, current values deviate by up to 1 % and have some zeros."""
+    rng = random.Random(seed)
+    pairs = []
+    for _ in range(curves):
+        reference = [rng.uniform(-50, 0) for _ in range(points)]
+        current = [value * rng.uniform(0.99, 1.01) if rng.random() > 0.01 else 0.0 for value in reference]
+        pairs.append((reference, current))
+    return pairs
+
+
+def measure(compare, pairs):
+    start = time.perf_counter()
+    for reference, current in pairs:
+        compare(reference, current)
+    return time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare curve comparison with the point by point loop")
+    parser.add_argument("--curves", type=int, default=2000, help="Number of curves (default: 2000)")
+    parser.add_argument("--points", type=int, default=2000, help="Points per curve (default: 2000)")
+    parser.add_argument("--repeat", type=int, default=3, help="Best of number of runs (default: 3)")
+    args = parser.parse_args(argv)
+
+    pairs = generate_curves(args.curves, args.points)
+    # binary references hold memory-mapped float64 arrays
+    array_pairs = [(memoryview(array("d", reference)), current) for reference, current in pairs]
+
+    loop_time = min(measure(loop_compare_curve, pairs) for _ in range(args.repeat))
+    vector_time = min(measure(compare_curve, pairs) for _ in range(args.repeat))
+    array_time = min(measure(compare_curve, array_pairs) for _ in range(args.repeat))
+
+    print(f"{args.curves} curves x {args.points} points, best of {args.repeat}")
+    print(f"point by point loop:      {loop_time:8.3f} s")
+    print(f"compare_curve (lists):    {vector_time:8.3f} s  x{loop_time / vector_time:.1f}")
+    print(f"compare_curve (float64):  {array_time:8.3f} s  x{loop_time / array_time:.1f}")
+
+
+if __name__ == "__main__":
+    main()
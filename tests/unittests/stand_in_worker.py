@@ -0,0 +1,51 @@
+"""Stand-in for an Electronics Desktop session, runs worker loop of ``simulation_data`` without AEDT.
+
+Usage::
+
+    python stand_in_worker.py <worker_dir>
+
+Projects have no designs, thus results contain only the error. Project named ``crash`` terminates
+the session and project named ``hang`` never finishes.
+
+"""
+import os
+import sys
+import time
+
+WORKER_DIR = sys.argv[1]
+# simulation_data parses command line when imported
+sys.argv = sys.argv[:1]
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from aedttest import simulation_data  # noqa: E402
+
+
+class StandInAedt:
+    def __init__(self):
+        self.projects = {}
+
+    def OpenProject(self, project_path):
+        project_name = os.path.splitext(os.path.basename(project_path))[0]
+        if project_name == "crash":
+            os._exit(1)
+        if project_name == "hang":
+            time.sleep(3600)
+        self.projects[project_name] = os.path.dirname(project_path)
+
+    def CloseProject(self, project_name):
+        self.projects.pop(project_name)
+
+
+class StandInDesktop:
+    def __init__(self):
+        self.odesktop = StandInAedt()
+
+    def project_path(self, project_name):
+        return self.odesktop.projects[project_name]
+
+    def design_list(self, project=None):
+        return []
+
+
+if __name__ == "__main__":
+    simulation_data.run_worker(StandInDesktop(), WORKER_DIR, poll_interval=0.05)
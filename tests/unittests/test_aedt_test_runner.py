@@ -1,4 +1,14 @@
+import asyncio
+import json
+import math
 import os
+import shutil
+import subprocess
+import sys
+import time
+from array import array
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from io import StringIO
 from pathlib import Path
 from tempfile import TemporaryDirectory
@@ -8,8 +18,29 @@ import pytest
 
 from aedttest import aedt_test_runner
 from aedttest.aedt_test_runner import LOGFOLDER_PATH
+from aedttest.clusters.job_hosts import parse_custom_input
+from aedttest.result_cache import ResultCache
+from aedttest.scratch import NodeScratch
+from aedttest.staging import StagingCache
+from aedttest.telemetry import METRICS
 
 TESTS_DIR = Path(__file__).resolve().parent.parent
+STAND_IN_WORKER = Path(__file__).resolve().parent / "stand_in_worker.py"
+
+
+async def collect(async_iterator):
+    return [item async for item in async_iterator]
+
+
+class FakeProcess:
+    def __init__(self, returncode=0, output=b"output"):
+        self.returncode = returncode
+        self.stdout = asyncio.StreamReader()
+        self.stdout.feed_data(output)
+        self.stdout.feed_eof()
+
+    async def wait(self):
+        return self.returncode
 
 
 def test_allocate_task_multiple():
@@ -83,6 +114,139 @@ def test_allocate_task_within_node():
     assert allocated_machines == {"host1": {"cores": 2, "tasks": 1}}
 
 
+def test_allocate_task_within_node_placement():
+    default = {"single_node": False, "parametric_tasks": 1, "cores": 16}
+    machines_dict = {"host1": 64, "host2": 16, "host3": 32}
+
+    allocated_machines = aedt_test_runner.allocate_task_within_node(default, machines_dict, "first-fit")
+    assert allocated_machines == {"host1": {"cores": 16, "tasks": 1}}
+
+    allocated_machines = aedt_test_runner.allocate_task_within_node(default, machines_dict, "best-fit")
+    assert allocated_machines == {"host2": {"cores": 16, "tasks": 1}}
+
+    allocated_machines = aedt_test_runner.allocate_task_within_node(default, machines_dict, "worst-fit")
+    assert allocated_machines == {"host1": {"cores": 16, "tasks": 1}}
+
+    allocated_machines = aedt_test_runner.allocate_task_within_node(default, machines_dict, "min-fragmentation")
+    assert allocated_machines == {"host2": {"cores": 16, "tasks": 1}}
+
+    allocated_machines = aedt_test_runner.allocate_task_within_node(
+        dict(default, cores=24), {"host1": 64, "host2": 30, "host3": 32}, "min-fragmentation"
+    )
+    assert allocated_machines == {"host2": {"cores": 24, "tasks": 1}}
+
+
+def test_allocate_task_placement():
+    default = {"single_node": False, "parametric_tasks": 1, "auto": True, "cores": 40}
+    machines_dict = {"host1": 16, "host2": 64, "host3": 32}
+
+    allocated_machines = aedt_test_runner.allocate_task(default, machines_dict, "best-fit")
+    assert allocated_machines == {"host1": {"cores": 16, "tasks": 1}, "host3": {"cores": 24, "tasks": 1}}
+
+    allocated_machines = aedt_test_runner.allocate_task(default, machines_dict, "worst-fit")
+    assert allocated_machines == {"host2": {"cores": 40, "tasks": 1}}
+
+    machines_dict = {"host1": 16, "host2": 30, "host3": 32}
+    allocated_machines = aedt_test_runner.allocate_task(default, machines_dict, "min-fragmentation")
+    assert allocated_machines == {"host3": {"cores": 32, "tasks": 1}, "host1": {"cores": 8, "tasks": 1}}
+
+    with pytest.raises(ValueError) as exc:
+        aedt_test_runner.allocate_task(default, machines_dict, "random")
+    assert "Unknown placement strategy: random" in str(exc.value)
+
+
+def test_fragmentation():
+    assert aedt_test_runner.fragmentation({"host1": 0, "host2": 0}) == 0
+    assert aedt_test_runner.fragmentation({"host1": 32, "host2": 0}) == 0
+    assert aedt_test_runner.fragmentation({"host1": 16, "host2": 16}) == 0.5
+
+
+def test_reserve_resources():
+    distribution = {"single_node": True, "parametric_tasks": 1, "cores": 16}
+    running = [
+        (30, {"host1": {"cores": 8, "tasks": 1}}),
+        (None, {"host2": {"cores": 16, "tasks": 1}}),
+        (10, {"host1": {"cores": 4, "tasks": 1}}),
+    ]
+    reserved_time, extra_machines, extra_cores = aedt_test_runner.reserve_resources(
+        distribution, {"host1": 4, "host2": 0}, running
+    )
+    assert reserved_time == 30
+    assert extra_machines == {"host1": 0, "host2": 0}
+    assert extra_cores == math.inf
+
+    reserved_time, extra_machines, extra_cores = aedt_test_runner.reserve_resources(
+        dict(distribution, cores=20), {"host1": 4, "host2": 8}, running
+    )
+    assert reserved_time == math.inf
+    assert extra_machines == {"host1": 16, "host2": 4}
+
+    # global limit of cores is reached only after the second task ends
+    reserved_time, extra_machines, extra_cores = aedt_test_runner.reserve_resources(
+        dict(distribution, cores=8), {"host1": 4, "host2": 16}, running[:2], cores_left=0
+    )
+    assert reserved_time == 30
+    assert extra_cores == 0
+
+    assert aedt_test_runner.reserve_resources(dict(distribution, cores=40), {"host1": 4}, running[:1]) is None
+
+
+def test_find_backfill_allocation():
+    def config(cores):
+        return {"distribution": {"single_node": True, "parametric_tasks": 1, "cores": cores}}
+
+    project_tests_config = {"big": config(16), "long": config(8), "short": config(8), "tiny": config(2)}
+    running = [(15, {"host1": {"cores": 8, "tasks": 1}})]
+    estimates = {"long": 20, "short": 5}
+    queue = ["big", "long", "short"]
+
+    # head is blocked, long project would delay it, short finishes before reservation
+    allocation = aedt_test_runner.find_backfill_allocation(
+        queue, project_tests_config, {"host1": 8}, running, 10, estimates
+    )
+    assert allocation == ("short", {"host1": {"cores": 8, "tasks": 1}})
+
+    allocation = aedt_test_runner.find_backfill_allocation(
+        queue[:2], project_tests_config, {"host1": 8}, running, 10, estimates
+    )
+    assert allocation is None
+
+    # project without estimate may use only cores that stay free after head starts
+    allocation = aedt_test_runner.find_backfill_allocation(
+        ["big", "tiny"], project_tests_config, {"host1": 8, "host2": 2}, running, 10, estimates
+    )
+    assert allocation == ("tiny", {"host2": {"cores": 2, "tasks": 1}})
+
+    allocation = aedt_test_runner.find_backfill_allocation(
+        queue, project_tests_config, {"host1": 16}, [], 10, estimates
+    )
+    assert allocation == ("big", {"host1": {"cores": 16, "tasks": 1}})
+
+    # running task without estimate, reservation time is unknown and short project could delay head forever
+    unestimated = [(None, {"host1": {"cores": 8, "tasks": 1}})]
+    allocation = aedt_test_runner.find_backfill_allocation(
+        queue, project_tests_config, {"host1": 8}, unestimated, 10, estimates
+    )
+    assert allocation is None
+
+    allocation = aedt_test_runner.find_backfill_allocation(
+        ["big", "short", "tiny"], project_tests_config, {"host1": 8, "host2": 2}, unestimated, 10, estimates
+    )
+    assert allocation == ("tiny", {"host2": {"cores": 2, "tasks": 1}})
+
+
+def test_find_allocation_cores_left():
+    def config(cores):
+        return {"distribution": {"single_node": True, "parametric_tasks": 1, "cores": cores}}
+
+    project_tests_config = {"a": config(16), "b": config(8)}
+    allocation = aedt_test_runner.find_allocation(["a", "b"], project_tests_config, {"host1": 32}, cores_left=10)
+    assert allocation == ("b", {"host1": {"cores": 8, "tasks": 1}})
+
+    allocation = aedt_test_runner.find_allocation(["a", "b"], project_tests_config, {"host1": 32}, cores_left=4)
+    assert allocation is None
+
+
 def test_allocator():
     aedt_tester = aedt_test_runner.ElectronicsDesktopTester(
         version="212",
@@ -96,7 +260,7 @@ def test_allocator():
     )
     job_machines = aedt_test_runner.get_job_machines("host1:28,host2:28,host3:28")
     aedt_tester.machines_dict = {machine.hostname: machine.cores for machine in job_machines}
-    allocated = [(project_name, allocated_machines) for project_name, allocated_machines in aedt_tester.allocator()]
+    allocated = asyncio.run(collect(aedt_tester.allocator()))
     assert ("just_winding", {"host1": {"cores": 28, "tasks": 1}}) == allocated.pop(0)
     assert ("expression_excitation", {"host2": {"cores": 20, "tasks": 1}}) == allocated.pop(0)
     assert ("19", {"host3": {"cores": 12, "tasks": 6}}) == allocated.pop(0)
@@ -104,6 +268,273 @@ def test_allocator():
     assert ("2019R1", {"host2": {"cores": 4, "tasks": 2}}) == allocated.pop(0)
 
 
+def test_allocator_wakes_up_on_release():
+    aedt_tester = aedt_test_runner.ElectronicsDesktopTester(
+        version="212",
+        max_cores=9999,
+        max_parallel_projects=9999,
+        config_folder=TESTS_DIR / "input" / "configs",
+        out_dir=None,
+        save_projects=None,
+        only_reference=True,
+        reference_folder=None,
+    )
+    aedt_tester.machines_dict = {"host1": 28}
+
+    async def run_allocator():
+        allocator = aedt_tester.allocator()
+        project_name, allocated_machines = await allocator.__anext__()
+        assert ("just_winding", {"host1": {"cores": 28, "tasks": 1}}) == (project_name, allocated_machines)
+
+        def finish_task():
+            aedt_tester.ledger.release_cores(allocated_machines)
+            aedt_tester.ledger.finish_task()
+
+        asyncio.get_running_loop().call_later(0.2, finish_task)
+        start = time.monotonic()
+        project_name, _ = await allocator.__anext__()
+        assert project_name == "expression_excitation"
+        assert time.monotonic() - start < 2
+
+    asyncio.run(run_allocator())
+
+
+def test_allocator_waits_for_retry():
+    aedt_tester = aedt_test_runner.ElectronicsDesktopTester(
+        version="212",
+        max_cores=9999,
+        max_parallel_projects=9999,
+        config_folder=TESTS_DIR / "input" / "configs",
+        out_dir=None,
+        save_projects=None,
+        only_reference=True,
+        reference_folder=None,
+    )
+    aedt_tester.machines_dict = {"host1": 28, "host2": 28, "host3": 28, "host4": 12}
+
+    async def run_allocator():
+        allocated = {}
+        async for project_name, allocated_machines in aedt_tester.allocator():
+            if project_name in allocated:
+                return allocated_machines
+
+            allocated[project_name] = allocated_machines
+            if len(allocated) == len(aedt_tester.project_tests_config):
+                # imitate crash of the project
+                aedt_tester.pending_retries += 1
+                aedt_tester.attempts["19"] = [{"hosts": list(allocated["19"])}]
+                aedt_tester.ledger.release_cores(allocated["19"], "19")
+                aedt_tester.ledger.finish_task()
+                asyncio.get_running_loop().call_later(0.1, aedt_tester.requeue, "19")
+
+    assert asyncio.run(run_allocator()) == {"host4": {"cores": 12, "tasks": 6}}
+    assert aedt_tester.pending_retries == 0
+
+
+def test_avoid_failed_hosts():
+    aedt_tester = aedt_test_runner.ElectronicsDesktopTester(
+        version="212",
+        max_cores=9999,
+        max_parallel_projects=9999,
+        config_folder=TESTS_DIR / "input" / "configs",
+        out_dir=None,
+        save_projects=None,
+        only_reference=True,
+        reference_folder=None,
+    )
+    aedt_tester.machines_dict = {"host1": 28, "host2": 10}
+    allocated_machines = {"host1": {"cores": 4, "tasks": 2}}
+    assert aedt_tester.avoid_failed_hosts("2019R1", allocated_machines) == ("2019R1", allocated_machines)
+
+    aedt_tester.attempts["2019R1"] = [{"hosts": ["host1"]}]
+    assert aedt_tester.avoid_failed_hosts("2019R1", allocated_machines) == (
+        "2019R1",
+        {"host2": {"cores": 4, "tasks": 2}},
+    )
+
+    aedt_tester.machines_dict = {"host1": 28, "host2": 2}
+    assert aedt_tester.avoid_failed_hosts("2019R1", allocated_machines) == ("2019R1", allocated_machines)
+
+
+def test_prefer_scratch_hosts():
+    aedt_tester = aedt_test_runner.ElectronicsDesktopTester(
+        version="212",
+        max_cores=9999,
+        max_parallel_projects=9999,
+        config_folder=TESTS_DIR / "input" / "configs",
+        out_dir=None,
+        save_projects=None,
+        only_reference=True,
+        reference_folder=None,
+    )
+    aedt_tester.machines_dict = {"host1": 28, "host2": 10}
+    allocated_machines = {"host1": {"cores": 4, "tasks": 2}}
+    assert aedt_tester.prefer_scratch_hosts("2019R1", allocated_machines) == ("2019R1", allocated_machines)
+
+    aedt_tester.scratch_hosts["2019R1"] = {"host2"}
+    assert aedt_tester.prefer_scratch_hosts("2019R1", allocated_machines) == (
+        "2019R1",
+        {"host2": {"cores": 4, "tasks": 2}},
+    )
+
+    aedt_tester.machines_dict = {"host1": 28, "host2": 2}
+    assert aedt_tester.prefer_scratch_hosts("2019R1", allocated_machines) == ("2019R1", allocated_machines)
+
+
+def test_allocator_not_enough_resources():
+    aedt_tester = aedt_test_runner.ElectronicsDesktopTester(
+        version="212",
+        max_cores=9999,
+        max_parallel_projects=9999,
+        config_folder=TESTS_DIR / "input" / "configs",
+        out_dir=None,
+        save_projects=None,
+        only_reference=True,
+        reference_folder=None,
+    )
+    aedt_tester.machines_dict = {"host1": 2}
+    with pytest.raises(RuntimeError) as exc:
+        asyncio.run(collect(aedt_tester.allocator()))
+
+    assert "Not enough resources to run any of projects" in str(exc.value)
+
+
+def test_select_pooled_projects():
+    config = aedt_test_runner.read_configs(TESTS_DIR / "input" / "configs")
+
+    assert aedt_test_runner.select_pooled_projects(config, 28) == ["just_winding"]
+    assert aedt_test_runner.select_pooled_projects(config, 4) == []
+
+
+def test_group_batches():
+    distribution = {"cores": 1, "parametric_tasks": 1, "auto": True}
+    config = {
+        "proj1": {"batchable": True, "distribution": dict(distribution, timeout=60)},
+        "proj2": {"batchable": True, "distribution": distribution},
+        "proj3": {"batchable": True, "distribution": distribution},
+        "proj4": {"batchable": False, "distribution": distribution},
+        "proj5": {"batchable": True, "distribution": dict(distribution, cores=2)},
+        "proj6": {"batchable": True, "distribution": dict(distribution, cores=2)},
+        "proj7": {"batchable": True, "distribution": dict(distribution, cores=4)},
+    }
+
+    batches = aedt_test_runner.group_batches(config, list(config), batch_size=2)
+
+    assert batches == {"proj1": ["proj1", "proj2"], "proj5": ["proj5", "proj6"]}
+    assert aedt_test_runner.group_batches(config, list(config), batch_size=1) == {}
+
+
+@mock.patch("aedttest.aedt_test_runner.SessionPool")
+def test_start_session_pool(pool_mock):
+    aedt_tester = aedt_test_runner.ElectronicsDesktopTester(
+        version="212",
+        max_cores=9999,
+        max_parallel_projects=9999,
+        config_folder=TESTS_DIR / "input" / "configs",
+        out_dir=None,
+        save_projects=None,
+        only_reference=True,
+        reference_folder=None,
+        session_pool=2,
+        session_cores=28,
+    )
+    aedt_tester.machines_dict = {"host1": 28, "host2": 28}
+
+    pool = aedt_tester.start_session_pool(Path("sessions"))
+
+    assert pool is pool_mock.return_value
+    assert aedt_tester.pooled == ["just_winding"]
+    # single pooled project needs only one session
+    assert aedt_tester.session_allocations == {"session_1": {"host1": {"cores": 28, "tasks": 1}}}
+    assert aedt_tester.machines_dict == {"host1": 0, "host2": 28}
+    assert len(pool_mock.call_args[0][1]) == 1
+    assert pool_mock.call_args[1] == {"max_restarts": aedt_tester.retries}
+    assert aedt_tester.pending_pooled == 1
+
+    # project restored from the result cache needs no session
+    aedt_tester.priority.remove("just_winding")
+    assert aedt_tester.start_session_pool(Path("sessions")) is None
+
+
+def test_resource_ledger():
+    ledger = aedt_test_runner.ResourceLedger({"host1": 10, "host2": 5})
+    allocated_machines = {"host1": {"cores": 4, "tasks": 1}, "host2": {"cores": 5, "tasks": 1}}
+
+    ledger.acquire(allocated_machines, "proj", 100)
+    assert ledger.machines_dict == {"host1": 6, "host2": 0}
+    assert ledger.active_tasks == 1
+    assert ledger.running_tasks() == [(100, allocated_machines)]
+
+    ledger.release_cores(allocated_machines, "proj")
+    assert ledger.machines_dict == {"host1": 10, "host2": 5}
+    assert ledger.active_tasks == 1
+    assert ledger.running_tasks() == []
+
+    ledger.finish_task()
+    assert ledger.active_tasks == 0
+
+
+def test_resource_ledger_budget():
+    ledger = aedt_test_runner.ResourceLedger({"host1": 10, "host2": 5}, max_cores=12)
+    allocated_machines = {"host1": {"cores": 4, "tasks": 1}, "host2": {"cores": 5, "tasks": 1}}
+
+    ledger.acquire(allocated_machines, "proj")
+    assert ledger.cores_left() == 3
+    assert ledger.budget_usage() == {"in_use": 9, "peak": 9, "limit": 12}
+
+    ledger.release_cores(allocated_machines, "proj")
+    assert ledger.cores_left() == 12
+    assert ledger.budget_usage() == {"in_use": 0, "peak": 9, "limit": 12}
+
+    assert aedt_test_runner.ResourceLedger({"host1": 10}).budget_usage()["limit"] == 10
+
+
+def test_prioritize_projects():
+    config = {
+        "a": {"distribution": {"cores": 4}},
+        "b": {"distribution": {"cores": 8}},
+        "c": {"distribution": {"cores": 2}},
+        "d": {"distribution": {"cores": 1}},
+    }
+    assert aedt_test_runner.prioritize_projects(config) == ["b", "a", "c", "d"]
+    assert aedt_test_runner.prioritize_projects(config, {"c": 100, "d": 200}) == ["d", "c", "b", "a"]
+
+
+def test_estimate_runtime():
+    project_data = {
+        "designs": {
+            "design1": {"simulation_time": {"nominal": {"Setup1": "00:01:00", "Setup2": "1:00:05"}}},
+            "design2": {"simulation_time": {"x=1": {"Setup1": "00:00:15"}, "x=2": {"Setup1": None}}},
+            "design3": {"report": {}},
+        }
+    }
+    assert aedt_test_runner.estimate_runtime(project_data) == 3680
+    assert aedt_test_runner.estimate_runtime(project_data, parametric_tasks=2) == 1840
+    assert aedt_test_runner.estimate_runtime({"designs": {"design3": {"report": {}}}}) is None
+
+
+def test_runtime_history():
+    config = {
+        "a": {"distribution": {"parametric_tasks": 1}},
+        "b": {"distribution": {"parametric_tasks": 1}},
+        "c": {"distribution": {"parametric_tasks": 1}},
+    }
+    reference_data = {
+        "a": {"designs": {"d": {"simulation_time": {"nominal": {"Setup1": "00:00:10"}}}}},
+        "b": {"designs": {"d": {"simulation_time": {"nominal": {"Setup1": "00:00:10"}}}}},
+    }
+    with TemporaryDirectory() as tmp_dir:
+        history_file = Path(tmp_dir) / "history.json"
+        assert aedt_test_runner.read_runtime_history(history_file) == {}
+
+        aedt_test_runner.write_runtime_history(history_file, {"b": 42.123})
+        aedt_test_runner.write_runtime_history(history_file, {"c": 1})
+        history = aedt_test_runner.read_runtime_history(history_file)
+        assert history == {"b": 42.1, "c": 1}
+
+    assert aedt_test_runner.estimate_runtimes(config, reference_data, history) == {"a": 10, "b": 42.1, "c": 1}
+
+
 class TestCopyPathTo:
     def test_copy_path_file_absolute(self):
         with TemporaryDirectory(prefix="src_") as src_tmp_dir:
@@ -168,6 +599,19 @@ class TestCopyPathTo:
                 assert (Path(dst_tmp_dir) / file).exists()
                 assert (Path(dst_tmp_dir) / file2).exists()
 
+    def test_copy_path_folder_staging(self):
+        with TemporaryDirectory(prefix="src_") as src_tmp_dir:
+            folder = Path(src_tmp_dir, "tmp_folder")
+            folder.mkdir()
+            file = folder / "tmp_file.txt"
+            file.touch()
+            cache = StagingCache(Path(src_tmp_dir, "cache"))
+            with TemporaryDirectory(prefix="dst_") as dst_tmp_dir:
+                copied = aedt_test_runner.copy_path_to(str(folder), dst_tmp_dir, cache, link=True)
+
+                assert copied == [str(Path(dst_tmp_dir, "tmp_folder", file.name))]
+                assert cache.stats["misses"] == 1
+
     def test_no_source(self):
         with pytest.raises(FileExistsError):
             aedt_test_runner.copy_path_to("/no/path/exists", "/tmp")
@@ -196,13 +640,28 @@ def test_get_aedt_executable_path():
         assert "Environment variable ANSYSEM_ROOT212" in str(exc.value)
 
 
-@mock.patch("aedttest.aedt_test_runner.subprocess.check_output", wraps=lambda *a, **kw: b"output")
+async def fake_subprocess(*args, **kwargs):
+    return FakeProcess()
+
+
+async def do_nothing(*args, **kwargs):
+    pass
+
+
+async def crashed_subprocess(*args, **kwargs):
+    raise subprocess.CalledProcessError(1, "ansysedt", "license error")
+
+
+async def timed_out_subprocess(*args, **kwargs):
+    raise subprocess.TimeoutExpired("ansysedt", kwargs["timeout"], "solving")
+
+
+@mock.patch("aedttest.aedt_test_runner.asyncio.create_subprocess_exec", wraps=fake_subprocess)
 @mock.patch("aedttest.aedt_test_runner.platform.system", return_value="Linux")
 @mock.patch("aedttest.aedt_test_runner.get_aedt_executable_path", return_value="aedt/install/path")
 @mock.patch("aedttest.aedt_test_runner.get_intel_mpi_path", return_value="aedt/install/path/mpiexec")
 def test_execute_aedt(mock_mpi_path, mock_aedt_path, mock_platform, mock_call):
-
-    aedt_test_runner.execute_aedt(
+    execute = aedt_test_runner.execute_aedt(
         version="212",
         machines={"host1": {"cores": 10, "tasks": 2}, "host2": {"cores": 15, "tasks": 3}},
         distribution_config={
@@ -217,10 +676,11 @@ def test_execute_aedt(mock_mpi_path, mock_aedt_path, mock_platform, mock_call):
         script_args="arg1",
         project_path="custom/pr.aedt",
     )
+    asyncio.run(execute)
 
     assert mock_aedt_path.call_args[0][0] == "212"
 
-    assert mock_call.call_args[0][0] == [
+    assert list(mock_call.call_args[0]) == [
         "aedt/install/path/mpiexec",
         "-envall",
         "-n",
@@ -246,8 +706,157 @@ def test_execute_aedt(mock_mpi_path, mock_aedt_path, mock_platform, mock_call):
     ]
 
 
+@mock.patch("aedttest.aedt_test_runner.platform.system", return_value="Windows")
+@mock.patch("aedttest.aedt_test_runner.get_aedt_executable_path", return_value="aedt/install/path")
+def test_execute_aedt_failure(mock_aedt_path, mock_platform):
+    async def failed_subprocess(*args, **kwargs):
+        return FakeProcess(returncode=1, output=b"start\nlicense error\r\n")
+
+    with mock.patch("aedttest.aedt_test_runner.asyncio.create_subprocess_exec", wraps=failed_subprocess):
+        with pytest.raises(subprocess.CalledProcessError) as exc:
+            asyncio.run(
+                aedt_test_runner.execute_aedt(
+                    version="212",
+                    machines={"host1": {"cores": 2, "tasks": 1}},
+                    distribution_config={"cores": 2, "auto": True, "parametric_tasks": 1},
+                )
+            )
+
+    assert exc.value.returncode == 1
+    assert exc.value.output == "start\nlicense error"
+
+
+def test_execute_aedt_dry_run():
+    launcher = aedt_test_runner.create_launcher("dry-run", "212", durations={"proj": 0.1})
+    start = time.monotonic()
+    with TemporaryDirectory() as tmp_dir:
+        output_log = Path(tmp_dir) / "proj_stdout.log"
+        asyncio.run(
+            aedt_test_runner.execute_aedt(
+                version="212",
+                machines={"host1": {"cores": 2, "tasks": 1}},
+                distribution_config={"cores": 2, "auto": True, "parametric_tasks": 1},
+                output_log=output_log,
+                launcher=launcher,
+                task_name="proj",
+            )
+        )
+        assert output_log.exists()
+
+    assert time.monotonic() - start >= 0.1
+
+
+def test_create_launcher():
+    with pytest.raises(ValueError) as exc:
+        aedt_test_runner.create_launcher("submit", "212")
+    assert "submit launcher requires --submit-command" in str(exc.value)
+
+    with mock.patch("aedttest.aedt_test_runner.platform.system", return_value="Windows"):
+        launcher = aedt_test_runner.create_launcher("submit", "212", submit_command="qsub -sync y {script}")
+    assert type(launcher.inner) is aedt_test_runner.LocalLauncher
+
+
+def test_stream_output():
+    async def stream(tail_lines):
+        reader = asyncio.StreamReader()
+        reader.feed_data(b"".join(f"line {i}\n".encode() for i in range(1000)))
+        reader.feed_data(b"x" * (3 * aedt_test_runner.OUTPUT_CHUNK_SIZE))
+        reader.feed_eof()
+        tail = deque(maxlen=tail_lines)
+        await aedt_test_runner.stream_output(reader, Path(tmp_dir) / "out.log", tail)
+        return aedt_test_runner.decode_tail(tail)
+
+    with TemporaryDirectory() as tmp_dir:
+        tail = asyncio.run(stream(tail_lines=3))
+
+        assert tail == "line 998\nline 999\n" + "x" * aedt_test_runner.OUTPUT_CHUNK_SIZE
+        log_content = (Path(tmp_dir) / "out.log").read_bytes()
+        assert log_content.startswith(b"line 0\nline 1\n")
+        assert len(log_content) == sum(len(f"line {i}\n") for i in range(1000)) + 3 * aedt_test_runner.OUTPUT_CHUNK_SIZE
+
+
+def process_is_dead(pid):
+    try:
+        with open(f"/proc/{pid}/stat") as file:
+            # zombie processes are already dead but not collected by the parent
+            return file.read().rsplit(")", 1)[1].split()[0] == "Z"
+    except FileNotFoundError:
+        return True
+
+
+@pytest.mark.skipif(sys.platform != "linux", reason="process tree is checked via /proc")
+def test_run_process_timeout():
+    # parent process prints PID of its child and both sleep, imitates mpiexec that starts AEDT
+    script = (
+        "import subprocess, sys, time;"
+        "child = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(60)']);"
+        "print(child.pid, flush=True);"
+        "time.sleep(60)"
+    )
+    with TemporaryDirectory() as tmp_dir:
+        output_log = Path(tmp_dir) / "out.log"
+        start = time.monotonic()
+        with pytest.raises(subprocess.TimeoutExpired) as exc:
+            asyncio.run(aedt_test_runner.run_process([sys.executable, "-c", script], output_log, timeout=1))
+
+        assert time.monotonic() - start < 10
+        child_pid = int(output_log.read_text().splitlines()[-1])
+        assert exc.value.output == str(child_pid)
+
+    for _ in range(50):
+        if process_is_dead(child_pid):
+            break
+        time.sleep(0.1)
+    assert process_is_dead(child_pid)
+
+
+def test_run_process_stop_command():
+    # imitates "sbatch --wait" that prints the job ID and blocks
+    script = "import time; print('Submitted batch job 4242', flush=True); time.sleep(60)"
+    with TemporaryDirectory() as tmp_dir:
+        cancelled = Path(tmp_dir) / "cancelled"
+        cancel_script = f"import sys; open({str(cancelled)!r}, 'w').write(sys.argv[1])"
+        launcher = aedt_test_runner.SubmitLauncher(
+            "sbatch --wait {script}", Path(tmp_dir), cancel_command=f"{sys.executable} -c {cancel_script!r} {{job}}"
+        )
+
+        with pytest.raises(subprocess.TimeoutExpired):
+            asyncio.run(
+                aedt_test_runner.run_process(
+                    [sys.executable, "-c", script], timeout=1, stop_command=launcher.stop_command
+                )
+            )
+        assert cancelled.read_text() == "4242"
+
+
+def test_run_process_appends_output():
+    with TemporaryDirectory() as tmp_dir:
+        output_log = Path(tmp_dir) / "proj_stdout.log"
+        for attempt in (1, 2):
+            command = [sys.executable, "-c", f"print('attempt {attempt}')"]
+            asyncio.run(aedt_test_runner.run_process(command, output_log))
+
+        lines = output_log.read_text().splitlines()
+        # output of the first attempt is kept, every attempt starts with a separator
+        assert lines[1::2] == ["attempt 1", "attempt 2"]
+        assert all(line.startswith("=====") and line.endswith("=====") for line in lines[::2])
+
+
+def test_run_process_failure():
+    command = [sys.executable, "-c", "import sys; print('solving'); sys.exit(3)"]
+    with pytest.raises(subprocess.CalledProcessError) as exc:
+        asyncio.run(aedt_test_runner.run_process(command, timeout=30))
+
+    assert exc.value.returncode == 3
+    assert exc.value.output == "solving"
+
+
 class BaseElectronicsDesktopTester:
     def setup(self):
+        # index of the references is written into the reference folder, fixture is not modified
+        self.reference_dir = TemporaryDirectory()
+        reference_folder = Path(self.reference_dir.name) / "reference_simple"
+        shutil.copytree(TESTS_DIR / "input" / "reference_simple", reference_folder)
         self.aedt_tester = aedt_test_runner.ElectronicsDesktopTester(
             version="212",
             max_cores=9999,
@@ -256,9 +865,12 @@ class BaseElectronicsDesktopTester:
             out_dir=None,
             save_projects=None,
             only_reference=None,
-            reference_folder=TESTS_DIR / "input" / "reference_simple",
+            reference_folder=reference_folder,
         )
 
+    def teardown(self):
+        self.reference_dir.cleanup()
+
 
 class TestValidateConfig(BaseElectronicsDesktopTester):
     def test_missing_in_config(self):
@@ -300,6 +912,20 @@ class TestValidateConfig(BaseElectronicsDesktopTester):
             self.aedt_tester.validate_config()
         assert "'parametric_tasks' key must be >= 1" in str(exc.value)
 
+    def test_timeout(self):
+        distribution_config = self.aedt_tester.project_tests_config["just_winding"]["distribution"]
+        for timeout in (0, -5, "1h", True):
+            distribution_config["timeout"] = timeout
+            with pytest.raises(KeyError) as exc:
+                self.aedt_tester.validate_config()
+            assert "'timeout' key must be a positive number of seconds" in str(exc.value)
+
+    def test_batchable(self):
+        self.aedt_tester.project_tests_config["just_winding"]["batchable"] = "yes"
+        with pytest.raises(KeyError) as exc:
+            self.aedt_tester.validate_config()
+        assert "'batchable' key must be true or false" in str(exc.value)
+
 
 class TestElectronicsDesktopTester(BaseElectronicsDesktopTester):
     def test_validate_hardware(self):
@@ -309,14 +935,44 @@ class TestElectronicsDesktopTester(BaseElectronicsDesktopTester):
 
         assert "just_winding requires 2 cores. Not enough resources to run" in str(exc.value)
 
+    def test_validate_hardware_max_cores(self):
+        self.aedt_tester.machines_dict = {"host1": 10}
+        self.aedt_tester.max_cores = 1
+        with pytest.raises(ValueError) as exc:
+            self.aedt_tester.validate_hardware()
+
+        assert "just_winding requires 2 cores. Limit set by --max-cores is 1" in str(exc.value)
+
+    @mock.patch("aedttest.aedt_test_runner.get_job_machines")
+    def test_max_cores_per_host(self, mock_machines):
+        mock_machines.return_value = parse_custom_input("host1:28,host2:8")
+        aedt_tester = aedt_test_runner.ElectronicsDesktopTester(
+            version="212",
+            max_cores=9999,
+            max_parallel_projects=9999,
+            config_folder=TESTS_DIR / "input" / "config_simple",
+            out_dir=None,
+            save_projects=None,
+            only_reference=True,
+            reference_folder=None,
+            max_cores_per_host=16,
+        )
+        assert aedt_tester.machines_dict == {"host1": 16, "host2": 8}
+
     @mock.patch("aedttest.aedt_test_runner.time_now", wraps=lambda *a, **kw: "2021-12-31 20:16:04")
     def test_initialize_results(self, time_mock):
         with TemporaryDirectory() as tmp_dir:
-            self.aedt_tester.results_path = Path(tmp_dir)
-            self.aedt_tester.reference_folder = Path(tmp_dir) / "1"
+            self.aedt_tester.out_dir = Path(tmp_dir)
+            self.aedt_tester.results_path = Path(tmp_dir) / "results"
+            self.aedt_tester.reference_folder = self.aedt_tester.results_path / "1"
             self.aedt_tester.reference_profiles = self.aedt_tester.reference_folder / "profiles"
             self.aedt_tester.initialize_results()
 
+            style = self.aedt_tester.results_path / "css" / "style.css"
+            (shared_dir,) = (Path(tmp_dir) / aedt_test_runner.ASSETS_FOLDER).iterdir()
+            assert style.stat().st_ino == (shared_dir / "css" / "style.css").stat().st_ino
+            assert (self.aedt_tester.results_path / "js" / "main.js").is_file()
+
             assert self.aedt_tester.report_data == {
                 "all_delta": 1,
                 "projects": {
@@ -331,20 +987,199 @@ class TestElectronicsDesktopTester(BaseElectronicsDesktopTester):
                 },
             }
 
+    def test_link_reference_artifacts(self):
+        with TemporaryDirectory() as tmp_dir:
+            reference_profile = Path(tmp_dir) / "reference" / "just_winding" / "prof" / "a.prof"
+            reference_profile.parent.mkdir(parents=True)
+            reference_profile.write_text("profile")
+            self.aedt_tester.reference_data = {"just_winding": {"filepath": Path(tmp_dir) / "reference"}}
+            self.aedt_tester.reference_folder = Path(tmp_dir) / "results" / "reference_folder"
+
+            self.aedt_tester.link_reference_artifacts("just_winding")
+
+            linked = self.aedt_tester.reference_folder / "just_winding" / "prof" / "a.prof"
+            assert linked.read_text() == "profile"
+
+    def test_check_results_from_checkpoint(self):
+        self.aedt_tester.only_reference = True
+        with TemporaryDirectory() as tmp_dir:
+            report_file = Path(tmp_dir) / "proj.json"
+            errors = []
+            assert self.aedt_tester.check_all_results_present(errors, report_file, "proj") == {"error_exception": []}
+            assert errors == ["Project report for proj does not exist"]
+
+            with open(Path(tmp_dir) / f"proj{aedt_test_runner.CHECKPOINT_SUFFIX}", "w") as file:
+                design_data = {"report": {}, "mesh": {}, "simulation_time": {}}
+                file.write(json.dumps({"design": "d1", "data": design_data, "errors": ["d1 has no report"]}))
+                file.write('\n{"design": "d2",')
+
+            errors = []
+            project_data = self.aedt_tester.check_all_results_present(errors, report_file, "proj")
+            assert errors == []
+            assert project_data == {
+                "error_exception": [
+                    "Project report for proj is incomplete, designs were restored from checkpoint",
+                    "d1 has no report",
+                ],
+                "designs": {"d1": design_data},
+            }
+
+            # partial results are shown, but do not become a reference
+            self.aedt_tester.reference_folder = Path(tmp_dir) / "reference_folder"
+            self.aedt_tester.reference_folder.mkdir()
+            project_report = self.aedt_tester.prepare_project_report("proj", str(Path(tmp_dir) / "proj.aedt"))
+            assert (
+                project_report["error_exception"][-1] == "Results of proj are incomplete, reference file is not written"
+            )
+            assert list(self.aedt_tester.reference_folder.iterdir()) == []
+
+    def test_check_results_from_checkpoint_reference(self):
+        self.aedt_tester.only_reference = False
+        self.aedt_tester.reference_data = {
+            "proj": {"designs": {"d1": {"report": {"r1": {}}}, "d2": {"report": {}}, "d3": {"report": {}}}}
+        }
+        with TemporaryDirectory() as tmp_dir:
+            report_file = Path(tmp_dir) / "proj.json"
+            with open(Path(tmp_dir) / f"proj{aedt_test_runner.CHECKPOINT_SUFFIX}", "w") as file:
+                file.write(json.dumps({"design": "d1", "data": {"report": {}}, "errors": []}))
+
+            errors = []
+            project_data = self.aedt_tester.check_all_results_present(errors, report_file, "proj")
+            # restored design is compared, missing designs do not stop the comparison
+            assert errors == ["Key 'd1->report->r1' does not exist in current results"]
+            assert project_data["error_exception"] == [
+                "Project report for proj is incomplete, designs were restored from checkpoint",
+                "Design d2 is missing, it was not extracted before the crash",
+                "Design d3 is missing, it was not extracted before the crash",
+            ]
+
+    def test_extract_only(self):
+        aedt_tester = aedt_test_runner.ElectronicsDesktopTester(
+            version="212",
+            max_cores=9999,
+            max_parallel_projects=9999,
+            config_folder=TESTS_DIR / "input" / "config_simple",
+            out_dir=None,
+            save_projects=None,
+            only_reference=True,
+            reference_folder=None,
+            extract_only=True,
+        )
+
+        assert aedt_tester.project_tests_config["just_winding"]["distribution"] == {
+            "cores": 1,
+            "distribution_types": ["default"],
+            "parametric_tasks": 1,
+            "multilevel_distribution_tasks": 0,
+            "single_node": True,
+            "auto": True,
+        }
+        assert aedt_tester.script_args.endswith(" --extract-only")
+
+        with TemporaryDirectory(prefix="src_", dir=Path.cwd()) as src_tmp_dir:
+            project = Path(src_tmp_dir) / "proj.aedt"
+            project.write_text("project")
+            (Path(src_tmp_dir) / "proj.aedtresults" / "Setup1").mkdir(parents=True)
+            (Path(src_tmp_dir) / "proj.aedtresults" / "Setup1" / "solution.asol").write_text("solution")
+            with TemporaryDirectory(prefix="dst_") as dst_tmp_dir:
+                copied = aedt_test_runner.copy_proj({"path": str(project)}, dst_tmp_dir, results=True)
+
+                solution = Path(copied).parent / "proj.aedtresults" / "Setup1" / "solution.asol"
+                assert solution.read_text() == "solution"
+
+    def test_share_static_assets(self):
+        with TemporaryDirectory() as tmp_dir:
+            shared_dir = aedt_test_runner.share_static_assets(Path(tmp_dir))
+            assert (shared_dir / "css" / "style.css").is_file()
+
+            with mock.patch("aedttest.aedt_test_runner.file_transfer.copy_tree") as copy_mock:
+                assert aedt_test_runner.share_static_assets(Path(tmp_dir)) == shared_dir
+            copy_mock.assert_not_called()
+
+    @mock.patch("aedttest.aedt_test_runner.unique_id", return_value="a0")
+    def test_telemetry_summary_in_reference(self, mock_id):
+        self.aedt_tester.only_reference = True
+        summary = {"cores": 4, "cpu_efficiency": 87.5, "peak_rss": 20.0, "read_bytes": 1024, "write_bytes": 2048}
+        samples = {key: [] for key in ("time",) + METRICS}
+        self.aedt_tester.telemetry = {"proj": {"samples": samples, "summary": summary}}
+        with TemporaryDirectory() as tmp_dir:
+            (Path(tmp_dir) / "proj.json").write_text('{"error_exception": [], "designs": {}}')
+            self.aedt_tester.reference_folder = Path(tmp_dir)
+
+            project_report = self.aedt_tester.prepare_project_report("proj", str(Path(tmp_dir) / "proj.aedt"))
+
+            assert project_report["telemetry"] == summary
+            # samples are plotted in the report only
+            assert json.loads((Path(tmp_dir) / "ref_proj.json").read_text())["telemetry"] == summary
+
+    @mock.patch("aedttest.aedt_test_runner.unique_id", return_value="a0")
+    def test_extract_telemetry_data(self, mock_id):
+        telemetry = {
+            "interval": 5,
+            "samples": {
+                "time": [0, 5],
+                "cpu": [0.0, 3.5],
+                "rss": [10.0, 20.0],
+                "threads": [4, 8],
+                "read_bytes": [0, 2 * 1024 * 1024],
+                "write_bytes": [0, 1024 * 1024],
+            },
+            "summary": {"cores": 4, "avg_cpu": 3.5},
+        }
+        project_report = {"plots": []}
+        self.aedt_tester.extract_telemetry_data(telemetry, project_report)
+
+        assert project_report["telemetry"] == {"cores": 4, "avg_cpu": 3.5}
+        assert [plot["name"] for plot in project_report["plots"]] == [
+            "Resource usage:CPU utilization",
+            "Resource usage:Memory RSS",
+            "Resource usage:Threads",
+            "Resource usage:Disk read",
+            "Resource usage:Disk write",
+        ]
+        assert project_report["plots"][3]["x_axis"] == [0, 5]
+        assert project_report["plots"][3]["y_axis_now"] == [0, 2]
+        assert project_report["plots"][0]["y_label"] == '"[cores]"'
+
+    @mock.patch("aedttest.aedt_test_runner.unique_id", return_value="a0")
+    def test_extract_curve_data(self, mock_id):
+        trace = {"x_name": "Freq", "x_unit": "GHz", "y_unit": "dB"}
+        reference_curve = {"x_data": [1.0, 2.0, 3.0], "y_data": memoryview(array("d", [2.0, 4.0, 0.0]))}
+        self.aedt_tester.reference_data = {
+            "proj": {
+                "aedt_version": "221",
+                "designs": {"d1": {"report": {"S": {"dB": dict(trace, curves={"": reference_curve})}}}},
+            }
+        }
+        current_curve = {"x_data": [1.0, 2.0, 3.0], "y_data": [2.0, 5.0, 0.0]}
+        design_data = {"report": {"S": {"dB": dict(trace, curves={"": current_curve})}}}
+        project_report = {"plots": [], "error_exception": [], "slider_limit": 0, "max_avg": 0}
+
+        self.aedt_tester.extract_curve_data(design_data, "d1", "proj", project_report)
+
+        assert project_report["error_exception"] == []
+        plot = project_report["plots"][0]
+        assert plot["name"] == "d1:S:dB:"
+        assert plot["y_axis_ref"] == [2.0, 4.0, 0.0]
+        assert plot["diff"] == [0.0, -1.0, 0.0]
+        # zero in both curves is a full deviation, as in the point by point comparison
+        assert (plot["delta"], plot["avg"]) == (100.0, 0.143)
+        assert (project_report["slider_limit"], project_report["max_avg"]) == (101, 0)
+
     @mock.patch(
         "aedttest.aedt_test_runner.ElectronicsDesktopTester.prepare_project_report",
         wraps=lambda *a, **kw: {"error_exception": [], "slider_limit": 2, "max_avg": 3},
     )
     @mock.patch("aedttest.aedt_test_runner.ElectronicsDesktopTester.render_project_html", wraps=lambda *a, **kw: None)
     @mock.patch("aedttest.aedt_test_runner.ElectronicsDesktopTester.render_main_html", wraps=lambda *a, **kw: None)
-    @mock.patch("aedttest.aedt_test_runner.execute_aedt", wraps=lambda *a, **kw: None)
+    @mock.patch("aedttest.aedt_test_runner.execute_aedt", wraps=fake_subprocess)
     @mock.patch("aedttest.aedt_test_runner.time_now", wraps=lambda *a, **kw: "2021-12-31 20:16:04")
     def test_task_runner(self, time_mock, aedt_execute_mock, render_main_mock, render_project_mock, prep_proj_mock):
         self.aedt_tester.active_tasks = 5
         self.aedt_tester.machines_dict = {"my_host": 10}
         self.aedt_tester.report_data["projects"] = {"my_proj": {}}
 
-        self.aedt_tester.task_runner("my_proj", "my/path", {"distribution": None}, {"my_host": {"cores": 5}})
+        asyncio.run(self.aedt_tester.task_runner("my_proj", "my/path", {"distribution": {}}, {"my_host": {"cores": 5}}))
 
         assert self.aedt_tester.report_data == {
             "projects": {
@@ -361,6 +1196,395 @@ class TestElectronicsDesktopTester(BaseElectronicsDesktopTester):
         assert self.aedt_tester.machines_dict == {"my_host": 15}
         assert render_main_mock.call_count == 2
 
+    @mock.patch(
+        "aedttest.aedt_test_runner.ElectronicsDesktopTester.prepare_project_report",
+        wraps=lambda *a, **kw: {"error_exception": [], "slider_limit": 2, "max_avg": 3},
+    )
+    @mock.patch("aedttest.aedt_test_runner.ElectronicsDesktopTester.render_project_html", wraps=lambda *a, **kw: None)
+    @mock.patch("aedttest.aedt_test_runner.ElectronicsDesktopTester.render_main_html", wraps=lambda *a, **kw: None)
+    @mock.patch("aedttest.aedt_test_runner.execute_aedt", wraps=timed_out_subprocess)
+    def test_task_runner_timeout(self, aedt_execute_mock, render_main_mock, render_project_mock, prep_proj_mock):
+        self.aedt_tester.timeout = 100
+        self.aedt_tester.active_tasks = 1
+        self.aedt_tester.machines_dict = {"my_host": 10}
+        self.aedt_tester.report_data["projects"] = {"my_proj": {}}
+
+        asyncio.run(
+            self.aedt_tester.task_runner(
+                "my_proj", "my/path", {"distribution": {"timeout": 5}}, {"my_host": {"cores": 5}}
+            )
+        )
+
+        assert aedt_execute_mock.call_args[1]["timeout"] == 5
+        assert self.aedt_tester.report_data["projects"]["my_proj"]["status"] == "timeout"
+        errors = render_project_mock.call_args[0][1]["error_exception"]
+        assert errors == ["Electronics Desktop was killed after timeout of 5 s\nLast lines of output:\nsolving"]
+        assert self.aedt_tester.active_tasks == 0
+        assert self.aedt_tester.machines_dict == {"my_host": 15}
+
+    @mock.patch(
+        "aedttest.aedt_test_runner.ElectronicsDesktopTester.prepare_project_report",
+        wraps=lambda *a, **kw: {"error_exception": [], "slider_limit": 2, "max_avg": 3},
+    )
+    @mock.patch("aedttest.aedt_test_runner.ElectronicsDesktopTester.render_project_html", wraps=lambda *a, **kw: None)
+    @mock.patch("aedttest.aedt_test_runner.ElectronicsDesktopTester.render_main_html", wraps=lambda *a, **kw: None)
+    @mock.patch("aedttest.aedt_test_runner.execute_aedt", wraps=crashed_subprocess)
+    def test_task_runner_retry(self, aedt_execute_mock, render_main_mock, render_project_mock, prep_proj_mock):
+        self.aedt_tester.retries = 1
+        self.aedt_tester.retry_backoff = 0.05
+        self.aedt_tester.priority = ["other_proj", "my_proj"]
+        self.aedt_tester.queue = ["other_proj"]
+        self.aedt_tester.active_tasks = 1
+        self.aedt_tester.machines_dict = {"my_host": 10}
+        self.aedt_tester.report_data["projects"] = {"my_proj": {}}
+
+        async def run_task(delay):
+            await self.aedt_tester.task_runner("my_proj", "my/path", {"distribution": {}}, {"my_host": {"cores": 5}})
+            await asyncio.sleep(delay)
+
+        asyncio.run(run_task(delay=0.2))
+
+        assert self.aedt_tester.report_data["projects"]["my_proj"]["status"] == "retry"
+        assert self.aedt_tester.queue == ["other_proj", "my_proj"]
+        assert self.aedt_tester.pending_retries == 0
+        assert self.aedt_tester.active_tasks == 0
+        assert self.aedt_tester.machines_dict == {"my_host": 15}
+        assert [attempt["status"] for attempt in self.aedt_tester.attempts["my_proj"]] == ["crash"]
+        assert prep_proj_mock.call_count == 0
+
+        # second crash is final
+        self.aedt_tester.active_tasks = 1
+        asyncio.run(run_task(delay=0))
+
+        assert self.aedt_tester.report_data["projects"]["my_proj"]["status"] == "fail"
+        assert [attempt["status"] for attempt in self.aedt_tester.attempts["my_proj"]] == ["crash", "crash"]
+        assert self.aedt_tester.queue == ["other_proj", "my_proj"]
+        assert render_project_mock.call_args[0][1]["error_exception"][0].startswith("Electronics Desktop crashed")
+
+    @mock.patch(
+        "aedttest.aedt_test_runner.ElectronicsDesktopTester.prepare_project_report",
+        side_effect=ValueError("results file is not complete"),
+    )
+    @mock.patch("aedttest.aedt_test_runner.ElectronicsDesktopTester.render_main_html", wraps=lambda *a, **kw: None)
+    @mock.patch("aedttest.aedt_test_runner.execute_aedt", wraps=fake_subprocess)
+    def test_task_runner_report_error(self, aedt_execute_mock, render_main_mock, prep_proj_mock):
+        self.aedt_tester.active_tasks = 1
+        self.aedt_tester.machines_dict = {"my_host": 10}
+        self.aedt_tester.report_data["projects"] = {"my_proj": {}}
+
+        with pytest.raises(ValueError):
+            asyncio.run(
+                self.aedt_tester.task_runner("my_proj", "my/path", {"distribution": {}}, {"my_host": {"cores": 5}})
+            )
+
+        # task is finished and cores are returned even if the report fails
+        assert self.aedt_tester.active_tasks == 0
+        assert self.aedt_tester.machines_dict == {"my_host": 15}
+
+    def test_estimate_batch_runtimes(self):
+        self.aedt_tester.runtime_estimates = {"proj1": 10, "proj2": 20, "proj3": 30}
+        self.aedt_tester.task_durations = dict(self.aedt_tester.runtime_estimates)
+        self.aedt_tester.batches = {"proj1": ["proj1", "proj2"], "proj3": ["proj3", "proj4"]}
+        launcher = aedt_test_runner.create_launcher("dry-run", "212", durations=self.aedt_tester.task_durations)
+
+        self.aedt_tester.estimate_batch_runtimes()
+
+        assert self.aedt_tester.runtime_estimates == {"proj1": 30, "proj2": 20}
+        # dry run of a batch sleeps for the whole batch, retry of its lead only for the lead
+        assert launcher.command(["ansysedt"], {}, "batch_proj1")[-1] == "import time; time.sleep(30.0)"
+        assert launcher.command(["ansysedt"], {}, "proj1")[-1] == "import time; time.sleep(10.0)"
+        assert launcher.command(["ansysedt"], {}, "batch_proj3")[-1] == "import time; time.sleep(1.0)"
+
+    @mock.patch(
+        "aedttest.aedt_test_runner.ElectronicsDesktopTester.prepare_project_report",
+        wraps=lambda *a, **kw: {"error_exception": [], "slider_limit": 2, "max_avg": 3},
+    )
+    @mock.patch("aedttest.aedt_test_runner.ElectronicsDesktopTester.render_project_html", wraps=lambda *a, **kw: None)
+    @mock.patch("aedttest.aedt_test_runner.ElectronicsDesktopTester.render_main_html", wraps=lambda *a, **kw: None)
+    @mock.patch("aedttest.aedt_test_runner.execute_aedt", wraps=crashed_subprocess)
+    def test_batch_task_runner(self, aedt_execute_mock, render_main_mock, render_project_mock, prep_proj_mock):
+        self.aedt_tester.retries = 1
+        self.aedt_tester.retry_backoff = 3600
+        self.aedt_tester.active_tasks = 1
+        self.aedt_tester.machines_dict = {"my_host": 10}
+        project_names = ["proj1", "proj2", "proj3", "proj4"]
+        self.aedt_tester.project_tests_config = {
+            "proj1": {"distribution": {"timeout": 10}},
+            "proj2": {"distribution": {"timeout": 20}},
+            "proj3": {"distribution": {"timeout": 5}},
+            "proj4": {"distribution": {"timeout": 5}},
+        }
+        self.aedt_tester.priority = project_names
+        self.aedt_tester.report_data["projects"] = {project_name: {} for project_name in project_names}
+
+        with TemporaryDirectory() as tmp_dir:
+            project_paths = [str(Path(tmp_dir) / f"{project_name}.aedt") for project_name in project_names]
+            # only the first project was solved before the crash, second one was running
+            (Path(tmp_dir) / "proj1.json").touch()
+            (Path(tmp_dir) / f"proj4{aedt_test_runner.CHECKPOINT_SUFFIX}").touch()
+            asyncio.run(
+                self.aedt_tester.batch_task_runner(project_names, project_paths, {"my_host": {"cores": 5}}, tmp_dir)
+            )
+
+            with open(Path(tmp_dir) / "batch_proj1.json") as file:
+                assert json.load(file) == {"projects": project_paths}
+
+        call_kwargs = aedt_execute_mock.call_args[1]
+        assert call_kwargs["project_path"] is None
+        assert call_kwargs["timeout"] == 40
+        assert call_kwargs["script_args"].endswith(f"--batch-file='{Path(tmp_dir) / 'batch_proj1.json'}'")
+        assert call_kwargs["output_log"] == LOGFOLDER_PATH / "batch_proj1_stdout.log"
+
+        assert self.aedt_tester.report_data["projects"]["proj1"]["status"] == "success"
+        assert self.aedt_tester.report_data["projects"]["proj2"]["status"] == "retry"
+        assert self.aedt_tester.attempts["proj1"][0]["status"] == "success"
+        assert self.aedt_tester.attempts["proj2"][0]["status"] == "crash"
+        # project that was not started goes back to the queue without an attempt
+        assert self.aedt_tester.report_data["projects"]["proj3"]["status"] == "queued"
+        assert "proj3" not in self.aedt_tester.attempts
+        assert self.aedt_tester.queue == ["proj3"]
+        # project with a checkpoint was started, it uses up an attempt
+        assert self.aedt_tester.attempts["proj4"][0]["status"] == "crash"
+        assert self.aedt_tester.pending_retries == 2
+        assert self.aedt_tester.active_tasks == 0
+        assert self.aedt_tester.machines_dict == {"my_host": 15}
+
+    @mock.patch("aedttest.aedt_test_runner.copy_dependencies")
+    @mock.patch(
+        "aedttest.aedt_test_runner.copy_path_to", wraps=lambda src, dst, staging: str(Path(dst) / Path(src).name)
+    )
+    def test_staged_path(self, copy_path_mock, copy_dependencies_mock):
+        # name of the file differs from the name of the project
+        self.aedt_tester.project_tests_config = {"proj": {"path": str(Path("input", "my_file.aedt"))}}
+        tmp_dir = str(Path("results"))
+
+        assert self.aedt_tester.staged_path("proj", tmp_dir) == str(Path("results", "my_file.aedt"))
+        assert self.aedt_tester.copy_project("proj", tmp_dir) == self.aedt_tester.staged_path("proj", tmp_dir)
+
+        self.aedt_tester.scratch = NodeScratch("scratch", "results")
+        assert self.aedt_tester.staged_path("proj", tmp_dir) == str(Path("results", "proj", "my_file.aedt"))
+        assert self.aedt_tester.copy_project("proj", tmp_dir) == self.aedt_tester.staged_path("proj", tmp_dir)
+
+    @mock.patch("aedttest.aedt_test_runner.ElectronicsDesktopTester.render_project_html", wraps=lambda *a, **kw: None)
+    @mock.patch("aedttest.aedt_test_runner.ElectronicsDesktopTester.render_main_html", wraps=lambda *a, **kw: None)
+    @mock.patch("aedttest.aedt_test_runner.copy_dependencies", side_effect=FileExistsError("proj.aedt exists"))
+    def test_staging_failure(self, copy_dependencies_mock, render_main_mock, render_project_mock):
+        self.aedt_tester.only_reference = True
+        self.aedt_tester.max_parallel_projects = 1
+        self.aedt_tester.ledger = aedt_test_runner.ResourceLedger({"my_host": 4})
+        self.aedt_tester.runtime_estimates = {}
+        self.aedt_tester.project_tests_config = {
+            name: {"path": f"{name}.aedt", "distribution": aedt_test_runner.session_distribution(2), "batchable": False}
+            for name in ("a", "b")
+        }
+        self.aedt_tester.priority = ["a", "b"]
+        self.aedt_tester.report_data["projects"] = {"a": {}, "b": {}}
+
+        with TemporaryDirectory() as tmp_dir:
+            self.aedt_tester.reference_folder = Path(tmp_dir)
+            asyncio.run(asyncio.wait_for(self.aedt_tester.run_projects(tmp_dir), timeout=10))
+
+        for index, name in enumerate(("a", "b")):
+            assert self.aedt_tester.report_data["projects"][name]["status"] == "fail"
+            errors = render_project_mock.call_args_list[index][0][1]["error_exception"]
+            assert errors[0] == "Staging of the project failed: proj.aedt exists"
+        assert self.aedt_tester.machines_dict == {"my_host": 4}
+        assert self.aedt_tester.active_tasks == 0
+
+    @mock.patch("aedttest.session_pool.POLL_INTERVAL", 0.05)
+    @mock.patch("aedttest.aedt_test_runner.ElectronicsDesktopTester.render_project_html", wraps=lambda *a, **kw: None)
+    @mock.patch("aedttest.aedt_test_runner.ElectronicsDesktopTester.render_main_html", wraps=lambda *a, **kw: None)
+    @mock.patch("aedttest.aedt_test_runner.copy_dependencies")
+    def test_session_pool_crash(self, copy_dependencies_mock, render_main_mock, render_project_mock):
+        self.aedt_tester.only_reference = True
+        self.aedt_tester.session_pool = 1
+        self.aedt_tester.session_cores = 1
+        self.aedt_tester.retries = 1
+        self.aedt_tester.retry_backoff = 0
+        self.aedt_tester.ledger = aedt_test_runner.ResourceLedger({"my_host": 2})
+        self.aedt_tester.runtime_estimates = {}
+        self.aedt_tester.project_tests_config = {
+            name: {"path": f"{name}.aedt", "distribution": aedt_test_runner.session_distribution(1), "batchable": False}
+            for name in ("crash", "proj")
+        }
+        self.aedt_tester.priority = ["crash", "proj"]
+        self.aedt_tester.report_data["projects"] = {"crash": {}, "proj": {}}
+        started_separately = []
+
+        def copy_proj(config, dst, staging, results=False):
+            project_path = Path(dst) / config["path"]
+            project_path.touch()
+            return project_path
+
+        async def launch_stand_in(tester, allocated_machines, worker_dir):
+            await aedt_test_runner.run_process([sys.executable, str(STAND_IN_WORKER), str(worker_dir)], timeout=60)
+
+        async def task_runner(tester, project_name, project_path, project_config, allocated_machines):
+            started_separately.append(project_name)
+            self.aedt_tester.ledger.release_cores(allocated_machines, project_name)
+            self.aedt_tester.ledger.finish_task()
+
+        with TemporaryDirectory() as tmp_dir, mock.patch(
+            "aedttest.aedt_test_runner.copy_proj", wraps=copy_proj
+        ), mock.patch.object(
+            aedt_test_runner.ElectronicsDesktopTester, "launch_session", launch_stand_in
+        ), mock.patch.object(
+            aedt_test_runner.ElectronicsDesktopTester, "task_runner", task_runner
+        ):
+            self.aedt_tester.reference_folder = Path(tmp_dir)
+            asyncio.run(asyncio.wait_for(self.aedt_tester.run_projects(tmp_dir), timeout=30))
+
+        assert self.aedt_tester.session_allocations == {"session_1": {"my_host": {"cores": 1, "tasks": 1}}}
+        # crashed project is retried separately, session is restarted for the next project
+        assert started_separately == ["crash"]
+        assert [attempt["status"] for attempt in self.aedt_tester.attempts["crash"]] == ["crash"]
+        assert self.aedt_tester.attempts["crash"][0]["hosts"] == ["my_host"]
+        assert [attempt["status"] for attempt in self.aedt_tester.attempts["proj"]] == ["success"]
+        assert list(self.aedt_tester.measured_runtimes) == ["proj"]
+        assert self.aedt_tester.report_data["projects"]["proj"]["status"] == "fail"
+        assert self.aedt_tester.pending_pooled == 0
+        assert self.aedt_tester.machines_dict == {"my_host": 2}
+
+    @mock.patch("aedttest.aedt_test_runner.ElectronicsDesktopTester.task_runner", wraps=do_nothing)
+    @mock.patch("aedttest.aedt_test_runner.copy_dependencies")
+    @mock.patch(
+        "aedttest.aedt_test_runner.copy_proj",
+        wraps=lambda config, dst, staging, results=False: f"{dst}/{config['path']}",
+    )
+    def test_prefetch(self, copy_proj_mock, copy_dependencies_mock, task_runner_mock):
+        self.aedt_tester.project_tests_config = {name: {"path": f"{name}.aedt"} for name in ("a", "b", "c", "d")}
+        self.aedt_tester.queue = ["b", "c"]
+        self.aedt_tester.batches = {"c": ["c", "d"]}
+        self.aedt_tester.prefetch = 2
+
+        async def run():
+            self.aedt_tester.prefetch_projects("tmp")
+            assert set(self.aedt_tester.staged) == {"b", "c", "d"}
+            await self.aedt_tester.start_project(["b"], {"host1": {"cores": 1}}, "tmp")
+
+        asyncio.run(run())
+
+        assert [call[0][0]["path"] for call in copy_proj_mock.call_args_list] == ["b.aedt", "c.aedt", "d.aedt"]
+        assert task_runner_mock.call_args[1]["project_path"] == "tmp/b.aedt"
+        assert set(self.aedt_tester.staged) == {"c", "d"}
+        assert set(self.aedt_tester.staging_times) == {"b", "c", "d"}
+
+    def test_local_scratch(self):
+        with TemporaryDirectory() as tmp_dir:
+            self.aedt_tester.scratch = NodeScratch(str(Path(tmp_dir) / "scratch"), "results_1")
+            local_dir = Path(tmp_dir) / "shared" / "proj"
+            local_dir.mkdir(parents=True)
+            project_path = str(local_dir / "proj.aedt")
+            Path(project_path).write_text("project")
+
+            async def run():
+                await self.aedt_tester.push_to_scratch("proj", project_path, "localhost", str(local_dir.parent))
+                run_path = Path(self.aedt_tester.run_path("proj", project_path))
+                assert run_path == Path(tmp_dir) / "scratch" / "results_1" / "proj" / "proj.aedt"
+                assert run_path.read_text() == "project"
+                (run_path.parent / "proj.json").write_text("{}")
+                await self.aedt_tester.pull_from_scratch("proj", project_path)
+
+            asyncio.run(run())
+
+            assert json.loads((local_dir / "proj.json").read_text()) == {}
+            # results are transferred, folder is removed from scratch
+            assert not (Path(tmp_dir) / "scratch" / "results_1" / "proj").exists()
+            assert self.aedt_tester.scratch_hosts == {"proj": set()}
+            assert self.aedt_tester.run_path("proj", project_path) == project_path
+
+    def test_remote_scratch(self):
+        with TemporaryDirectory() as tmp_dir:
+            scratch_dir = Path(tmp_dir) / "scratch"
+            self.aedt_tester.scratch = NodeScratch(str(scratch_dir), "results_1")
+            local_dir = Path(tmp_dir) / "shared" / "proj"
+            local_dir.mkdir(parents=True)
+            project_path = str(local_dir / "proj.aedt")
+            Path(project_path).write_text("project")
+            remote_dir = scratch_dir / "results_1" / "proj"
+            commands = []
+
+            async def remote_host(command):
+                # scratch of the remote host is emulated by a local folder
+                commands.append(command)
+                if command[0] == "ssh":
+                    action, path = command[-1].rsplit(" ", 1)
+                    if action == "mkdir -p":
+                        Path(path.strip("'")).mkdir(parents=True, exist_ok=True)
+                    else:
+                        shutil.rmtree(path.strip("'"))
+                    return
+                src, dst = (arg.split(":", 1)[-1] for arg in command[-2:])
+                if src.endswith("/"):
+                    shutil.rmtree(dst, ignore_errors=True)
+                    shutil.copytree(src, dst)
+                elif Path(src).exists():
+                    shutil.copy(src, dst)
+                else:
+                    raise subprocess.CalledProcessError(23, command, output="No such file or directory")
+
+            async def run(keep_sim_data):
+                self.aedt_tester.keep_sim_data = keep_sim_data
+                await self.aedt_tester.push_to_scratch("proj", project_path, "node-aedttest", str(local_dir.parent))
+                for artifact in ("proj_profile.prof", "proj_mesh.mstat"):
+                    (remote_dir / artifact).write_text(artifact)
+                design_data = {
+                    "profile_name": {"nominal": {"Setup1": str(remote_dir / "proj_profile.prof")}},
+                    "mesh_name": {"nominal": {"Setup1": str(remote_dir / "proj_mesh.mstat")}},
+                }
+                (remote_dir / "proj.json").write_text(json.dumps({"designs": {"design1": design_data}}))
+                await self.aedt_tester.pull_from_scratch("proj", project_path)
+
+            with mock.patch("aedttest.scratch.run_command", wraps=remote_host):
+                asyncio.run(run(keep_sim_data=False))
+
+                assert [command[0] for command in commands] == ["ssh"] + ["rsync"] * 5 + ["ssh"]
+                assert commands[0] == ["ssh", "node-aedttest", f"mkdir -p '{remote_dir.parent}'"]
+                assert commands[-1] == ["ssh", "node-aedttest", f"rm -rf '{remote_dir}'"]
+                assert not remote_dir.exists()
+                project_data = json.loads((local_dir / "proj.json").read_text())
+                design_data = project_data["designs"]["design1"]
+                assert design_data["profile_name"]["nominal"]["Setup1"] == str(local_dir / "proj_profile.prof")
+                assert design_data["mesh_name"]["nominal"]["Setup1"] == str(local_dir / "proj_mesh.mstat")
+                assert (local_dir / "proj_profile.prof").read_text() == "proj_profile.prof"
+                assert (local_dir / "proj_mesh.mstat").read_text() == "proj_mesh.mstat"
+
+                commands.clear()
+                (local_dir / "proj_mesh.mstat").unlink()
+                asyncio.run(run(keep_sim_data=True))
+                assert [command[0] for command in commands] == ["ssh"] + ["rsync"] * 2
+                assert remote_dir.exists()
+                design_data = json.loads((local_dir / "proj.json").read_text())["designs"]["design1"]
+                assert design_data["mesh_name"]["nominal"]["Setup1"] == str(local_dir / "proj_mesh.mstat")
+                assert (local_dir / "proj_mesh.mstat").is_file()
+
+    @mock.patch("aedttest.aedt_test_runner.ElectronicsDesktopTester.render_project_html", wraps=lambda *a, **kw: None)
+    @mock.patch("aedttest.aedt_test_runner.ElectronicsDesktopTester.render_main_html", wraps=lambda *a, **kw: None)
+    def test_result_cache(self, render_main_mock, render_project_mock):
+        with TemporaryDirectory() as tmp_dir:
+            project_path = Path(tmp_dir) / "proj.aedt"
+            project_path.write_text("project")
+            (Path(tmp_dir) / "proj.json").write_text('{"error_exception": [], "designs": {}}')
+            self.aedt_tester.result_cache = ResultCache(Path(tmp_dir) / "cache", 1024**2)
+            self.aedt_tester.only_reference = True
+            self.aedt_tester.reference_folder = Path(tmp_dir)
+            self.aedt_tester.project_tests_config = {"proj": {"path": str(project_path), "distribution": {}}}
+            self.aedt_tester.priority = ["proj"]
+            self.aedt_tester.report_data["projects"] = {"proj": {}}
+
+            asyncio.run(self.aedt_tester.restore_cached_projects(tmp_dir))
+            assert self.aedt_tester.priority == ["proj"]
+
+            asyncio.run(self.aedt_tester.report_project("proj", str(project_path)))
+            assert self.aedt_tester.result_cache.lookup(self.aedt_tester.cache_keys["proj"]) is not None
+
+            self.aedt_tester.report_data["projects"] = {"proj": {}}
+            asyncio.run(self.aedt_tester.restore_cached_projects(tmp_dir))
+            assert self.aedt_tester.priority == []
+            assert self.aedt_tester.report_data["projects"]["proj"]["cached"]
+            assert self.aedt_tester.report_data["projects"]["proj"]["status"] == "success"
+            assert (Path(tmp_dir) / "cached" / "proj" / "proj.json").is_file()
+
 
 class TestCLIArgs:
     def setup(self):
@@ -410,6 +1634,33 @@ class TestCLIArgs:
                 aedt_test_runner.parse_arguments()
             assert "Configuration folder does not exist" in str(exc.value)
 
+    def test_max_cores_per_host(self):
+        for cores in ("0", "-4"):
+            argv = self.default_argv + ["--only-reference", f"--max-cores-per-host={cores}"]
+            with mock.patch("sys.argv", argv):
+                with mock.patch("aedttest.aedt_test_runner.Path.is_dir", return_value=True):
+                    with pytest.raises(ValueError) as exc:
+                        aedt_test_runner.parse_arguments()
+                assert "--max-cores-per-host must be >= 1" in str(exc.value)
+
+    def test_telemetry_interval(self):
+        for interval in ("0", "-1"):
+            argv = self.default_argv + ["--only-reference", f"--telemetry-interval={interval}"]
+            with mock.patch("sys.argv", argv):
+                with mock.patch("aedttest.aedt_test_runner.Path.is_dir", return_value=True):
+                    with pytest.raises(ValueError) as exc:
+                        aedt_test_runner.parse_arguments()
+                assert "--telemetry-interval must be positive" in str(exc.value)
+
+    def test_reference_folder_with_index_only(self):
+        with TemporaryDirectory() as tmp_dir:
+            (Path(tmp_dir) / "reference_index.json").write_text('{"version": 1, "files": {}}')
+            self.default_argv += ["--suppress-validation", f"--reference-folder={tmp_dir}"]
+            with mock.patch("sys.argv", self.default_argv):
+                with pytest.raises(ValueError) as exc:
+                    aedt_test_runner.parse_arguments()
+                assert "No reference .json or .bjson file found" in str(exc.value)
+
     def test_sim_data(self):
         self.default_argv += ["--only-reference", "--suppress-validation", "-s"]
         with mock.patch("sys.argv", self.default_argv):
@@ -425,6 +1676,13 @@ def test_unique_id():
     assert aedt_test_runner.unique_id() == "a3"
 
 
+def test_unique_id_threads():
+    # reports are prepared in a thread pool
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        ids = list(executor.map(lambda _: aedt_test_runner.unique_id(), range(1000)))
+    assert len(set(ids)) == 1000
+
+
 def test_compare_keys():
     dict_ref = {
         "1": 1,
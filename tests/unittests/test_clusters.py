@@ -1,7 +1,16 @@
 import os
+import socket
+import subprocess
+import sys
+from pathlib import Path
 from tempfile import NamedTemporaryFile
+from tempfile import TemporaryDirectory
+from unittest import mock
+
+import pytest
 
 from aedttest.clusters import job_hosts
+from aedttest.clusters import launchers
 
 
 def test_slurm_nodes_start_end_unparsed():
@@ -121,3 +130,77 @@ def test_parse_hosts_sge():
     assert hosts[1].cores == 15
     assert hosts[2].hostname == "node115.a.itservices.ac.uk"
     assert hosts[2].cores == 64
+
+
+def test_mpiexec_launcher():
+    launcher = launchers.MpiexecLauncher("path/to/mpiexec")
+    machines = {"host1": {"cores": 4, "tasks": 1}, "host2": {"cores": 2, "tasks": 1}}
+
+    assert launcher.machines(machines) is machines
+    assert launcher.command(["ansysedt", "-ng"], machines, "proj") == [
+        "path/to/mpiexec",
+        "-envall",
+        "-n",
+        "1",
+        "-hosts",
+        "host1",
+        "ansysedt",
+        "-ng",
+    ]
+
+
+def test_srun_launcher():
+    with mock.patch.dict(os.environ, {"SLURM_JOB_ID": "1234"}):
+        launcher = launchers.SrunLauncher()
+
+    assert launcher.command(["ansysedt"], {"host1": {"cores": 4, "tasks": 1}}, "proj") == [
+        "srun",
+        "--jobid=1234",
+        "--job-name=proj",
+        "--nodes=1",
+        "--ntasks=1",
+        "--cpus-per-task=4",
+        "--nodelist=host1",
+        "--exact",
+        "--export=ALL",
+        "ansysedt",
+    ]
+
+    with mock.patch.dict(os.environ, clear=True):
+        with pytest.raises(ValueError) as exc:
+            launchers.SrunLauncher()
+    assert "SLURM_JOB_ID is not set" in str(exc.value)
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="job scripts are POSIX shell scripts")
+def test_submit_launcher():
+    with TemporaryDirectory() as tmp_dir:
+        launcher = launchers.SubmitLauncher("sh {script} --name={name} --cores={cores}", Path(tmp_dir))
+        machines = launcher.machines({"host1": {"cores": 4, "tasks": 1}, "host2": {"cores": 2, "tasks": 2}})
+        assert machines == {launchers.HOST_PLACEHOLDER: {"cores": 6, "tasks": 3}}
+
+        machine_list = f"list={launchers.HOST_PLACEHOLDER}:-1:6:90%"
+        command = launcher.command(["echo", machine_list, "it's"], machines, "proj")
+        script_path = Path(tmp_dir) / "proj_1.sh"
+        assert command == ["sh", str(script_path), "--name=proj", "--cores=6"]
+
+        output = subprocess.run(command, stdout=subprocess.PIPE, check=True).stdout.decode()
+        assert output == f"list={socket.gethostname()}:-1:6:90% it's\n"
+
+
+def test_submit_launcher_stop_command():
+    launcher = launchers.SubmitLauncher("sbatch --wait {script}", Path("scripts"), cancel_command="scancel '{job}'")
+    assert launcher.stop_command("Submitted batch job 4242\n") == ["scancel", "4242"]
+    # job was not submitted yet
+    assert launcher.stop_command("") is None
+
+    launcher = launchers.SubmitLauncher("sbatch --wait {script}", Path("scripts"))
+    assert launcher.stop_command("Submitted batch job 4242\n") is None
+    assert launchers.LocalLauncher().stop_command("Submitted batch job 4242\n") is None
+
+
+def test_dry_run_launcher():
+    launcher = launchers.DryRunLauncher({"proj": 30}, default_duration=2, speedup=10)
+
+    assert launcher.command(["ansysedt"], {"host1": {"cores": 1}}, "proj")[-1] == "import time; time.sleep(3.0)"
+    assert launcher.command(["ansysedt"], {"host1": {"cores": 1}}, "other")[-1] == "import time; time.sleep(0.2)"
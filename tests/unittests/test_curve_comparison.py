@@ -0,0 +1,46 @@
+import math
+import random
+from array import array
+from statistics import StatisticsError
+
+import pytest
+
+from aedttest import curve_comparison
+from tests.benchmarks.bench_curve_comparison import generate_curves
+from tests.benchmarks.bench_curve_comparison import loop_compare_curve
+
+
+def test_compare_curve_equals_loop():
+    pairs = generate_curves(curves=200, points=300, seed=1)
+    rng = random.Random(2)
+    # integers, identical curves, zero mean, negative zeros and tiny values
+    pairs += [
+        ([1, 2, 3], [1, 2, 4]),
+        ([1.5, -2.5], [1.5, -2.5]),
+        ([1.0, -1.0], [2.0, -2.0]),
+        ([0.0, 1.0, -0.0], [-0.0, 0.0, 1e-300]),
+        ([rng.uniform(-1e-15, 1e-15) for _ in range(50)], [rng.uniform(-1e-15, 1e-15) for _ in range(50)]),
+    ]
+    for reference, current in pairs:
+        expected = loop_compare_curve(reference, current)
+        assert tuple(curve_comparison.compare_curve(reference, current)) == expected
+        # binary references hold memory-mapped float64 arrays
+        mapped = memoryview(array("d", reference))
+        assert tuple(curve_comparison.compare_curve(mapped, current)) == expected
+
+
+def test_compare_curve_nan():
+    comparison = curve_comparison.compare_curve([math.nan, 2.0], [1.0, 1.0])
+    assert comparison.max_delta_perc == loop_compare_curve([math.nan, 2.0], [1.0, 1.0])[1] == 100.0
+    assert math.isnan(comparison.avg_perc)
+
+
+def test_compare_curve_empty():
+    with pytest.raises(StatisticsError):
+        curve_comparison.compare_curve([], [])
+
+
+def test_guard_zeros():
+    values = [1.0, 2.0]
+    assert curve_comparison.guard_zeros(values) is values
+    assert curve_comparison.guard_zeros([0.0, 1.0, -0.0, 0]) == [1e-20, 1.0, 1e-20, 1e-20]
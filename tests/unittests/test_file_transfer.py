@@ -0,0 +1,93 @@
+import os
+import stat
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import mock
+
+import pytest
+
+from aedttest import file_transfer
+
+
+class TestFileTransfer:
+    def setup(self):
+        self.tmp_dir = TemporaryDirectory()
+        self.src_dir = Path(self.tmp_dir.name) / "src"
+        self.src_dir.mkdir()
+
+    def teardown(self):
+        self.tmp_dir.cleanup()
+
+    def make_file(self, name, content=b"data", mode=0o640):
+        file_path = self.src_dir / name
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        file_path.write_bytes(content)
+        file_path.chmod(mode)
+        os.utime(file_path, ns=(10**9, 2 * 10**9))
+        return file_path
+
+    @pytest.mark.parametrize("large_file_size", [file_transfer.LARGE_FILE_SIZE, 0])
+    def test_copy_file(self, large_file_size):
+        src = self.make_file("proj.aedt", os.urandom(100000), mode=0o750)
+        dst = Path(self.tmp_dir.name) / "proj.aedt"
+
+        with mock.patch("aedttest.file_transfer.LARGE_FILE_SIZE", large_file_size):
+            assert file_transfer.copy_file(src, dst) == 100000
+
+        assert dst.read_bytes() == src.read_bytes()
+        assert stat.S_IMODE(dst.stat().st_mode) == 0o750
+        assert dst.stat().st_mtime_ns == 2 * 10**9
+
+    @mock.patch("aedttest.file_transfer.LARGE_FILE_SIZE", 0)
+    @mock.patch("aedttest.file_transfer.CHUNK_SIZE", 1000)
+    def test_copy_file_fallback(self):
+        src = self.make_file("proj.aedt", os.urandom(100000))
+        dst = Path(self.tmp_dir.name) / "proj.aedt"
+        dst.write_bytes(b"content of previous run" * 10000)
+
+        with mock.patch("aedttest.file_transfer.copy_in_kernel", return_value=False) as kernel_mock:
+            file_transfer.copy_file(src, dst)
+
+        assert kernel_mock.call_count == 1
+        assert dst.read_bytes() == src.read_bytes()
+
+    def test_copy_in_kernel_not_supported(self):
+        src = self.make_file("proj.aedt")
+        with open(src, "rb") as src_file, open(Path(self.tmp_dir.name) / "dst", "wb") as dst_file:
+            with mock.patch("aedttest.file_transfer.os.copy_file_range", side_effect=OSError(18, "EXDEV"), create=True):
+                assert not file_transfer.copy_in_kernel(src_file.fileno(), dst_file.fileno(), 4)
+
+    def test_link_file(self):
+        src = self.make_file("ref.prof")
+        dst = Path(self.tmp_dir.name) / "ref.prof"
+        dst.write_bytes(b"previous run")
+
+        assert file_transfer.link_file(src, dst) == "hardlink"
+        assert dst.stat().st_ino == src.stat().st_ino
+
+        with mock.patch("aedttest.file_transfer.os.link", side_effect=OSError(18, "EXDEV")):
+            assert file_transfer.link_file(src, dst) == "symlink"
+            assert dst.resolve() == src.resolve()
+
+            assert file_transfer.link_file(src, dst, symlink=False) == "copy"
+            assert not dst.is_symlink()
+            assert dst.read_bytes() == b"data"
+
+    def test_copy_tree(self):
+        self.make_file("edb.def", b"edb")
+        self.make_file(os.path.join("nested", "deeper", "stackup.xml"), b"stackup")
+        (self.src_dir / "empty").mkdir()
+        dst = Path(self.tmp_dir.name) / "run" / "proj.aedb"
+
+        copied = file_transfer.copy_tree(self.src_dir, dst, workers=2)
+
+        assert sorted(copied) == [str(dst / "edb.def"), str(dst / "nested" / "deeper" / "stackup.xml")]
+        assert (dst / "nested" / "deeper" / "stackup.xml").read_bytes() == b"stackup"
+        assert (dst / "empty").is_dir()
+        assert (dst / "edb.def").stat().st_mtime_ns == 2 * 10**9
+
+    def test_copy_tree_error(self):
+        self.make_file("edb.def")
+
+        with pytest.raises(OSError):
+            file_transfer.copy_tree(self.src_dir, Path(self.tmp_dir.name) / "run", mock.Mock(side_effect=OSError))
@@ -0,0 +1,133 @@
+import json
+import os
+import threading
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import mock
+
+from aedttest import reference_index
+from aedttest.aedt_test_runner import estimate_runtimes
+from aedttest.reference_index import ReferenceIndex
+
+PROJECT_DATA = {
+    "name": "proj",
+    "aedt_version": "221",
+    "error_exception": [],
+    "designs": {
+        "design1": {
+            "report": {"Plot": {"trace": {"curves": {"": {"x_data": [1.0, 2.0], "y_data": [3.0, 4.0]}}}}},
+            "simulation_time": {"nominal": {"Setup1": "00:01:40"}},
+        }
+    },
+}
+
+
+def write_reference(path, project_data):
+    with open(path, "w") as file:
+        json.dump(project_data, file, indent=4)
+
+
+def test_reference_index():
+    with TemporaryDirectory() as tmp_dir:
+        folder = Path(tmp_dir)
+        write_reference(folder / "ref_proj.json", PROJECT_DATA)
+        write_reference(folder / "ref_other.json", dict(PROJECT_DATA, name="other", designs={}))
+
+        index = ReferenceIndex(folder)
+        assert sorted(index) == ["other", "proj"]
+        assert "proj" in index and "missing" not in index
+        assert index.loaded == {}
+        assert index.summaries()["proj"]["designs"] == {
+            "design1": {"simulation_time": {"nominal": {"Setup1": "00:01:40"}}}
+        }
+        assert index.summaries()["proj"]["aedt_version"] == "221"
+        config = {"proj": {"distribution": {"parametric_tasks": 2}}, "other": {"distribution": {"parametric_tasks": 1}}}
+        assert estimate_runtimes(config, index.summaries(), {}) == {"proj": 50}
+
+        assert index["proj"]["designs"]["design1"]["report"] == PROJECT_DATA["designs"]["design1"]["report"]
+        assert index["proj"]["filepath"] == folder
+        assert list(index.loaded) == ["proj"]
+        index.release("proj")
+        assert index.loaded == {}
+
+
+def test_reference_index_reused():
+    with TemporaryDirectory() as tmp_dir:
+        folder = Path(tmp_dir)
+        write_reference(folder / "ref_proj.json", PROJECT_DATA)
+        ReferenceIndex(folder)
+        assert (folder / reference_index.INDEX_FILE).is_file()
+
+        with mock.patch("aedttest.reference_index.load_results") as load_mock:
+            assert list(ReferenceIndex(folder)) == ["proj"]
+        load_mock.assert_not_called()
+
+        write_reference(folder / "ref_proj.json", dict(PROJECT_DATA, name="renamed"))
+        os.utime(folder / "ref_proj.json", ns=(0, 0))
+        assert list(ReferenceIndex(folder)) == ["renamed"]
+
+
+def test_reference_index_read_only():
+    with TemporaryDirectory() as tmp_dir:
+        folder = Path(tmp_dir)
+        write_reference(folder / "ref_proj.json", PROJECT_DATA)
+        (folder / "notes.json").write_text("{}")
+
+        with mock.patch("aedttest.reference_index.os.replace", side_effect=PermissionError("read-only")):
+            assert list(ReferenceIndex(folder)) == ["proj"]
+        assert sorted(path.name for path in folder.iterdir()) == ["notes.json", "ref_proj.json"]
+        assert ReferenceIndex() == {}
+
+
+def test_has_references():
+    with TemporaryDirectory() as tmp_dir:
+        folder = Path(tmp_dir)
+        assert not reference_index.has_references(folder)
+        (folder / reference_index.INDEX_FILE).write_text('{"version": 1, "files": {}}')
+        assert not reference_index.has_references(folder)
+
+        write_reference(folder / "ref_proj.json", PROJECT_DATA)
+        with mock.patch("aedttest.reference_index.Path.rglob") as rglob_mock:
+            assert reference_index.has_references(folder)
+        rglob_mock.assert_not_called()
+
+        # index of the reference is found without listing the folder
+        ReferenceIndex(folder)
+        with mock.patch("aedttest.reference_index.Path.glob") as glob_mock:
+            assert reference_index.has_references(folder)
+        glob_mock.assert_not_called()
+
+        nested = folder / "nested"
+        nested.mkdir()
+        (folder / "ref_proj.json").rename(nested / "proj.json")
+        (folder / reference_index.INDEX_FILE).unlink()
+        assert reference_index.has_references(folder)
+
+
+def test_reference_index_load_outside_lock():
+    with TemporaryDirectory() as tmp_dir:
+        folder = Path(tmp_dir)
+        write_reference(folder / "ref_proj.json", PROJECT_DATA)
+        write_reference(folder / "ref_other.json", dict(PROJECT_DATA, name="other"))
+        index = ReferenceIndex(folder)
+        both_loading = threading.Barrier(2, timeout=5)
+
+        def load_results(path):
+            # both references are being read at the same time
+            both_loading.wait()
+            with open(path) as file:
+                return json.load(file)
+
+        results = {}
+        with mock.patch("aedttest.reference_index.load_results", wraps=load_results):
+            threads = [
+                threading.Thread(target=lambda name=name: results.update({name: index[name]}))
+                for name in ("proj", "other")
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        assert sorted(index.loaded) == ["other", "proj"]
+        assert results["proj"] is index["proj"]
@@ -0,0 +1,87 @@
+import json
+import os
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from aedttest.result_cache import ResultCache
+
+
+def write_project(folder, profile):
+    (folder / "proj.aedt").write_text("project")
+    (folder / "proj.aedb").mkdir()
+    (folder / "proj.aedb" / "edb.def").write_text("layout")
+    (folder / "dep.txt").write_text("dependency")
+    profile.write_text("profile")
+    project_data = {
+        "error_exception": [],
+        "designs": {
+            "design1": {
+                "profile_name": {"Setup1": {"sweep": str(profile), "empty": None}},
+                "mesh_name": {},
+            }
+        },
+    }
+    with open(folder / "proj.json", "w") as file:
+        json.dump(project_data, file)
+    with open(folder / "failed.json", "w") as file:
+        json.dump(dict(project_data, error_exception=["error"]), file)
+
+    return {"path": str(folder / "proj.aedt"), "distribution": {"cores": 2}, "dependencies": str(folder / "dep.txt")}
+
+
+def test_key():
+    with TemporaryDirectory() as tmp_dir:
+        folder = Path(tmp_dir)
+        cache = ResultCache(folder / "cache", max_size=1024)
+        project_config = write_project(folder, folder / "proj.prof")
+
+        key = cache.key(project_config, "221")
+        assert key == cache.key(dict(project_config, distribution={"cores": 2}), "221")
+        assert key != cache.key(project_config, "222")
+        assert key != cache.key(project_config, "221", salt="script")
+        assert key != cache.key(dict(project_config, distribution={"cores": 4}), "221")
+
+        (folder / "proj.aedb" / "edb.def").write_text("changed layout")
+        assert key != cache.key(project_config, "221")
+        key = cache.key(project_config, "221")
+        (folder / "dep.txt").write_text("changed dependency")
+        assert key != cache.key(project_config, "221")
+
+
+def test_store_restore():
+    with TemporaryDirectory() as tmp_dir:
+        folder = Path(tmp_dir)
+        cache = ResultCache(folder / "cache", max_size=1024**2)
+        project_config = write_project(folder, folder / "proj.prof")
+        key = cache.key(project_config, "221")
+        assert cache.lookup(key) is None
+
+        cache.store(key, "proj", folder / "proj.json")
+        (folder / "proj.prof").unlink()
+        cache.store("failed", "proj", folder / "failed.json")
+        assert cache.lookup("failed") is None
+        entry = cache.lookup(key)
+        assert entry == folder / "cache" / key
+
+        report_file = cache.restore(entry, "proj", folder / "restored")
+        assert report_file == folder / "restored" / "proj.json"
+        with open(report_file) as file:
+            setups = json.load(file)["designs"]["design1"]["profile_name"]["Setup1"]
+        assert setups == {"sweep": str(folder / "restored" / "0_proj.prof"), "empty": None}
+        assert Path(setups["sweep"]).read_text() == "profile"
+
+
+def test_evict():
+    with TemporaryDirectory() as tmp_dir:
+        folder = Path(tmp_dir)
+        cache = ResultCache(folder / "cache", max_size=1)
+        for index, key in enumerate(("old", "used", "new")):
+            (cache.cache_dir / key).mkdir()
+            (cache.cache_dir / key / "proj.json").write_text("{}")
+            os.utime(cache.cache_dir / key, (index, index))
+
+        cache.max_size = 2
+        cache.lookup("used")
+        cache.evict()
+
+        assert sorted(entry.name for entry in cache.cache_dir.iterdir()) == ["used"]
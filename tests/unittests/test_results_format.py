@@ -0,0 +1,115 @@
+import json
+import sys
+from array import array
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import mock
+
+import pytest
+
+from aedttest import results_format
+from aedttest.reference_index import ReferenceIndex
+
+PROJECT_DATA = {
+    "name": "proj",
+    "aedt_version": "221",
+    "error_exception": [],
+    "designs": {
+        "design1": {
+            "report": {
+                "S Parameter Plot": {
+                    "dB(S(1,1))": {
+                        "x_name": "Freq",
+                        "curves": {
+                            "": {"x_data": [1.0, 2.0, 3.0], "y_data": [-1.5, 0, 2.25]},
+                            "cut": {"x_data": [1, 2], "y_data": ["a", "b"]},
+                        },
+                    }
+                }
+            },
+            "mesh": {"Setup1": 1024},
+        }
+    },
+}
+
+
+def test_write_read_results():
+    with TemporaryDirectory() as tmp_dir:
+        path = Path(tmp_dir) / "ref_proj.bjson"
+        results_format.write_results(PROJECT_DATA, path)
+        assert "byteorder" not in PROJECT_DATA
+
+        project_data = results_format.read_results(path)
+        curves = project_data["designs"]["design1"]["report"]["S Parameter Plot"]["dB(S(1,1))"]["curves"]
+        assert isinstance(curves[""]["y_data"], memoryview)
+        assert curves[""]["y_data"].tolist() == [-1.5, 0.0, 2.25]
+        assert curves["cut"]["x_data"].tolist() == [1.0, 2.0]
+        assert curves["cut"]["y_data"] == ["a", "b"]
+        assert project_data["designs"]["design1"]["mesh"] == {"Setup1": 1024}
+        assert json.loads(json.dumps(project_data, default=list)) == json.loads(json.dumps(PROJECT_DATA))
+
+        # binary file is written again from memory-mapped arrays
+        copy_path = Path(tmp_dir) / "copy.bjson"
+        results_format.write_results(project_data, copy_path)
+        assert copy_path.read_bytes() == path.read_bytes()
+        del project_data, curves
+
+
+def test_read_other_byteorder():
+    with TemporaryDirectory() as tmp_dir:
+        path = Path(tmp_dir) / "ref_proj.bjson"
+        other_byteorder = "big" if sys.byteorder == "little" else "little"
+        with mock.patch("aedttest.results_format.sys.byteorder", other_byteorder):
+            results_format.write_results(PROJECT_DATA, path)
+
+        project_data = results_format.read_results(path)
+        curves = project_data["designs"]["design1"]["report"]["S Parameter Plot"]["dB(S(1,1))"]["curves"]
+        swapped = array("d", [1.0, 2.0, 3.0])
+        swapped.byteswap()
+        assert curves[""]["x_data"].tolist() == swapped.tolist()
+
+
+def test_read_not_binary():
+    with TemporaryDirectory() as tmp_dir:
+        path = Path(tmp_dir) / "ref_proj.bjson"
+        path.write_text("{}")
+        with pytest.raises(ValueError) as exc:
+            results_format.read_results(path)
+        assert "is not a binary results file" in str(exc.value)
+
+
+def test_convert_folder():
+    with TemporaryDirectory() as tmp_dir:
+        folder = Path(tmp_dir)
+        (folder / "nested").mkdir()
+        with open(folder / "nested" / "ref_proj.json", "w") as file:
+            json.dump(PROJECT_DATA, file, indent=4)
+        (folder / "history.json").write_text('{"proj": 10}')
+
+        converted = results_format.convert_folder(folder, keep_json=True)
+        assert [path.name for path, _, _ in converted] == ["ref_proj.bjson"]
+        assert converted[0][2] < converted[0][1]
+        assert (folder / "nested" / "ref_proj.json").exists()
+
+        with open(folder / "ref_other.json", "w") as file:
+            json.dump(dict(PROJECT_DATA, name="other"), file, indent=4)
+        assert results_format.find_results(folder) == [
+            folder / "history.json",
+            folder / "nested" / "ref_proj.bjson",
+            folder / "ref_other.json",
+        ]
+
+        (folder / "history.json").unlink()
+        reference_data = ReferenceIndex(folder)
+        assert sorted(reference_data) == ["other", "proj"]
+        assert isinstance(
+            reference_data["proj"]["designs"]["design1"]["report"]["S Parameter Plot"]["dB(S(1,1))"]["curves"][""][
+                "y_data"
+            ],
+            memoryview,
+        )
+        # mapped file cannot be replaced on Windows
+        del reference_data
+
+        results_format.convert_folder(folder)
+        assert not (folder / "nested" / "ref_proj.json").exists()
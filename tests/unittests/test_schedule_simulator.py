@@ -0,0 +1,103 @@
+from pathlib import Path
+
+import pytest
+
+from aedttest import schedule_simulator
+
+TESTS_DIR = Path(__file__).resolve().parent.parent
+
+
+def make_config(cores, single_node=True):
+    return {
+        "distribution": {
+            "cores": cores,
+            "parametric_tasks": 1,
+            "single_node": single_node,
+            "auto": True,
+        }
+    }
+
+
+def test_simulate_schedule():
+    config = {"a": make_config(16), "b": make_config(16), "c": make_config(32)}
+    stats = schedule_simulator.simulate_schedule(config, {"host1": 32}, {"a": 10, "b": 10, "c": 20})
+
+    assert stats.makespan == 30
+    assert stats.utilization == 1
+
+
+def test_simulate_schedule_max_projects():
+    config = {"a": make_config(1), "b": make_config(1)}
+    stats = schedule_simulator.simulate_schedule(config, {"host1": 2}, {}, max_parallel_projects=1)
+
+    assert stats.makespan == 2
+    assert stats.utilization == 0.5
+
+
+def test_simulate_schedule_max_cores():
+    config = {"a": make_config(8), "b": make_config(8)}
+    stats = schedule_simulator.simulate_schedule(config, {"host1": 16}, {"a": 10, "b": 10}, max_cores=12)
+
+    assert stats.makespan == 20
+    assert stats.start_times == {"a": 0, "b": 10}
+
+
+def test_best_fit_avoids_fragmentation():
+    # first-fit puts 32-core project on the 48-core host, then the second 24-core project has to wait
+    config = {"a": make_config(32), "b": make_config(24), "c": make_config(24)}
+    machines = {"host1": 48, "host2": 32}
+    durations = {"a": 10, "b": 10, "c": 10}
+
+    first_fit = schedule_simulator.simulate_schedule(config, machines, durations, "first-fit")
+    best_fit = schedule_simulator.simulate_schedule(config, machines, durations, "best-fit")
+    min_frag = schedule_simulator.simulate_schedule(config, machines, durations, "min-fragmentation")
+
+    assert first_fit.makespan == 20
+    assert best_fit.makespan == 10
+    assert min_frag.makespan == 10
+
+
+def test_longest_processing_time_first():
+    config = {"short1": make_config(1), "short2": make_config(1), "long": make_config(1)}
+    durations = {"short1": 10, "short2": 10, "long": 20}
+
+    cores_order = schedule_simulator.simulate_schedule(config, {"host1": 2}, durations)
+    lpt_order = schedule_simulator.simulate_schedule(config, {"host1": 2}, durations, runtime_estimates=durations)
+
+    assert cores_order.makespan == 30
+    assert lpt_order.makespan == 20
+    assert lpt_order.utilization == 1
+
+
+def test_backfill_does_not_starve_big_project():
+    config = {name: make_config(8) for name in ("s1", "s2", "s3", "s4", "s5", "s6")}
+    config["big"] = make_config(16)
+    durations = dict({name: 10 for name in config}, s2=15)
+    # queue: s2, big, s1, s3, ..., small projects keep taking freed cores before big project
+    greedy = schedule_simulator.simulate_schedule(config, {"host1": 16}, durations, runtime_estimates=durations)
+    easy = schedule_simulator.simulate_schedule(
+        config, {"host1": 16}, durations, runtime_estimates=durations, backfill=True
+    )
+
+    assert greedy.makespan == 45
+    assert easy.makespan == 45
+    assert greedy.start_times["big"] == 35
+    assert easy.start_times["big"] == 15
+    assert easy.start_times["s1"] == 0
+
+
+def test_not_enough_resources():
+    with pytest.raises(ValueError) as exc:
+        schedule_simulator.simulate_schedule({"a": make_config(8)}, {"host1": 4}, {})
+
+    assert "Not enough resources to run any of projects: a" in str(exc.value)
+
+
+def test_main(capsys):
+    schedule_simulator.main(
+        ["--config-folder", str(TESTS_DIR / "input" / "configs"), "--hosts", "host1:28,host2:28,host3:28"]
+    )
+    output = capsys.readouterr().out.splitlines()
+
+    assert output[0].split() == ["Placement", "Makespan", "[s]", "Utilization", "[%]"]
+    assert [line.split()[0] for line in output[1:]] == list(schedule_simulator.PLACEMENT_STRATEGIES)
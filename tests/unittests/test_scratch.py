@@ -0,0 +1,85 @@
+import asyncio
+import json
+import socket
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import mock
+
+from aedttest import scratch
+
+
+def test_is_local_host():
+    assert scratch.is_local_host("localhost")
+    assert scratch.is_local_host(socket.gethostname())
+    assert not scratch.is_local_host("not-this-host-aedttest")
+
+
+def test_push_pull_local():
+    with TemporaryDirectory() as tmp_dir:
+        local_dir = Path(tmp_dir) / "shared" / "proj"
+        (local_dir / "input").mkdir(parents=True)
+        (local_dir / "input" / "proj.aedt").write_text("project")
+        node_scratch = scratch.NodeScratch(str(Path(tmp_dir) / "scratch"), "results_1")
+        remote_dir = node_scratch.project_dir("proj")
+        assert remote_dir == Path(tmp_dir) / "scratch" / "results_1" / "proj"
+
+        remote_dir.mkdir(parents=True)
+        (remote_dir / "proj.aedt.lock").write_text("")
+        asyncio.run(node_scratch.push(local_dir, "localhost", remote_dir))
+        assert (remote_dir / "input" / "proj.aedt").read_text() == "project"
+        assert not (remote_dir / "proj.aedt.lock").exists()
+
+        (remote_dir / "input" / "proj.json").write_text("{}")
+        asyncio.run(
+            node_scratch.pull("localhost", remote_dir / "input" / "proj.json", local_dir / "input" / "proj.json")
+        )
+        assert (local_dir / "input" / "proj.json").read_text() == "{}"
+
+
+async def do_nothing(*args, **kwargs):
+    pass
+
+
+@mock.patch("aedttest.scratch.run_command", wraps=do_nothing)
+def test_push_pull_remote(run_command_mock):
+    node_scratch = scratch.NodeScratch("/scratch", "results_1", copy_command="rsync -a {src} {dst}")
+    remote_dir = node_scratch.project_dir("proj")
+
+    asyncio.run(node_scratch.push(Path("/shared/proj"), "node-aedttest", remote_dir))
+    asyncio.run(node_scratch.pull("node-aedttest", remote_dir / "proj.json", Path("/shared/proj/proj.json")))
+    asyncio.run(node_scratch.pull("node-aedttest", remote_dir, Path("/shared/proj")))
+    asyncio.run(node_scratch.remove("node-aedttest", remote_dir))
+
+    assert [call[0][0] for call in run_command_mock.call_args_list] == [
+        ["ssh", "node-aedttest", "mkdir -p '/scratch/results_1'"],
+        ["rsync", "-a", "/shared/proj/", "node-aedttest:/scratch/results_1/proj/"],
+        ["rsync", "-a", "node-aedttest:/scratch/results_1/proj/proj.json", "/shared/proj/proj.json"],
+        ["rsync", "-a", "node-aedttest:/scratch/results_1/proj/", "/shared/proj/"],
+        ["ssh", "node-aedttest", "rm -rf '/scratch/results_1/proj'"],
+    ]
+
+
+def test_format_command():
+    command = scratch.format_command('rsync -e "ssh -p 22" {src} {dst}', src="/shared/my proj/", dst="host:/scratch/")
+    assert command == ["rsync", "-e", "ssh -p 22", "/shared/my proj/", "host:/scratch/"]
+
+
+def test_relocate_results():
+    with TemporaryDirectory() as tmp_dir:
+        remote_dir = Path("/scratch/results_1/proj")
+        local_dir = Path(tmp_dir)
+        profile = {"nominal": {"Setup1": "/scratch/results_1/proj/input/proj_profile.prof"}}
+        (local_dir / "proj.json").write_text(json.dumps({"designs": {"design1": {"profile_name": profile}}}))
+        checkpoint = local_dir / "proj.checkpoint.jsonl"
+        checkpoint.write_text(json.dumps({"design": "design1", "data": {"mesh_name": "/scratch/other.mstat"}}) + "\n{")
+
+        assert scratch.relocate_results(local_dir / "proj.json", remote_dir, local_dir) == ["input/proj_profile.prof"]
+        project_data = json.loads((local_dir / "proj.json").read_text())
+        assert project_data["designs"]["design1"]["profile_name"]["nominal"]["Setup1"] == str(
+            local_dir / "input" / "proj_profile.prof"
+        )
+
+        # paths outside of the project folder and torn lines are kept
+        assert scratch.relocate_results(checkpoint, remote_dir, local_dir) == []
+        assert checkpoint.read_text().splitlines()[1] == "{"
+        assert scratch.relocate_results(local_dir / "missing.json", remote_dir, local_dir) == []
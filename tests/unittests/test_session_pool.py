@@ -0,0 +1,119 @@
+import asyncio
+import json
+import subprocess
+import sys
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import mock
+
+import pytest
+
+from aedttest import session_pool
+from aedttest.aedt_test_runner import run_process
+
+STAND_IN_WORKER = Path(__file__).resolve().parent / "stand_in_worker.py"
+
+
+async def launch_stand_in(worker_dir):
+    await run_process([sys.executable, str(STAND_IN_WORKER), str(worker_dir)], timeout=60)
+
+
+def make_projects(tmp_dir, *names):
+    paths = []
+    for name in names:
+        project_path = Path(tmp_dir) / name / f"{name}.aedt"
+        project_path.parent.mkdir()
+        project_path.touch()
+        paths.append(project_path)
+    return paths
+
+
+@mock.patch("aedttest.session_pool.POLL_INTERVAL", 0.05)
+def test_session_pool():
+    async def solve(pool, project_path):
+        worker = await pool.acquire()
+        try:
+            return worker.name, await worker.submit({"project_path": str(project_path)})
+        finally:
+            pool.release(worker)
+
+    async def run(project_paths):
+        pool = session_pool.SessionPool(Path(tmp_dir) / "sessions", [launch_stand_in, launch_stand_in])
+        results = await asyncio.gather(*(solve(pool, project_path) for project_path in project_paths))
+        await pool.stop()
+        assert all(worker.process.done() and not worker.process.exception() for worker in pool.workers)
+        return results
+
+    with TemporaryDirectory() as tmp_dir:
+        project_paths = make_projects(tmp_dir, "proj1", "proj2", "proj3")
+        results = asyncio.run(run(project_paths))
+
+        assert {worker_name for worker_name, _ in results} == {"session_1", "session_2"}
+        for project_path, (_, result) in zip(project_paths, results):
+            assert result == {"status": "done", "results_json": str(project_path.with_suffix(".json"))}
+            with open(result["results_json"]) as file:
+                assert json.load(file) == {"error_exception": ["Project has no design"], "designs": {}}
+
+
+@mock.patch("aedttest.session_pool.POLL_INTERVAL", 0.05)
+def test_session_pool_crash():
+    async def run(project_path):
+        pool = session_pool.SessionPool(Path(tmp_dir) / "sessions", [launch_stand_in])
+        worker = await pool.acquire()
+        with pytest.raises(session_pool.SessionError) as exc:
+            await worker.submit({"project_path": str(project_path)})
+        assert "session_1 exited" in str(exc.value)
+        pool.release(worker)
+
+        with pytest.raises(session_pool.SessionError) as exc:
+            await pool.acquire()
+        assert "All Electronics Desktop sessions exited" in str(exc.value)
+        await pool.stop()
+
+    with TemporaryDirectory() as tmp_dir:
+        asyncio.run(run(*make_projects(tmp_dir, "crash")))
+
+
+@mock.patch("aedttest.session_pool.POLL_INTERVAL", 0.05)
+def test_session_pool_restart():
+    async def run(crash_path, project_path):
+        pool = session_pool.SessionPool(Path(tmp_dir) / "sessions", [launch_stand_in], max_restarts=1)
+        worker = await pool.acquire()
+        with pytest.raises(session_pool.SessionError):
+            await worker.submit({"project_path": str(crash_path)})
+        pool.release(worker)
+
+        worker = await pool.acquire()
+        assert worker.alive and worker.restarts == 1
+        assert await worker.submit({"project_path": str(project_path)}) == {
+            "status": "done",
+            "results_json": str(project_path.with_suffix(".json")),
+        }
+        pool.release(worker)
+        await pool.stop()
+
+    with TemporaryDirectory() as tmp_dir:
+        asyncio.run(run(*make_projects(tmp_dir, "crash", "proj")))
+
+
+@mock.patch("aedttest.session_pool.POLL_INTERVAL", 0.05)
+def test_session_pool_timeout():
+    async def run(project_path):
+        pool = session_pool.SessionPool(Path(tmp_dir) / "sessions", [launch_stand_in])
+        worker = await pool.acquire()
+        with pytest.raises(subprocess.TimeoutExpired):
+            await worker.submit({"project_path": str(project_path)}, timeout=5)
+        assert not worker.alive
+        await pool.stop()
+
+    with TemporaryDirectory() as tmp_dir:
+        asyncio.run(run(*make_projects(tmp_dir, "hang")))
+
+
+def test_write_json_atomic():
+    with TemporaryDirectory() as tmp_dir:
+        file_path = Path(tmp_dir) / "job.json"
+        session_pool.write_json_atomic(file_path, {"stop": True})
+
+        assert [path.name for path in Path(tmp_dir).iterdir()] == ["job.json"]
+        assert json.loads(file_path.read_text()) == {"stop": True}
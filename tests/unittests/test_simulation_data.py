@@ -1,5 +1,7 @@
-import copy
+import json
 import os
+import shutil
+import tempfile
 from argparse import Namespace
 
 try:
@@ -181,116 +183,193 @@ class TestParse(BaseTest):
         )
         assert result == 44
 
+    def test_parse_rdat_stream(self):
+        result, stats = simulation_data.parse_rdat_stream(os.path.join(TESTS_DIR, "input", "report.rdat"))
+        result = json.loads(json.dumps(result, default=simulation_data.json_default))
 
-class TestCheck(BaseTest):
-    def setup(self):
-        # output of pyaedt parse_rdat_file
-        self.input_dat_dict = {
+        assert result == {
             "L Plot 1": {
                 "Matrix1.L(Winding1,Winding1)": {
                     "x_name": "Freq",
                     "x_unit": "Hz",
                     "y_unit": "H",
                     "curves": {
-                        "n_parallel=1 winding_current=5.123456789e-06mA": {
-                            "x_data": [10, 60, 62.1052631578947, 1000, 250750, 500500, 750250, 1000000],
-                            "y_data": [
-                                4.11363150893661e-07,
-                                4.11363150893661e-07,
-                                4.11363150893661e-07,
-                                4.11363150893661e-07,
-                                4.11363150900861e-07,
-                                4.11363150922348e-07,
-                                4.11363150958121e-07,
-                                4.11363151008181e-07,
-                            ],
-                        },
-                        "n_parallel=1 winding_current=1.123456789123456e-06mA": {
-                            "x_data": [10, 60, 62.1052631578947, 1000, 250750, 500500, 750250, 1000000],
-                            "y_data": [
-                                4.11363150893661e-07,
-                                4.11363150893661e-07,
-                                4.11363150893661e-07,
-                                4.11363150893661e-07,
-                                4.11363150900861e-07,
-                                4.11363150922348e-07,
-                                4.11363150958121e-07,
-                                4.11363151008181e-07,
-                            ],
+                        "n_parallel=1 winding_current=5.123456789e+00mA": {
+                            "x_data": [10, 60, 1000],
+                            "y_data": [411.363150893661, 411.363150893661, 411.363150900861],
                         },
-                        "": {
-                            "x_data": [10, 60, 62.1052631578947, 1000, 250750, 500500, 750250, 1000000],
-                            "y_data": [
-                                1.02840787723415e-07,
-                                1.02840787723415e-07,
-                                1.02840787723415e-07,
-                                1.02840787723415e-07,
-                                1.02840787725215e-07,
-                                1.02840787730587e-07,
-                                1.0284078773953e-07,
-                                1.02840787752045e-07,
-                            ],
+                        "nominal": {
+                            "x_data": [10, 60, 1000],
+                            "y_data": [102.840787723415, 102.840787723415, 102.840787725215],
                         },
                     },
                 }
-            }
-        }
-
-    def test_check_without_nan(self):
-        ref_dict = copy.deepcopy(self.input_dat_dict)
-        result = simulation_data.check_nan(self.input_dat_dict)
-        assert result is not ref_dict
-        assert result == ref_dict
-
-    def test_check_with_nan(self):
-        """
-        insert nan in one curve, check the curve with nan is removed
-        """
-        self.input_dat_dict["L Plot 1"]["Matrix1.L(Winding1,Winding1)"]["curves"][
-            "n_parallel=1 winding_current=5.123456789e-06mA"
-        ]["y_data"][3] = "nan"
-
-        ref_dict = copy.deepcopy(self.input_dat_dict)
-        ref_dict["L Plot 1"]["Matrix1.L(Winding1,Winding1)"]["curves"].pop(
-            "n_parallel=1 winding_current=5.123456789e-06mA"
-        )
-
-        result = simulation_data.check_nan(self.input_dat_dict)
-        assert result is not ref_dict
-        assert result == ref_dict
-
-    def test_compose_curve_key(self):
-        ref_keys = [
-            "n_parallel=1 winding_current=1.123456789e-06mA",
-            "n_parallel=1 winding_current=5.123456789e-06mA",
-            "nominal",
-        ]
-        result = simulation_data.compose_curve_keys(self.input_dat_dict)
-        result_keys = list(result["L Plot 1"]["Matrix1.L(Winding1,Winding1)"]["curves"].keys())
-        result_keys.sort()
-        assert ref_keys == result_keys
-
-    def test_compose_key_smith(self):
-        input_data = {
+            },
             "S Parameter Chart 1": {
                 "S(Port1,Port1)": {
                     "x_name": "S(Port1,Port1)",
                     "x_unit": "Hz",
                     "y_unit": "",
-                    "curves": {
-                        "real": {
-                            "x_data": [],
-                            "y_data": [],
-                        },
-                        "imag": {
-                            "x_data": [],
-                            "y_data": [],
-                        },
-                    },
+                    # both curves are composed to the same names, imaginary part of the last one has NaN
+                    "curves": {"real": {"x_data": [1, 2], "y_data": [0.5, 0.7]}},
                 }
-            }
+            },
         }
-        result = simulation_data.compose_curve_keys(input_data)
-        result_keys = list(result["S Parameter Chart 1"]["S(Port1,Port1)"]["curves"].keys())
-        result_keys.sort()
-        assert result_keys == ["imag", "real"]
+        assert stats == {"curves": 3, "rejected": 2}
+
+    def test_call_with_peak_memory(self):
+        result, peak_memory = simulation_data.call_with_peak_memory(bytearray, 1024 * 1024)
+        assert len(result) == 1024 * 1024
+        if simulation_data.tracemalloc is None:
+            assert peak_memory is None
+        else:
+            assert peak_memory >= 1024 * 1024
+            assert not simulation_data.tracemalloc.is_tracing()
+
+    def test_curve_column(self):
+        column = simulation_data.CurveColumn()
+        column.feed("1, 2, 3", True)
+        column.feed("4, -, 6", True)
+        column.feed(", nan, 8)", False)
+
+        # value split between pieces is joined, non-numeric value is stored as NaN
+        assert column.values.tolist()[:3] == [1, 2, 34]
+        assert column.values[6] == 8
+        assert column.invalid == [3, 5]
+        assert column.is_valid(0, 3)
+        assert not column.is_valid(2, 5)
+        assert column.is_valid(0, 7, 2)
+        assert not column.is_valid(1, 7, 2)
+
+    def test_json_default(self):
+        data = {"x_data": simulation_data.array("d", [1, 2.5])}
+        assert json.dumps(data, default=simulation_data.json_default) == '{"x_data": [1.0, 2.5]}'
+
+
+class TestAnalyze(BaseTest):
+    def test_analyze_all(self):
+        desktop = mock.Mock()
+        desktop.analyze_all.return_value = True
+
+        assert simulation_data.analyze_design(desktop, mock.Mock(), "design", ["Setup1"])
+        desktop.analyze_all.assert_called_once_with(design="design")
+
+    @mock.patch("aedttest.simulation_data.extract_only", True)
+    def test_extract_only(self):
+        desktop = mock.Mock()
+        app = mock.Mock()
+        app.get_setup.side_effect = lambda setup: mock.Mock(is_solved=setup == "Setup1")
+        app.analyze_setup.return_value = True
+
+        assert simulation_data.analyze_design(desktop, app, "design", ["Setup1", "Setup2"])
+        desktop.analyze_all.assert_not_called()
+        app.analyze_setup.assert_called_once_with("Setup2")
+
+
+class TestWorker(BaseTest):
+    def setup(self):
+        self.worker_dir = tempfile.mkdtemp()
+        os.mkdir(os.path.join(self.worker_dir, simulation_data.INBOX))
+        os.mkdir(os.path.join(self.worker_dir, simulation_data.OUTBOX))
+
+    def teardown(self):
+        BaseTest.teardown(self)
+        shutil.rmtree(self.worker_dir)
+
+    def write_job(self, job_name, job):
+        with open(os.path.join(self.worker_dir, simulation_data.INBOX, job_name), "w") as file:
+            json.dump(job, file)
+
+    def read_result(self, job_name):
+        with open(os.path.join(self.worker_dir, simulation_data.OUTBOX, job_name)) as file:
+            return json.load(file)
+
+    @mock.patch("aedttest.simulation_data.process_project", return_value="/tmp/proj.json")
+    def test_run_worker(self, mock_process_project):
+        desktop = mock.Mock()
+        self.write_job("000001.json", {"project_path": "/tmp/proj.aedt"})
+        self.write_job("000002.json", {"project_path": "/tmp/other.aedt"})
+        self.write_job("stop.json", {"stop": True})
+
+        simulation_data.run_worker(desktop, self.worker_dir, poll_interval=0)
+
+        assert self.read_result("000001.json") == {"status": "done", "results_json": "/tmp/proj.json"}
+        assert self.read_result("000002.json") == {"status": "done", "results_json": "/tmp/proj.json"}
+        assert os.listdir(os.path.join(self.worker_dir, simulation_data.INBOX)) == []
+        open_calls = desktop.odesktop.OpenProject.call_args_list
+        assert open_calls == [mock.call("/tmp/proj.aedt"), mock.call("/tmp/other.aedt")]
+        assert desktop.odesktop.CloseProject.call_args_list == [mock.call("proj"), mock.call("other")]
+        assert [call[0][1] for call in mock_process_project.call_args_list] == ["proj", "other"]
+
+    @mock.patch("aedttest.simulation_data.process_project", side_effect=ValueError("no license"))
+    def test_run_job_error(self, mock_process_project):
+        desktop = mock.Mock()
+        result = simulation_data.run_job(desktop, {"project_path": "/tmp/proj.aedt"})
+
+        assert result == {"status": "error", "error": "no license"}
+        desktop.odesktop.CloseProject.assert_called_once_with("proj")
+
+    def test_run_batch(self):
+        def open_project(project_path):
+            if project_path.endswith("broken.aedt"):
+                raise ValueError("cannot open")
+
+        desktop = mock.Mock()
+        desktop.odesktop.OpenProject.side_effect = open_project
+        desktop.project_path.return_value = self.worker_dir
+        desktop.design_list.return_value = []
+        project_paths = [os.path.join(self.worker_dir, name) for name in ("proj.aedt", "broken.aedt")]
+        batch_file = os.path.join(self.worker_dir, "batch.json")
+        with open(batch_file, "w") as file:
+            json.dump({"projects": project_paths}, file)
+
+        simulation_data.run_batch(desktop, batch_file)
+
+        with open(os.path.join(self.worker_dir, "proj.json")) as file:
+            assert json.load(file) == {"error_exception": ["Project has no design"], "designs": {}}
+        with open(os.path.join(self.worker_dir, "broken.json")) as file:
+            assert json.load(file) == {"error_exception": ["cannot open"], "designs": {}}
+
+    def test_process_project_resets_results(self):
+        simulation_data.PROJECT_DICT["error_exception"].append("error of previous project")
+        desktop = mock.Mock()
+        desktop.project_path.return_value = self.worker_dir
+        desktop.design_list.return_value = []
+
+        results_json = simulation_data.process_project(desktop, "proj")
+
+        assert results_json == os.path.join(self.worker_dir, "proj.json")
+        with open(results_json) as file:
+            assert json.load(file) == {"error_exception": ["Project has no design"], "designs": {}}
+
+    def test_checkpoint(self):
+        checkpoint_file = os.path.join(self.worker_dir, "proj" + simulation_data.CHECKPOINT_SUFFIX)
+        assert simulation_data.read_checkpoint(checkpoint_file) == ({}, [])
+
+        simulation_data.append_checkpoint(checkpoint_file, "d1", {"x": simulation_data.array("d", [1])}, ["error"])
+        with open(checkpoint_file, "a") as file:
+            # record cut by the crash
+            file.write('{"design": "d2", "da')
+        with open(checkpoint_file, "a") as file:
+            file.write("\n")
+        simulation_data.append_checkpoint(checkpoint_file, "d3", {}, [])
+
+        assert simulation_data.read_checkpoint(checkpoint_file) == ({"d1": {"x": [1.0]}, "d3": {}}, ["error"])
+
+    @mock.patch("aedttest.simulation_data.extract_data", return_value={"d2": {"report": {}}})
+    def test_process_project_resumes(self, mock_extract_data):
+        checkpoint_file = os.path.join(self.worker_dir, "proj" + simulation_data.CHECKPOINT_SUFFIX)
+        simulation_data.append_checkpoint(checkpoint_file, "d1", {"report": {}}, ["d1 has no report"])
+        desktop = mock.Mock()
+        desktop.project_path.return_value = self.worker_dir
+        desktop.design_list.return_value = ["d1", "d2"]
+
+        results_json = simulation_data.process_project(desktop, "proj")
+
+        assert mock_extract_data.call_args[0][3] == ["d2"]
+        with open(results_json) as file:
+            assert json.load(file) == {
+                "error_exception": ["d1 has no report"],
+                "designs": {"d1": {"report": {}}, "d2": {"report": {}}},
+            }
+        assert not os.path.exists(checkpoint_file)
@@ -0,0 +1,68 @@
+import os
+import stat
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import mock
+
+from aedttest import staging
+
+
+class TestStagingCache:
+    def setup(self):
+        self.tmp_dir = TemporaryDirectory()
+        self.src_dir = Path(self.tmp_dir.name) / "src"
+        self.src_dir.mkdir()
+        self.cache = staging.StagingCache(Path(self.tmp_dir.name) / "cache")
+
+    def teardown(self):
+        self.tmp_dir.cleanup()
+
+    def test_stage_file(self):
+        src = self.src_dir / "proj.aedt"
+        src.write_text("v1")
+        dst_dir = Path(self.tmp_dir.name) / "run1"
+
+        staged = self.cache.stage_file(src, dst_dir)
+        assert staged == str(dst_dir / "proj.aedt")
+        assert Path(staged).read_text() == "v1"
+        # placed file is writable, cached one is not
+        Path(staged).write_text("solved")
+        assert self.cache.fetch(src).read_text() == "v1"
+        assert not os.stat(self.cache.fetch(src)).st_mode & staging.WRITE_BITS
+
+        self.cache.stage_file(src, Path(self.tmp_dir.name) / "run2")
+        assert self.cache.stats["misses"] == 1
+        assert self.cache.stats["hits"] == 3
+        assert self.cache.stats["reflink"] + self.cache.stats["copy"] == 2
+
+        # changed source is copied again
+        src.write_text("version 2")
+        os.utime(src, ns=(0, 10**9))
+        assert Path(self.cache.stage_file(src, dst_dir)).read_text() == "version 2"
+        assert self.cache.stats["misses"] == 2
+        assert os.stat(dst_dir / "proj.aedt").st_mtime_ns == 10**9
+
+    def test_stage_file_hardlink(self):
+        src = self.src_dir / "ctrl_prog"
+        src.write_text("#!/bin/sh")
+        src.chmod(0o755)
+
+        staged = self.cache.stage_file(src, Path(self.tmp_dir.name) / "run", link=True)
+
+        assert os.path.samefile(staged, self.cache.fetch(src))
+        assert stat.S_IMODE(os.stat(staged).st_mode) == 0o555
+        assert self.cache.stats["hardlink"] == 1
+
+    @mock.patch("aedttest.staging.reflink", return_value=False)
+    def test_stage_tree(self, reflink_mock):
+        (self.src_dir / "nested").mkdir()
+        (self.src_dir / "edb.def").write_text("edb")
+        (self.src_dir / "nested" / "stackup.xml").write_text("stackup")
+        dst_dir = Path(self.tmp_dir.name) / "run" / "proj.aedb"
+
+        staged = self.cache.stage_tree(self.src_dir, dst_dir)
+
+        assert sorted(staged) == [str(dst_dir / "edb.def"), str(dst_dir / "nested" / "stackup.xml")]
+        assert (dst_dir / "nested" / "stackup.xml").read_text() == "stackup"
+        assert self.cache.stats["copy"] == 2
+        assert self.cache.summary().startswith("Staging cache: 0 hit(s), 2 miss(es), 0.0 MB copied to cache")
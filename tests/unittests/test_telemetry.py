@@ -0,0 +1,155 @@
+import asyncio
+import os
+import sys
+import threading
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import mock
+
+import pytest
+
+from aedttest import telemetry
+from aedttest.aedt_test_runner import run_process
+
+
+def make_process(proc_path, pid, ppid, cpu_ticks=0, rss_kb=0, hwm_kb=0, threads=1, io=True):
+    pid_dir = Path(proc_path) / str(pid)
+    pid_dir.mkdir()
+    # fields 4-24 of proc(5): ppid, 9 fields, utime, stime, 4 fields, num_threads, 3 fields, rss
+    fields = [ppid] + [0] * 9 + [cpu_ticks, 0] + [0] * 4 + [threads] + [0] * 3 + [rss_kb // 4]
+    (pid_dir / "stat").write_text(f"{pid} (ansys edt) S {' '.join(str(field) for field in fields)}\n")
+    (pid_dir / "status").write_text(f"Name:\tansysedt\nVmHWM:\t{hwm_kb} kB\nVmRSS:\t{rss_kb} kB\n")
+    if io:
+        (pid_dir / "io").write_text(f"rchar: 1\nread_bytes: {pid * 1024}\nwrite_bytes: {pid}\n")
+
+
+def test_read_process():
+    with TemporaryDirectory() as proc_path:
+        make_process(proc_path, 100, 1, cpu_ticks=50, rss_kb=2048, hwm_kb=4096, threads=8)
+        process = telemetry.read_process(Path(proc_path) / "100")
+
+        assert process == telemetry.ProcessStat(
+            ppid=1,
+            cpu_ticks=50,
+            rss=2048 * 1024,
+            peak_rss=4096 * 1024,
+            threads=8,
+            read_bytes=100 * 1024,
+            write_bytes=100,
+        )
+        assert telemetry.read_process(Path(proc_path) / "101") is None
+
+
+def test_read_process_tree():
+    with TemporaryDirectory() as proc_path:
+        make_process(proc_path, 100, 1)
+        make_process(proc_path, 101, 100)
+        make_process(proc_path, 102, 101, io=False)
+        make_process(proc_path, 103, 100)
+        make_process(proc_path, 200, 1)
+        Path(proc_path, "self").mkdir()
+
+        tree = telemetry.read_process_tree(101, Path(proc_path))
+        assert sorted(tree) == [101, 102]
+        assert tree[102].read_bytes == 0
+
+        assert sorted(telemetry.read_process_tree(100, Path(proc_path))) == [100, 101, 102, 103]
+        assert telemetry.read_process_tree(300, Path(proc_path)) == {}
+
+
+def test_sampler():
+    clock_ticks = os.sysconf("SC_CLK_TCK")
+    with TemporaryDirectory() as proc_path:
+        make_process(proc_path, 100, 1, cpu_ticks=0, rss_kb=1024, hwm_kb=1024, threads=2)
+        sampler = telemetry.ProcessTreeSampler(interval=1, proc_path=Path(proc_path))
+        sampler._start = 0
+        sampler.sample(100, now=0)
+
+        # child appears and both processes are busy for 2 seconds
+        (Path(proc_path) / "100" / "stat").unlink()
+        (Path(proc_path) / "100" / "status").unlink()
+        (Path(proc_path) / "100" / "io").unlink()
+        (Path(proc_path) / "100").rmdir()
+        make_process(proc_path, 100, 1, cpu_ticks=2 * clock_ticks, rss_kb=1024, hwm_kb=3072, threads=2)
+        make_process(proc_path, 101, 100, cpu_ticks=2 * clock_ticks, rss_kb=2048, hwm_kb=2048, threads=4)
+        sampler.sample(100, now=2)
+
+        assert sampler.samples == {
+            "time": [0, 2],
+            "cpu": [0.0, 2.0],
+            "rss": [1.0, 3.0],
+            "threads": [2, 6],
+            "read_bytes": [100 * 1024, 201 * 1024],
+            "write_bytes": [100, 201],
+        }
+
+        report = sampler.report(cores=4)
+        assert report["summary"] == {
+            "cores": 4,
+            "avg_cpu": 2.0,
+            "max_cpu": 2.0,
+            "cpu_efficiency": 50.0,
+            "peak_rss": 5.0,
+            "max_threads": 6,
+            "read_bytes": 201 * 1024,
+            "write_bytes": 201,
+        }
+
+
+def test_sampler_downsampling():
+    with TemporaryDirectory() as proc_path:
+        make_process(proc_path, 100, 1)
+        sampler = telemetry.ProcessTreeSampler(interval=1, proc_path=Path(proc_path), max_samples=4)
+        sampler._start = 0
+        for now in range(5):
+            sampler.sample(100, now=now)
+
+        assert sampler.samples["time"] == [0, 2, 4]
+        assert sampler.interval == 2
+
+
+def test_sampler_reset():
+    with TemporaryDirectory() as proc_path:
+        make_process(proc_path, 100, 1, rss_kb=1024, hwm_kb=8192)
+        sampler = telemetry.ProcessTreeSampler(interval=1, proc_path=Path(proc_path), max_samples=2)
+        for now in range(3):
+            sampler.sample(100, now=now)
+        assert sampler.interval == 2
+
+        # next project of the session, peak of the previous one is not reported
+        sampler.reset()
+        sampler.sample(100, now=3)
+        assert sampler.interval == 1
+        assert len(sampler.samples["time"]) == 1
+        assert sampler.report(cores=1)["summary"]["peak_rss"] == 1.0
+
+
+def test_sampler_run_in_thread():
+    threads = []
+
+    def read_process_tree(pid, proc_path):
+        threads.append(threading.get_ident())
+        return {}
+
+    async def run(sampler):
+        sampling = asyncio.ensure_future(sampler.run(100))
+        await asyncio.sleep(0.05)
+        sampling.cancel()
+        await asyncio.gather(sampling, return_exceptions=True)
+
+    with TemporaryDirectory() as proc_path, mock.patch("aedttest.telemetry.read_process_tree", wraps=read_process_tree):
+        asyncio.run(run(telemetry.ProcessTreeSampler(interval=0.01, proc_path=Path(proc_path))))
+
+    # /proc is not walked in the thread of the event loop
+    assert threads and threading.get_ident() not in threads
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="requires /proc")
+def test_sampler_run_process():
+    sampler = telemetry.ProcessTreeSampler(interval=0.05)
+    command = [sys.executable, "-c", "import time; time.sleep(0.5)"]
+    asyncio.run(run_process(command, sampler=sampler))
+
+    assert len(sampler.samples["time"]) > 1
+    assert min(sampler.samples["rss"]) > 0
+    assert sampler.report(cores=1)["summary"]["max_threads"] >= 1